@@ -1,6 +1,8 @@
 from django.contrib import admin
-from .models import SubscriptionPlan, UserSubscription, Invoice, SubscriptionHistory, PaymentReceipt, BillingConfig, WalletTransaction
+from .models import SubscriptionPlan, UserSubscription, Invoice, SubscriptionHistory, PaymentReceipt, BillingConfig, WalletTransaction, WalletCheckpoint
+from django.db import transaction
 from django.utils import timezone
+from . import wallet
 
 @admin.register(SubscriptionPlan)
 class SubscriptionPlanAdmin(admin.ModelAdmin):
@@ -30,22 +32,17 @@ class PaymentReceiptAdmin(admin.ModelAdmin):
     actions = ['approve_receipts', 'reject_receipts']
 
     def approve_receipts(self, request, queryset):
-        for receipt in queryset.filter(status='PENDING'):
-            receipt.user.balance += receipt.amount
-            receipt.user.save()
-            receipt.status = 'APPROVED'
-            receipt.processed_at = timezone.now()
-            receipt.save()
-            
-            # Record the transaction
-            WalletTransaction.objects.create(
-                user=receipt.user,
-                amount=receipt.amount,
-                transaction_type='TOP_UP',
-                description=f"Balance top-up via approved receipt #{receipt.id}",
-                receipt=receipt
-            )
-            
+        for receipt in queryset.filter(status='PENDING').select_related('user'):
+            with transaction.atomic():
+                # Skip receipts another admin approved since the queryset was read
+                if not PaymentReceipt.objects.filter(pk=receipt.pk, status='PENDING').update(
+                        status='APPROVED', processed_at=timezone.now()):
+                    continue
+                wallet.credit(
+                    receipt.user, receipt.amount, 'TOP_UP',
+                    f"Balance top-up via approved receipt #{receipt.id}", receipt=receipt,
+                )
+
         self.message_user(request, "Selected receipts have been approved and balances updated.")
     approve_receipts.short_description = "Approve selected receipts and top up balances"
 
@@ -59,7 +56,28 @@ class PaymentReceiptAdmin(admin.ModelAdmin):
 
 @admin.register(WalletTransaction)
 class WalletTransactionAdmin(admin.ModelAdmin):
-    list_display = ('user', 'amount', 'transaction_type', 'description', 'created_at')
+    list_display = ('user', 'sequence', 'amount', 'balance_after', 'transaction_type', 'description', 'created_at')
     list_filter = ('transaction_type', 'created_at')
     search_fields = ('user__username', 'description')
     readonly_fields = ('created_at',)
+
+    # Entries only come from billing.wallet, which keeps User.balance in step
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+@admin.register(WalletCheckpoint)
+class WalletCheckpointAdmin(admin.ModelAdmin):
+    list_display = ('user', 'sequence', 'balance', 'created_at')
+    search_fields = ('user__username',)
+
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
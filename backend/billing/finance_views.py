@@ -1,13 +1,18 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
-from django.db.models import Sum, Count, Q
+from rest_framework.exceptions import ValidationError
+from django.db.models import DecimalField, Sum, Q, Value
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from datetime import timedelta
 from decimal import Decimal
 
+from config.cache import catalog_cache, catalog_version
 from .permissions import IsFinanceAdmin
-from .models import WalletTransaction, PaymentReceipt
+from .models import WalletRollup, ReceiptRollup
+from .periods import date_bounds, in_period
+from .trends import revenue_trend, trend_params
 from users.models import User
 
 
@@ -16,33 +21,17 @@ class FinanceDashboardView(APIView):
     
     def get(self, request):
         """Get overview statistics for finance dashboard"""
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        
-        # Base querysets
-        tx_qs = WalletTransaction.objects.all()
-        rc_qs = PaymentReceipt.objects.all()
-        
-        if start_date:
-            tx_qs = tx_qs.filter(created_at__gte=start_date)
-            rc_qs = rc_qs.filter(created_at__gte=start_date)
-        if end_date:
-            tx_qs = tx_qs.filter(created_at__lte=end_date)
-            rc_qs = rc_qs.filter(created_at__lte=end_date)
+        bounds = date_bounds(request.query_params)
 
         # Total revenue (TOP_UP type)
-        total_revenue = tx_qs.filter(
-            transaction_type='TOP_UP',
-            amount__gt=0
-        ).aggregate(total=Sum('amount'))['total'] or Decimal('0')
-        
+        total_revenue = in_period(
+            WalletRollup.objects.filter(transaction_type='TOP_UP', credit=True), bounds, 'hour'
+        ).aggregate(total=Sum('total'))['total'] or Decimal('0')
+
         # Pending top-ups
-        pending_topups = rc_qs.filter(
-            status='PENDING'
-        ).aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        )
+        pending_topups = in_period(
+            ReceiptRollup.objects.filter(status='PENDING'), bounds, 'hour'
+        ).aggregate(count=Sum('count'), amount=Sum('total'))
         
         # Users with balance (Not date-filtered as it's a current state)
         users_with_balance = User.objects.filter(balance__gt=0).count()
@@ -59,92 +48,107 @@ class RevenueTrendView(APIView):
     permission_classes = [IsFinanceAdmin]
     
     def get(self, request):
-        """Get monthly revenue trend"""
-        # For trend we usually want a longer period, but respect filters if provided
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        
-        qs = WalletTransaction.objects.filter(transaction_type='TOP_UP', amount__gt=0)
-        
-        if start_date:
-            qs = qs.filter(created_at__gte=start_date)
-        if end_date:
-            qs = qs.filter(created_at__lte=end_date)
-            
-        # Group by month and sum
-        from django.db.models.functions import TruncMonth
-        trends = qs.annotate(month=TruncMonth('created_at')).values('month').annotate(
-            revenue=Sum('amount')
-        ).order_by('month')
-        
-        data = []
-        for item in trends:
-            data.append({
-                'month': item['month'].strftime('%Y-%m'),
-                'revenue': str(item['revenue'])
-            })
-        
-        return Response(data)
+        """Top-up revenue per ?granularity=day|week|month|quarter bucket in ?tz, gaps filled"""
+        return Response(revenue_trend(*trend_params(request.query_params)))
 
 
 class TopUsersView(APIView):
+    """
+    Leaderboard of users by ``metric``: current balance (default), spend or
+    top-ups, the latter two within the optional period. ``limit`` users,
+    10 by default. One grouped query; without a period the result is cached
+    until the next wallet change.
+    """
     permission_classes = [IsFinanceAdmin]
-    
+    metrics = {
+        # metric: (ordering, filter that drops users with nothing to rank)
+        'balance': ('-balance', Q(balance__gt=0)),
+        'spend': ('total_spent', Q(total_spent__lt=0)),
+        'top_ups': ('-total_top_ups', Q(total_top_ups__gt=0)),
+    }
+    default_limit = 10
+    max_limit = 100
+
     def get(self, request):
-        """Get top 10 users by balance and activity in period"""
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        
-        # Top users by current balance (independent of date)
-        top_users = User.objects.filter(balance__gt=0).order_by('-balance')[:10]
-        
-        data = []
-        for user in top_users:
-            # Spent logic respect dates
-            spent_qs = WalletTransaction.objects.filter(user=user, amount__lt=0)
-            if start_date:
-                spent_qs = spent_qs.filter(created_at__gte=start_date)
-            if end_date:
-                spent_qs = spent_qs.filter(created_at__lte=end_date)
-                
-            total_spent = spent_qs.aggregate(total=Sum('amount'))['total'] or Decimal('0')
-            
-            data.append({
-                'id': user.id,
-                'username': user.username,
-                'email': user.email,
-                'balance': str(user.balance),
-                'total_spent': str(abs(total_spent))
-            })
-        
+        metric = request.query_params.get('metric', 'balance')
+        if metric not in self.metrics:
+            raise ValidationError({'metric': f"Expected one of {', '.join(self.metrics)}"})
+        try:
+            limit = min(max(int(request.query_params.get('limit', self.default_limit)), 1), self.max_limit)
+        except ValueError:
+            raise ValidationError({'limit': 'Expected a number'})
+        bounds = date_bounds(request.query_params)
+        if bounds:
+            return Response(self.leaderboard(metric, limit, bounds))
+
+        key = f"finance:leaderboard:{metric}:{limit}:{catalog_version('wallets')}"
+        data = catalog_cache.get(key)
+        if data is None:
+            data = self.leaderboard(metric, limit, bounds)
+            catalog_cache.set(key, data)
         return Response(data)
 
+    def leaderboard(self, metric, limit, bounds):
+        period = Q()
+        if 'start' in bounds:
+            period &= Q(wallet_transactions__created_at__gte=bounds['start'])
+        if 'end' in bounds:
+            period &= Q(wallet_transactions__created_at__lt=bounds['end'])
+        zero = Value(Decimal('0.00'), output_field=DecimalField(max_digits=16, decimal_places=2))
+        ordering, having = self.metrics[metric]
+
+        users = User.objects.all()
+        if metric == 'balance':
+            # The ranking is a column: pick the top users in a subselect so
+            # only their wallet entries are aggregated, not the whole ledger
+            users = users.filter(id__in=User.objects.filter(having).order_by(ordering, 'id').values('id')[:limit])
+
+        # Filtered aggregates over one join, so users without spend or
+        # top-ups in the period still rank by balance
+        users = users.annotate(
+            total_spent=Coalesce(Sum(
+                'wallet_transactions__amount',
+                filter=period & Q(wallet_transactions__amount__lt=0)
+                & ~Q(wallet_transactions__transaction_type='OPENING_BALANCE'),
+            ), zero),
+            total_top_ups=Coalesce(Sum(
+                'wallet_transactions__amount',
+                filter=period & Q(wallet_transactions__transaction_type='TOP_UP', wallet_transactions__amount__gt=0),
+            ), zero),
+        ).filter(having).order_by(ordering, 'id').values(
+            'id', 'username', 'email', 'balance', 'total_spent', 'total_top_ups'
+        )[:limit]
+
+        return [
+            {
+                'id': user['id'],
+                'username': user['username'],
+                'email': user['email'],
+                'balance': str(user['balance']),
+                'total_spent': str(abs(user['total_spent'])),
+                'total_top_ups': str(user['total_top_ups']),
+            }
+            for user in users
+        ]
+
 
 class TransactionBreakdownView(APIView):
     permission_classes = [IsFinanceAdmin]
     
     def get(self, request):
         """Get transaction breakdown by type"""
-        start_date = request.query_params.get('start_date')
-        end_date = request.query_params.get('end_date')
-        
-        qs = WalletTransaction.objects.all()
-        if start_date:
-            qs = qs.filter(created_at__gte=start_date)
-        if end_date:
-            qs = qs.filter(created_at__lte=end_date)
-            
+        qs = in_period(WalletRollup.objects.all(), date_bounds(request.query_params), 'hour')
         breakdown = qs.values('transaction_type').annotate(
-            count=Count('id'),
-            total=Sum('amount')
-        )
+            entries=Sum('count'),
+            amount=Sum('total')
+        ).filter(entries__gt=0).order_by('transaction_type')
         
         data = []
         for item in breakdown:
             data.append({
                 'type': item['transaction_type'],
-                'count': item['count'],
-                'total': str(item['total'] or Decimal('0'))
+                'count': item['entries'],
+                'total': str(item['amount'] or Decimal('0'))
             })
         
         return Response(data)
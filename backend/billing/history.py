@@ -0,0 +1,137 @@
+"""
+A user's transaction feed: wallet entries plus the top-up receipts that
+are still pending or were rejected (approved ones already are wallet
+entries), merged with UNION ALL and sorted and keyset-paginated by the
+database. Both tables are indexed on (user, created_at), so a page costs
+one index range scan per branch however long the history is.
+
+Rows are ``FEED_COLUMNS`` tuples ordered by (created_at, kind, id)
+descending, which is unique across both branches. Receipts have not moved
+the balance, so their ``balance_after`` is NULL.
+"""
+from datetime import datetime
+
+from django.db.models import DecimalField, F, Q, Value
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+from .models import PaymentReceipt, WalletTransaction
+from .periods import in_period
+
+FEED_COLUMNS = (
+    'created_at', 'kind', 'id', 'amount', 'balance_after', 'type', 'description', 'status', 'receipt_image', 'admin_notes',
+)
+
+ENTRY = 'TRX'
+RECEIPT = 'RCP'
+
+
+def wallet_entries(user):
+    return (
+        WalletTransaction.objects.filter(user=user).order_by()
+        .annotate(
+            kind=Value(ENTRY),
+            type=F('transaction_type'),
+            status=Value('COMPLETED'),
+            receipt_image=F('receipt__receipt_image'),
+            admin_notes=F('receipt__admin_notes'),
+        )
+        .values_list(*FEED_COLUMNS)
+    )
+
+
+def unapproved_receipts(user):
+    return (
+        PaymentReceipt.objects.filter(user=user).exclude(status='APPROVED').order_by()
+        .annotate(
+            kind=Value(RECEIPT),
+            balance_after=Value(None, output_field=DecimalField(max_digits=12, decimal_places=2)),
+            type=Value('TOP_UP'),
+            description=Value("Balance Top-Up (Verification)"),
+        )
+        .values_list(*FEED_COLUMNS)
+    )
+
+
+def transaction_feed(user, transaction_type=None, **bounds):
+    """The feed's branches as {kind: queryset}; ``bounds`` as from periods.date_bounds"""
+    branches = {ENTRY: wallet_entries(user)}
+    if transaction_type:
+        branches[ENTRY] = branches[ENTRY].filter(transaction_type=transaction_type)
+    if transaction_type in (None, 'TOP_UP'):
+        branches[RECEIPT] = unapproved_receipts(user)
+    return {kind: in_period(queryset, bounds) for kind, queryset in branches.items()}
+
+
+class TransactionFeedPagination(CursorPagination):
+    """
+    CursorPagination over the feed. DRF's cursor holds one ordering field
+    plus an offset for ties; here the position is the whole sort key, and
+    each branch is filtered past it before the UNION so no page ever reads
+    the rows before it.
+    """
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-created_at', '-kind', '-id')
+
+    def paginate_feed(self, branches, request):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+
+        querysets = [
+            self.past_cursor(queryset, kind, reverse) if self.cursor else queryset
+            for kind, queryset in branches.items()
+        ]
+        feed = querysets[0].union(*querysets[1:], all=True) if len(querysets) > 1 else querysets[0]
+        ordering = ('created_at', 'kind', 'id') if reverse else self.ordering
+        rows = list(feed.order_by(*ordering)[:self.page_size + 1])
+
+        more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+        self.has_next = True if reverse else more
+        self.has_previous = more if reverse else self.cursor is not None
+        return self.page
+
+    def past_cursor(self, queryset, kind, reverse):
+        created_at, cursor_kind, cursor_id = self.position
+        strict, inclusive = ('gt', 'gte') if reverse else ('lt', 'lte')
+        if kind == cursor_kind:
+            return queryset.filter(
+                Q(**{f'created_at__{strict}': created_at}) | Q(created_at=created_at, **{f'id__{strict}': cursor_id})
+            )
+        # Ties on created_at go by kind, so the other branch may include them
+        lookup = inclusive if (kind < cursor_kind) != reverse else strict
+        return queryset.filter(**{f'created_at__{lookup}': created_at})
+
+    def decode_cursor(self, request):
+        cursor = super().decode_cursor(request)
+        if cursor is None:
+            return None
+        try:
+            created_at, kind, pk = cursor.position.split('|')
+            self.position = (parse_datetime(created_at), kind, int(pk))
+        except (AttributeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if not isinstance(self.position[0], datetime) or kind not in (ENTRY, RECEIPT):
+            raise NotFound(self.invalid_cursor_message)
+        return cursor
+
+    def position_of(self, row):
+        return f'{row[0].isoformat()}|{row[1]}|{row[2]}'
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=self.position_of(self.page[-1])))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.position_of(self.page[0])))
@@ -0,0 +1,19 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from billing.rollups import compact
+
+
+class Command(BaseCommand):
+    help = (
+        'Merges wallet rollup rows of past hours that were not folded after commit into one row per hour, type and sign. '
+        'Only needed after a process died between a commit and its fold'
+    )
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        removed = compact()
+        self.stdout.write(self.style.SUCCESS(
+            f'Removed {removed} wallet rollup rows in {time.perf_counter() - started:.1f}s'
+        ))
@@ -0,0 +1,18 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from billing.models import ReceiptRollup, WalletRollup
+from billing.rollups import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the hourly finance rollups from the wallet transaction and payment receipt tables'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'Rebuilt {WalletRollup.objects.count()} wallet and {ReceiptRollup.objects.count()} receipt '
+            f'rollup rows in {time.perf_counter() - started:.1f}s'
+        ))
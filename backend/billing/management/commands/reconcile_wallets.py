@@ -0,0 +1,111 @@
+import time
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.db.models import OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from billing.models import WalletCheckpoint, WalletTransaction
+
+User = get_user_model()
+
+ZERO = Decimal('0.00')
+
+
+class Command(BaseCommand):
+    help = (
+        'Verifies every wallet ledger in one streaming pass: entries are numbered without '
+        'gaps, each balance_after is the previous balance plus the amount, and the last one '
+        'matches User.balance. Verified ledgers are checkpointed so the next run starts there'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true', help='Ignore checkpoints and verify every entry')
+        parser.add_argument('--no-checkpoint', action='store_true', help='Verify without writing checkpoints')
+        parser.add_argument('--chunk-size', type=int, default=5000)
+
+    def latest_checkpoints(self):
+        latest = WalletCheckpoint.objects.filter(user=OuterRef('user')).order_by('-sequence').values('sequence')[:1]
+        rows = WalletCheckpoint.objects.filter(sequence=Subquery(latest)).values_list('user_id', 'sequence', 'balance')
+        return {user_id: (sequence, balance) for user_id, sequence, balance in rows.iterator()}
+
+    def entries(self, full, chunk_size):
+        entries = WalletTransaction.objects.all()
+        if not full:
+            checkpointed = WalletCheckpoint.objects.filter(user=OuterRef('user')).order_by('-sequence').values('sequence')[:1]
+            entries = entries.filter(sequence__gt=Coalesce(Subquery(checkpointed), Value(0)))
+        return (
+            entries.order_by('user_id', 'sequence')
+            .values_list('user_id', 'sequence', 'amount', 'balance_after')
+            .iterator(chunk_size=chunk_size)
+        )
+
+    def settled(self, user_id):
+        """
+        Re-reads one user under their row lock. The streams are separate
+        queries, so a wallet change between them looks like a mismatch.
+        """
+        with transaction.atomic():
+            balance = User.objects.select_for_update().filter(pk=user_id).values_list('balance', flat=True).first()
+            last = (
+                WalletTransaction.objects.filter(user_id=user_id)
+                .order_by('-sequence').values_list('balance_after', flat=True).first()
+            )
+        return balance == (ZERO if last is None else last)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        checkpoints = {} if options['full'] else self.latest_checkpoints()
+        users = User.objects.order_by('id').values_list('id', 'balance').iterator(chunk_size=options['chunk_size'])
+        ledgers = groupby(self.entries(options['full'], options['chunk_size']), key=itemgetter(0))
+        ledger = next(ledgers, None)
+
+        problems = []
+        new_checkpoints = []
+        verified = 0
+        for user_id, balance in users:
+            start = checkpoints.get(user_id, (0, ZERO))
+            sequence, expected = start
+            broken = False
+            # Entries of a user deleted between the two queries
+            while ledger is not None and ledger[0] < user_id:
+                ledger = next(ledgers, None)
+            if ledger is not None and ledger[0] == user_id:
+                for _, entry_sequence, amount, balance_after in ledger[1]:
+                    verified += 1
+                    if broken:
+                        continue
+                    if entry_sequence != sequence + 1:
+                        problems.append(f"user {user_id}: entry #{entry_sequence} follows #{sequence}")
+                        broken = True
+                    elif balance_after != expected + amount:
+                        problems.append(
+                            f"user {user_id}: entry #{entry_sequence} records {balance_after}, "
+                            f"expected {expected} + {amount}"
+                        )
+                        broken = True
+                    sequence, expected = entry_sequence, balance_after
+                ledger = next(ledgers, None)
+
+            if broken:
+                continue
+            if balance != expected and not self.settled(user_id):
+                problems.append(f"user {user_id}: balance {balance}, ledger ends at {expected}")
+            if sequence > start[0]:
+                new_checkpoints.append(WalletCheckpoint(user_id=user_id, sequence=sequence, balance=expected))
+
+        if options['no_checkpoint']:
+            new_checkpoints = []
+        WalletCheckpoint.objects.bulk_create(new_checkpoints, batch_size=1000, ignore_conflicts=True)
+
+        elapsed = time.perf_counter() - started
+        summary = f"Verified {verified} entries in {elapsed:.1f}s, checkpointed {len(new_checkpoints)} wallets"
+        if problems:
+            for problem in problems:
+                self.stderr.write(problem)
+            raise CommandError(f"{summary}; {len(problems)} wallets do not reconcile")
+        self.stdout.write(self.style.SUCCESS(summary))
@@ -0,0 +1,108 @@
+# Generated by Django 6.0 on 2026-10-18 04:13
+
+from datetime import timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min, Sum
+from django.utils import timezone
+
+OPENING_BALANCE = 'Opening balance carried over to the ledger'
+BATCH_SIZE = 2000
+
+
+def backfill_ledger(apps, schema_editor):
+    """
+    Numbers every user's existing entries and computes their running
+    balances. Balances that the old entries do not explain (edited by hand,
+    or changed before wallet transactions were recorded) get an opening
+    ADJUSTMENT ahead of them, so each ledger ends at the user's balance.
+    """
+    User = apps.get_model(settings.AUTH_USER_MODEL)
+    WalletTransaction = apps.get_model('billing', 'WalletTransaction')
+
+    history = {
+        row['user_id']: row
+        for row in WalletTransaction.objects.values('user_id').annotate(total=Sum('amount'), first=Min('created_at'))
+    }
+    openings = []
+    for user_id, balance in User.objects.values_list('id', 'balance').iterator():
+        row = history.get(user_id)
+        unexplained = balance - (row['total'] if row else 0)
+        if unexplained:
+            openings.append(WalletTransaction(
+                user_id=user_id,
+                amount=unexplained,
+                transaction_type='ADJUSTMENT',
+                description=OPENING_BALANCE,
+                sequence=0,
+                balance_after=0,
+                created_at=row['first'] - timedelta(microseconds=1) if row else timezone.now(),
+            ))
+    # auto_now_add overrides created_at on insert, bulk_update does not
+    created_at = [tx.created_at for tx in openings]
+    openings = WalletTransaction.objects.bulk_create(openings, batch_size=BATCH_SIZE)
+    for tx, moment in zip(openings, created_at):
+        tx.created_at = moment
+    WalletTransaction.objects.bulk_update(openings, ['created_at'], batch_size=BATCH_SIZE)
+
+    user_ids = WalletTransaction.objects.values_list('user_id', flat=True).distinct().order_by('user_id')
+    pending = []
+    for user_id in list(user_ids):
+        balance = 0
+        entries = WalletTransaction.objects.filter(user_id=user_id).order_by('created_at', 'id').only('id', 'amount')
+        for sequence, tx in enumerate(entries, start=1):
+            balance += tx.amount
+            tx.sequence, tx.balance_after = sequence, balance
+            pending.append(tx)
+        if len(pending) >= BATCH_SIZE:
+            WalletTransaction.objects.bulk_update(pending, ['sequence', 'balance_after'], batch_size=BATCH_SIZE)
+            pending = []
+    WalletTransaction.objects.bulk_update(pending, ['sequence', 'balance_after'], batch_size=BATCH_SIZE)
+
+
+def remove_opening_balances(apps, schema_editor):
+    apps.get_model('billing', 'WalletTransaction').objects.filter(description=OPENING_BALANCE).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0005_alter_wallettransaction_transaction_type'),
+        ('users', '0003_user_balance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WalletCheckpoint',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('sequence', models.PositiveIntegerField()),
+                ('balance', models.DecimalField(decimal_places=2, max_digits=12)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-sequence'],
+            },
+        ),
+        migrations.AddField(
+            model_name='wallettransaction',
+            name='balance_after',
+            field=models.DecimalField(decimal_places=2, default=0, max_digits=12),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='wallettransaction',
+            name='sequence',
+            field=models.PositiveIntegerField(default=0),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name='walletcheckpoint',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='wallet_checkpoints', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(backfill_ledger, remove_opening_balances),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 6.0 on 2026-10-18 04:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Separate from 0006: PostgreSQL refuses to ALTER a table with pending
+    # trigger events from the backfill in the same transaction
+
+    dependencies = [
+        ('billing', '0006_wallet_ledger'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='wallettransaction',
+            index=models.Index(fields=['user', 'created_at'], name='wallet_tx_user_created'),
+        ),
+        migrations.AddConstraint(
+            model_name='wallettransaction',
+            constraint=models.UniqueConstraint(fields=('user', 'sequence'), name='wallet_tx_user_sequence'),
+        ),
+        migrations.AddConstraint(
+            model_name='walletcheckpoint',
+            constraint=models.UniqueConstraint(fields=('user', 'sequence'), name='wallet_checkpoint_user_sequence'),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 6.0 on 2026-10-18 04:30
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0007_wallet_ledger_constraints'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='paymentreceipt',
+            index=models.Index(fields=['user', 'created_at'], name='receipt_user_created'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 6.0 on 2026-10-18 04:40
+
+from datetime import timezone
+
+from django.db import migrations, models
+from django.db.models import BooleanField, Count, ExpressionWrapper, Q, Sum
+from django.db.models.functions import TruncHour
+
+
+def backfill_rollups(apps, schema_editor):
+    WalletTransaction = apps.get_model('billing', 'WalletTransaction')
+    PaymentReceipt = apps.get_model('billing', 'PaymentReceipt')
+    WalletRollup = apps.get_model('billing', 'WalletRollup')
+    ReceiptRollup = apps.get_model('billing', 'ReceiptRollup')
+    hour = TruncHour('created_at', tzinfo=timezone.utc)
+
+    entries = (
+        WalletTransaction.objects.order_by()
+        .annotate(hour=hour, credit=ExpressionWrapper(Q(amount__gt=0), output_field=BooleanField()))
+        .values('hour', 'transaction_type', 'credit')
+        .annotate(count=Count('id'), total=Sum('amount'))
+    )
+    WalletRollup.objects.bulk_create((WalletRollup(**row) for row in entries), batch_size=1000)
+
+    receipts = (
+        PaymentReceipt.objects.order_by()
+        .annotate(hour=hour)
+        .values('hour', 'status')
+        .annotate(count=Count('id'), total=Sum('amount'))
+    )
+    ReceiptRollup.objects.bulk_create((ReceiptRollup(**row) for row in receipts), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0008_paymentreceipt_user_created'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReceiptRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('status', models.CharField(choices=[('PENDING', 'Pending'), ('APPROVED', 'Approved'), ('REJECTED', 'Rejected')], max_length=20)),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('hour', 'status'), name='receipt_rollup_key')],
+            },
+        ),
+        migrations.CreateModel(
+            name='WalletRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hour', models.DateTimeField()),
+                ('transaction_type', models.CharField(choices=[('TOP_UP', 'Top Up'), ('SUBSCRIPTION', 'Subscription Payment'), ('ADJUSTMENT', 'Manual Adjustment'), ('PUBLISH_FEE', 'Publication Fee')], max_length=20)),
+                ('credit', models.BooleanField()),
+                ('count', models.IntegerField(default=0)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=16)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('hour', 'transaction_type', 'credit'), name='wallet_rollup_key')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
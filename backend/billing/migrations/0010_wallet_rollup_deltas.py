@@ -0,0 +1,21 @@
+# Generated by Django 6.0 on 2026-10-18 05:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0009_finance_rollups'),
+    ]
+
+    operations = [
+        migrations.RemoveConstraint(
+            model_name='walletrollup',
+            name='wallet_rollup_key',
+        ),
+        migrations.AddIndex(
+            model_name='walletrollup',
+            index=models.Index(fields=['hour', 'transaction_type', 'credit'], name='wallet_rollup_key'),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 6.0 on 2026-10-18 05:33
+
+from datetime import timezone
+
+from django.db import migrations, models
+from django.db.models import Count, ExpressionWrapper, BooleanField, Q, Sum
+from django.db.models.functions import TruncHour
+
+# As written by 0006_wallet_ledger
+OPENING_BALANCE = 'Opening balance carried over to the ledger'
+
+
+def retype_openings(apps, schema_editor, old='ADJUSTMENT', new='OPENING_BALANCE'):
+    """
+    Moves the opening entries to their own type. They were rolled up as
+    ADJUSTMENT; rollup rows are summed by readers, so appending the opposite
+    counts and totals takes them out (or, in reverse, puts them back).
+    """
+    WalletTransaction = apps.get_model('billing', 'WalletTransaction')
+    WalletRollup = apps.get_model('billing', 'WalletRollup')
+
+    openings = WalletTransaction.objects.filter(transaction_type=old, description=OPENING_BALANCE)
+    sign = -1 if new == 'OPENING_BALANCE' else 1
+    rows = (
+        openings.order_by()
+        .annotate(
+            hour=TruncHour('created_at', tzinfo=timezone.utc),
+            credit=ExpressionWrapper(Q(amount__gt=0), output_field=BooleanField()),
+        )
+        .values('hour', 'credit')
+        .annotate(count=Count('id'), total=Sum('amount'))
+    )
+    WalletRollup.objects.bulk_create([
+        WalletRollup(
+            hour=row['hour'], transaction_type='ADJUSTMENT', credit=row['credit'],
+            count=sign * row['count'], total=sign * row['total'],
+        )
+        for row in rows
+    ])
+    openings.update(transaction_type=new)
+
+
+def restore_adjustments(apps, schema_editor):
+    retype_openings(apps, schema_editor, old='OPENING_BALANCE', new='ADJUSTMENT')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('billing', '0010_wallet_rollup_deltas'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='walletrollup',
+            name='transaction_type',
+            field=models.CharField(choices=[('TOP_UP', 'Top Up'), ('SUBSCRIPTION', 'Subscription Payment'), ('ADJUSTMENT', 'Manual Adjustment'), ('PUBLISH_FEE', 'Publication Fee'), ('OPENING_BALANCE', 'Opening Balance')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='wallettransaction',
+            name='transaction_type',
+            field=models.CharField(choices=[('TOP_UP', 'Top Up'), ('SUBSCRIPTION', 'Subscription Payment'), ('ADJUSTMENT', 'Manual Adjustment'), ('PUBLISH_FEE', 'Publication Fee'), ('OPENING_BALANCE', 'Opening Balance')], max_length=20),
+        ),
+        migrations.RunPython(retype_openings, restore_adjustments),
+    ]
@@ -1,9 +1,15 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.utils import timezone
+from config.cache import CatalogQuerySet
 
 User = get_user_model()
 
+
+class SubscriptionPlanQuerySet(CatalogQuerySet):
+    catalog = 'plans'
+
+
 class SubscriptionPlan(models.Model):
     name = models.CharField(max_length=100)
     slug = models.SlugField(unique=True)
@@ -12,6 +18,8 @@ class SubscriptionPlan(models.Model):
     description = models.TextField()
     is_active = models.BooleanField(default=True)
 
+    objects = SubscriptionPlanQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.name} (${self.price})"
 
@@ -75,6 +83,20 @@ class SubscriptionHistory(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.action} - {self.plan.name if self.plan else 'N/A'}"
 
+class PaymentReceiptQuerySet(models.QuerySet):
+    ROLLUP_FIELDS = ('status', 'amount', 'created_at')
+
+    def update(self, **kwargs):
+        """Bulk updates send no signals, so they move receipts between rollups here"""
+        if not any(field in kwargs for field in self.ROLLUP_FIELDS):
+            return super().update(**kwargs)
+        from .rollups import move_receipts
+        with transaction.atomic(using=self.db):
+            before = list(self.select_for_update().values_list('pk', *self.ROLLUP_FIELDS))
+            rows = super().update(**kwargs)
+            move_receipts(before)
+        return rows
+
 class PaymentReceipt(models.Model):
     STATUS_CHOICES = (
         ('PENDING', 'Pending'),
@@ -90,6 +112,14 @@ class PaymentReceipt(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     processed_at = models.DateTimeField(null=True, blank=True)
 
+    objects = PaymentReceiptQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # The user's transaction feed
+            models.Index(fields=['user', 'created_at'], name='receipt_user_created'),
+        ]
+
     def __str__(self):
         return f"Receipt {self.id} - {self.user.username} (${self.amount})"
 
@@ -115,6 +145,8 @@ class WalletTransaction(models.Model):
         ('SUBSCRIPTION', 'Subscription Payment'),
         ('ADJUSTMENT', 'Manual Adjustment'),
         ('PUBLISH_FEE', 'Publication Fee'),
+        # Balances the ledger inherited when it was introduced; not activity
+        ('OPENING_BALANCE', 'Opening Balance'),
     )
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='wallet_transactions')
     amount = models.DecimalField(max_digits=12, decimal_places=2)
@@ -122,12 +154,83 @@ class WalletTransaction(models.Model):
     description = models.CharField(max_length=255)
     created_at = models.DateTimeField(auto_now_add=True)
     
+    # Ledger position: 1, 2, 3... per user, and the balance right after this
+    # entry. Written by billing.wallet while it holds the user's row lock.
+    sequence = models.PositiveIntegerField()
+    balance_after = models.DecimalField(max_digits=12, decimal_places=2)
+
     # Optional references for audit trail
     receipt = models.ForeignKey(PaymentReceipt, on_delete=models.SET_NULL, null=True, blank=True)
     invoice = models.ForeignKey(Invoice, on_delete=models.SET_NULL, null=True, blank=True)
 
     class Meta:
         ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'sequence'], name='wallet_tx_user_sequence'),
+        ]
+        indexes = [
+            # Point-in-time balance, and the user's transaction feed
+            models.Index(fields=['user', 'created_at'], name='wallet_tx_user_created'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} - {self.transaction_type} - {self.amount}"
+
+    def save(self, *args, **kwargs):
+        # The ledger is append-only; corrections are new ADJUSTMENT entries
+        if not self._state.adding:
+            raise ValueError("Wallet transactions cannot be modified")
+        super().save(*args, **kwargs)
+
+class WalletCheckpoint(models.Model):
+    """
+    A user's ledger verified by reconcile_wallets up to ``sequence``. Later
+    runs start from the latest checkpoint instead of the first entry.
+    """
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='wallet_checkpoints')
+    sequence = models.PositiveIntegerField()
+    balance = models.DecimalField(max_digits=12, decimal_places=2)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-sequence']
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'sequence'], name='wallet_checkpoint_user_sequence'),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - #{self.sequence} - {self.balance}"
+
+class WalletRollup(models.Model):
+    """
+    Wallet entries per UTC hour, type and sign, maintained by billing.rollups.
+    A key may have several rows, one per entry, until they are compacted.
+    """
+    hour = models.DateTimeField()
+    transaction_type = models.CharField(max_length=20, choices=WalletTransaction.TRANSACTION_TYPES)
+    credit = models.BooleanField()
+    count = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['hour', 'transaction_type', 'credit'], name='wallet_rollup_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}:00 - {self.transaction_type} - {self.total}"
+
+class ReceiptRollup(models.Model):
+    """Payment receipts per UTC hour of submission and current status"""
+    hour = models.DateTimeField()
+    status = models.CharField(max_length=20, choices=PaymentReceipt.STATUS_CHOICES)
+    count = models.IntegerField(default=0)
+    total = models.DecimalField(max_digits=16, decimal_places=2, default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['hour', 'status'], name='receipt_rollup_key'),
+        ]
+
+    def __str__(self):
+        return f"{self.hour:%Y-%m-%d %H}:00 - {self.status} - {self.total}"
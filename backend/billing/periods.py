@@ -0,0 +1,33 @@
+"""
+Report periods from ``start_date``/``end_date`` query parameters.
+
+Both are YYYY-MM-DD and inclusive, and become aware datetimes at midnight
+in the current timezone: ``created_at >= start`` and ``created_at < end``.
+"""
+from datetime import date, datetime, time, timedelta
+
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+
+def date_bounds(query_params):
+    """{'start': ..., 'end': ...} for the parameters present"""
+    bounds = {}
+    for param, key, days in (('start_date', 'start', 0), ('end_date', 'end', 1)):
+        value = query_params.get(param)
+        if not value:
+            continue
+        try:
+            day = date.fromisoformat(value)
+        except ValueError:
+            raise ValidationError({param: 'Expected a date as YYYY-MM-DD'})
+        bounds[key] = timezone.make_aware(datetime.combine(day + timedelta(days=days), time.min))
+    return bounds
+
+
+def in_period(queryset, bounds, field='created_at'):
+    if 'start' in bounds:
+        queryset = queryset.filter(**{f'{field}__gte': bounds['start']})
+    if 'end' in bounds:
+        queryset = queryset.filter(**{f'{field}__lt': bounds['end']})
+    return queryset
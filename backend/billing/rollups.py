@@ -0,0 +1,178 @@
+"""
+Finance rollups: counts and totals per UTC hour.
+
+WalletRollup is keyed by (hour, transaction type, credit or debit) and
+ReceiptRollup by (hour of submission, current status). Signals in
+billing.signals and PaymentReceiptQuerySet.update() adjust them with the
+change, inside its transaction, so they stay exact and finance endpoints
+sum a few rows per day instead of scanning the transaction tables. Hours rather
+than days let reports cut days at midnight in any whole-hour timezone.
+Opening balances are not activity and stay out of the rollups.
+
+Every wallet write would otherwise update the same row for the current
+hour and hold its lock until commit, queueing all concurrent payments
+behind each other. So each wallet entry inserts a row of its own, which
+readers sum, and once its transaction has committed folds it into the
+key's oldest row in a short transaction of its own. The table stays at
+about one row per key. ``compact()`` (the compact_finance_rollups command)
+merges rows whose fold never ran, e.g. when the process died right after
+the commit. Receipts change at the pace of admin review and update their
+rows in place.
+
+``rebuild()`` recomputes everything from the source tables (the
+rebuild_finance_rollups command).
+"""
+from collections import defaultdict
+from datetime import timezone as dt_timezone
+from decimal import Decimal
+from itertools import groupby
+from operator import itemgetter
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import BooleanField, Count, ExpressionWrapper, F, Q, Sum
+from django.db.models.functions import TruncHour
+from django.utils import timezone
+
+from config.cache import touch_catalog
+from .models import PaymentReceipt, ReceiptRollup, WalletRollup, WalletTransaction
+
+BATCH_SIZE = 1000
+
+
+def hour_of(moment):
+    return moment.astimezone(dt_timezone.utc).replace(minute=0, second=0, microsecond=0)
+
+
+def bump(model, key, count, total):
+    """Add ``count`` and ``total`` to the rollup row at ``key``, creating it"""
+    if not count and not total:
+        return
+    rows = model.objects.filter(**key)
+    if rows.update(count=F('count') + count, total=F('total') + total):
+        return
+    try:
+        with transaction.atomic():
+            model.objects.create(count=count, total=total, **key)
+    except IntegrityError:
+        # Another transaction created it first
+        rows.update(count=F('count') + count, total=F('total') + total)
+
+
+def record_entry(entry, sign=1):
+    if entry.transaction_type == 'OPENING_BALANCE':
+        return
+    key = {'hour': hour_of(entry.created_at), 'transaction_type': entry.transaction_type, 'credit': entry.amount > 0}
+    WalletRollup.objects.create(count=sign, total=sign * entry.amount, **key)
+    # The entry is committed by then: a failed fold is logged, never raised
+    # to the writer, and its rows wait for compact()
+    transaction.on_commit(lambda: fold(key), robust=True)
+
+
+def fold(key):
+    """Merges the WalletRollup rows at ``key`` into the oldest one; returns the number removed"""
+    with transaction.atomic():
+        # Locked, so concurrent folds of the same key take turns; rows
+        # appended meanwhile are folded by their own writers
+        rows = list(WalletRollup.objects.filter(**key).select_for_update().order_by('id').values_list(
+            'id', 'count', 'total',
+        ))
+        if len(rows) < 2:
+            return 0
+        WalletRollup.objects.filter(id=rows[0][0]).update(
+            count=sum(row[1] for row in rows), total=sum(row[2] for row in rows),
+        )
+        WalletRollup.objects.filter(id__in=[row[0] for row in rows[1:]]).delete()
+    return len(rows) - 1
+
+
+def record_receipt(status, amount, created_at, sign=1):
+    amount = Decimal(amount)
+    bump(ReceiptRollup, {'hour': hour_of(created_at), 'status': status}, sign, sign * amount)
+
+
+def move_receipts(before):
+    """
+    ``before`` holds (pk, status, amount, created_at) of receipts read just
+    before an update; moves each from its old rollup to its current one.
+    """
+    if not before:
+        return
+    after = PaymentReceipt.objects.filter(pk__in=[row[0] for row in before]).values_list(
+        'pk', 'status', 'amount', 'created_at',
+    )
+    deltas = defaultdict(lambda: [0, Decimal('0')])
+    for rows, sign in ((before, -1), (after, 1)):
+        for _, status, amount, created_at in rows:
+            delta = deltas[(hour_of(created_at), status)]
+            delta[0] += sign
+            delta[1] += sign * amount
+    for (hour, status), (count, total) in deltas.items():
+        bump(ReceiptRollup, {'hour': hour, 'status': status}, count, total)
+
+
+def compact(before=None):
+    """
+    Merges the WalletRollup rows of each key into one, for hours before
+    ``before`` (by default the current hour, which is still growing).
+    Returns the number of rows removed.
+    """
+    before = before or hour_of(timezone.now())
+    key = ('hour', 'transaction_type', 'credit')
+    with transaction.atomic():
+        hours = (
+            WalletRollup.objects.filter(hour__lt=before).values(*key)
+            .annotate(rows=Count('id')).filter(rows__gt=1).values('hour')
+        )
+        # Locked, so a concurrent compact() cannot merge the same rows again;
+        # rows appended meanwhile are not in the list and are left alone
+        rows = list(
+            WalletRollup.objects.filter(hour__in=hours).select_for_update()
+            .order_by(*key).values_list(*key, 'id', 'count', 'total')
+        )
+        merged, stale = [], []
+        for (hour, transaction_type, credit), group in groupby(rows, itemgetter(0, 1, 2)):
+            group = list(group)
+            if len(group) == 1:
+                continue
+            stale.extend(row[3] for row in group)
+            count, total = sum(row[4] for row in group), sum(row[5] for row in group)
+            if count or total:
+                merged.append(WalletRollup(
+                    hour=hour, transaction_type=transaction_type, credit=credit, count=count, total=total,
+                ))
+        for start in range(0, len(stale), BATCH_SIZE):
+            WalletRollup.objects.filter(id__in=stale[start:start + BATCH_SIZE]).delete()
+        WalletRollup.objects.bulk_create(merged, batch_size=BATCH_SIZE)
+    return len(stale) - len(merged)
+
+
+def rebuild():
+    """Recomputes both rollups from the source tables"""
+    hour = TruncHour('created_at', tzinfo=dt_timezone.utc)
+
+    with transaction.atomic():
+        if connection.vendor == 'postgresql':
+            # Writers wait, or their rollup updates would be lost or doubled
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    f'LOCK TABLE {WalletTransaction._meta.db_table}, {PaymentReceipt._meta.db_table} IN SHARE MODE'
+                )
+        WalletRollup.objects.all().delete()
+        ReceiptRollup.objects.all().delete()
+
+        entries = (
+            WalletTransaction.objects.exclude(transaction_type='OPENING_BALANCE').order_by()
+            .annotate(hour=hour, credit=ExpressionWrapper(Q(amount__gt=0), output_field=BooleanField()))
+            .values('hour', 'transaction_type', 'credit')
+            .annotate(count=Count('id'), total=Sum('amount'))
+        )
+        WalletRollup.objects.bulk_create((WalletRollup(**row) for row in entries), batch_size=BATCH_SIZE)
+
+        receipts = (
+            PaymentReceipt.objects.order_by()
+            .annotate(hour=hour)
+            .values('hour', 'status')
+            .annotate(count=Count('id'), total=Sum('amount'))
+        )
+        ReceiptRollup.objects.bulk_create((ReceiptRollup(**row) for row in receipts), batch_size=BATCH_SIZE)
+        touch_catalog('rollups')
@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from .models import SubscriptionPlan, UserSubscription, Invoice, SubscriptionHistory, PaymentReceipt, BillingConfig, WalletTransaction
 from django.contrib.auth import get_user_model
+from config.values_serializer import ValuesSerializer
 
 User = get_user_model()
 
@@ -9,6 +10,10 @@ class SubscriptionPlanSerializer(serializers.ModelSerializer):
         model = SubscriptionPlan
         fields = '__all__'
 
+class SubscriptionPlanValuesSerializer(ValuesSerializer):
+    """Read-only SubscriptionPlanSerializer for list responses"""
+    model = SubscriptionPlan
+
 class UserSubscriptionSerializer(serializers.ModelSerializer):
     plan_name = serializers.CharField(source='plan.name', read_only=True)
     
@@ -52,4 +57,4 @@ class AdminPaymentReceiptSerializer(serializers.ModelSerializer):
 class WalletTransactionSerializer(serializers.ModelSerializer):
     class Meta:
         model = WalletTransaction
-        fields = ['id', 'amount', 'transaction_type', 'description', 'created_at']
+        fields = ['id', 'amount', 'balance_after', 'transaction_type', 'description', 'created_at']
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_save, post_delete, pre_save
+from django.dispatch import receiver
+
+from config.cache import touch_catalog
+from . import rollups
+from .models import PaymentReceipt, SubscriptionPlan, WalletTransaction
+
+
+@receiver(post_save, sender=SubscriptionPlan)
+@receiver(post_delete, sender=SubscriptionPlan)
+def plan_changed(sender, **kwargs):
+    touch_catalog('plans')
+
+
+@receiver(post_save, sender=WalletTransaction)
+def entry_created(sender, instance, created, **kwargs):
+    # Entries are append-only, so a save is always an insert
+    if created:
+        rollups.record_entry(instance)
+        # Balances changed: drop the cached finance leaderboard
+        touch_catalog('wallets')
+
+
+@receiver(post_delete, sender=WalletTransaction)
+def entry_deleted(sender, instance, **kwargs):
+    rollups.record_entry(instance, sign=-1)
+    # Past rollup hours change too: drop the cached revenue trends
+    touch_catalog('wallets', 'rollups')
+
+
+@receiver(pre_save, sender=PaymentReceipt)
+def receipt_saving(sender, instance, **kwargs):
+    instance._rollup_previous = None
+    if not instance._state.adding:
+        instance._rollup_previous = (
+            PaymentReceipt.objects.filter(pk=instance.pk).values_list('status', 'amount', 'created_at').first()
+        )
+
+
+@receiver(post_save, sender=PaymentReceipt)
+def receipt_saved(sender, instance, created, **kwargs):
+    previous = getattr(instance, '_rollup_previous', None)
+    current = (instance.status, instance.amount, instance.created_at)
+    if previous == current:
+        return
+    if previous:
+        rollups.record_receipt(*previous, sign=-1)
+    rollups.record_receipt(*current)
+
+
+@receiver(post_delete, sender=PaymentReceipt)
+def receipt_deleted(sender, instance, **kwargs):
+    rollups.record_receipt(instance.status, instance.amount, instance.created_at, sign=-1)
@@ -1,3 +1,540 @@
-from django.test import TestCase
+import threading
+import time
+from datetime import datetime, timedelta
+from decimal import Decimal
+from io import StringIO
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from django.db import OperationalError, connection
+from django.db.models import Sum
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APITestCase
+
+from . import rollups, wallet
+from .models import (
+    Invoice, PaymentReceipt, ReceiptRollup, SubscriptionPlan, UserSubscription, WalletCheckpoint, WalletRollup,
+    WalletTransaction,
+)
+
+User = get_user_model()
+
+
+class WalletServiceTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='payer', password='pass', balance=Decimal('50.00'))
+
+    def test_debit_updates_balance_and_records_transaction(self):
+        tx = wallet.debit(self.user, Decimal('20.00'), 'PUBLISH_FEE', 'Fee')
+
+        self.assertEqual(self.user.balance, Decimal('30.00'))
+        self.assertEqual(User.objects.get(pk=self.user.pk).balance, Decimal('30.00'))
+        self.assertEqual(tx.amount, Decimal('-20.00'))
+        self.assertEqual(tx.transaction_type, 'PUBLISH_FEE')
+
+    def test_insufficient_debit_writes_nothing(self):
+        with self.assertRaises(wallet.InsufficientBalance) as raised:
+            wallet.debit(self.user, Decimal('50.01'), 'PUBLISH_FEE', 'Fee')
+
+        self.assertEqual(raised.exception.balance, Decimal('50.00'))
+        self.assertEqual(User.objects.get(pk=self.user.pk).balance, Decimal('50.00'))
+        self.assertFalse(WalletTransaction.objects.exists())
+
+    def test_stale_user_does_not_overwrite_other_changes(self):
+        # Another request renames the user and credits the wallet meanwhile
+        User.objects.filter(pk=self.user.pk).update(first_name='Renamed', balance=Decimal('80.00'))
+
+        wallet.debit(self.user, Decimal('30.00'), 'PUBLISH_FEE', 'Fee')
+
+        fresh = User.objects.get(pk=self.user.pk)
+        self.assertEqual(fresh.first_name, 'Renamed')
+        self.assertEqual(fresh.balance, Decimal('50.00'))
+        self.assertEqual(self.user.balance, Decimal('50.00'))
+
+    def test_adjustment_may_overdraw(self):
+        wallet.apply(self.user, Decimal('-70.00'), 'ADJUSTMENT', 'Reversal', allow_overdraft=True)
+
+        self.assertEqual(User.objects.get(pk=self.user.pk).balance, Decimal('-20.00'))
+
+
+class WalletLedgerTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='payer', password='pass')
+
+    def post(self, amount, days_ago):
+        tx = wallet.apply(self.user, Decimal(amount), 'ADJUSTMENT', 'Entry', allow_overdraft=True)
+        WalletTransaction.objects.filter(pk=tx.pk).update(created_at=timezone.now() - timedelta(days=days_ago))
+        return tx
+
+    def test_entries_carry_sequence_and_running_balance(self):
+        entries = [self.post(amount, 0) for amount in ('30.00', '-5.50', '10.00')]
+
+        self.assertEqual([tx.sequence for tx in entries], [1, 2, 3])
+        self.assertEqual([tx.balance_after for tx in entries], [Decimal('30.00'), Decimal('24.50'), Decimal('34.50')])
+
+    def test_balance_at(self):
+        self.post('30.00', 10)
+        self.post('-5.50', 5)
+        self.post('10.00', 1)
+
+        self.assertEqual(wallet.balance_at(self.user, timezone.now() - timedelta(days=20)), Decimal('0.00'))
+        self.assertEqual(wallet.balance_at(self.user, timezone.now() - timedelta(days=7)), Decimal('30.00'))
+        self.assertEqual(wallet.balance_at(self.user, timezone.now() - timedelta(days=3)), Decimal('24.50'))
+        self.assertEqual(wallet.balance_at(self.user, timezone.now()), Decimal('34.50'))
+
+    def test_entries_are_append_only(self):
+        tx = self.post('30.00', 0)
+        tx.amount = Decimal('3000.00')
+
+        with self.assertRaises(ValueError):
+            tx.save()
+
+
+class ReconcileWalletsTests(TestCase):
+    def setUp(self):
+        self.users = [User.objects.create_user(username=f'payer{i}', password='pass') for i in range(3)]
+        for user in self.users:
+            wallet.credit(user, Decimal('40.00'), 'TOP_UP', 'Top-up')
+            wallet.debit(user, Decimal('15.00'), 'PUBLISH_FEE', 'Fee')
+
+    def reconcile(self, *args):
+        call_command('reconcile_wallets', *args, stdout=StringIO(), stderr=StringIO())
+
+    def test_checkpoints_verified_ledgers(self):
+        self.reconcile()
+
+        self.assertEqual(
+            sorted(WalletCheckpoint.objects.values_list('sequence', 'balance')),
+            [(2, Decimal('25.00'))] * 3,
+        )
+
+    def test_continues_from_checkpoint(self):
+        self.reconcile()
+        wallet.credit(self.users[0], Decimal('5.00'), 'TOP_UP', 'Top-up')
+        self.reconcile()
+
+        latest = WalletCheckpoint.objects.filter(user=self.users[0]).first()
+        self.assertEqual((latest.sequence, latest.balance), (3, Decimal('30.00')))
+        self.assertEqual(WalletCheckpoint.objects.count(), 4)
+
+    def test_balance_changed_outside_the_ledger(self):
+        User.objects.filter(pk=self.users[1].pk).update(balance=Decimal('99.00'))
+
+        with self.assertRaisesMessage(CommandError, '1 wallets do not reconcile'):
+            self.reconcile()
+        self.assertFalse(WalletCheckpoint.objects.filter(user=self.users[1], sequence__gt=2).exists())
+
+    def test_rewritten_entry(self):
+        self.reconcile()
+        WalletTransaction.objects.filter(user=self.users[2], sequence=1).update(amount=Decimal('400.00'))
+
+        # Checkpointed history is only re-read with --full
+        self.reconcile()
+        with self.assertRaisesMessage(CommandError, '1 wallets do not reconcile'):
+            self.reconcile('--full')
+
+
+class WalletViewTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='payer', password='pass', balance=Decimal('10.00'))
+        self.admin = User.objects.create_superuser(username='admin', password='pass')
+        self.plan = SubscriptionPlan.objects.create(name='Pro', price=Decimal('25.00'), article_limit=5)
+
+    def test_subscribe_without_funds_leaves_no_invoice(self):
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/billing/subscribe/', {'plan_id': self.plan.id})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Invoice.objects.exists())
+        self.assertFalse(UserSubscription.objects.exists())
+
+    def test_subscribe_debits_balance(self):
+        User.objects.filter(pk=self.user.pk).update(balance=Decimal('30.00'))
+        self.client.force_authenticate(self.user)
+        response = self.client.post('/api/billing/subscribe/', {'plan_id': self.plan.id})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Decimal(str(response.data['new_balance'])), Decimal('5.00'))
+        tx = WalletTransaction.objects.get(user=self.user)
+        self.assertEqual(tx.amount, Decimal('-25.00'))
+        self.assertIsNotNone(tx.invoice)
+
+    def test_receipt_is_credited_once(self):
+        receipt = PaymentReceipt.objects.create(user=self.user, amount=Decimal('15.00'), receipt_image='receipts/r.png')
+        self.client.force_authenticate(self.admin)
+        url = f'/api/admin-receipts/{receipt.id}/approve/'
+
+        self.assertEqual(self.client.post(url).status_code, 200)
+        self.assertEqual(self.client.post(url).status_code, 400)
+        self.assertEqual(User.objects.get(pk=self.user.pk).balance, Decimal('25.00'))
+        self.assertEqual(WalletTransaction.objects.filter(receipt=receipt).count(), 1)
+
+
+class TransactionFeedTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='payer', password='pass')
+        self.client.force_authenticate(self.user)
+        self.now = timezone.now().replace(microsecond=0)
+        approved = self.receipt('APPROVED', '30.00', days_ago=6, admin_notes='Checked')
+        self.entry(wallet.credit(self.user, approved.amount, 'TOP_UP', 'Top-up', receipt=approved), days_ago=6)
+        self.entry(wallet.debit(self.user, Decimal('10.00'), 'PUBLISH_FEE', 'Fee'), days_ago=4)
+        self.receipt('REJECTED', '5.00', days_ago=3, admin_notes='Blurry')
+        self.entry(wallet.debit(self.user, Decimal('5.00'), 'SUBSCRIPTION', 'Plan'), days_ago=2)
+        # Same moment as the entry above: ties are broken by kind, then id
+        self.receipt('PENDING', '20.00', days_ago=2)
+        other = User.objects.create_user(username='other', password='pass')
+        wallet.credit(other, Decimal('1.00'), 'ADJUSTMENT', 'Not yours')
+
+    def entry(self, tx, days_ago):
+        WalletTransaction.objects.filter(pk=tx.pk).update(created_at=self.now - timedelta(days=days_ago))
+
+    def receipt(self, status, amount, days_ago, admin_notes=''):
+        receipt = PaymentReceipt.objects.create(
+            user=self.user, amount=Decimal(amount), receipt_image='receipts/r.png', status=status, admin_notes=admin_notes,
+        )
+        PaymentReceipt.objects.filter(pk=receipt.pk).update(created_at=self.now - timedelta(days=days_ago))
+        return receipt
+
+    def fetch(self, url='/api/billing/transactions/', **params):
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_merged_newest_first(self):
+        with self.assertNumQueries(1):
+            data = self.fetch()
+
+        rows = data['results']
+        self.assertEqual(
+            [(row['type'], row['status'], row['amount'], row['balance_after']) for row in rows],
+            [
+                ('SUBSCRIPTION', 'COMPLETED', '-5.00', '15.00'),
+                ('TOP_UP', 'PENDING', '20.00', None),
+                ('TOP_UP', 'REJECTED', '5.00', None),
+                ('PUBLISH_FEE', 'COMPLETED', '-10.00', '20.00'),
+                ('TOP_UP', 'COMPLETED', '30.00', '30.00'),
+            ],
+        )
+        self.assertTrue(rows[0]['id'].startswith('TRX-'))
+        self.assertTrue(rows[1]['id'].startswith('RCP-'))
+        # Receipt fields of a wallet entry come from the join
+        self.assertEqual(rows[-1]['admin_note'], 'Checked')
+        self.assertTrue(rows[-1]['receipt_image'].endswith('receipts/r.png'))
+        self.assertIsNone(rows[0]['receipt_image'])
+
+    def test_keyset_pages(self):
+        everything = [row['id'] for row in self.fetch()['results']]
+
+        seen, pages = [], []
+        data = self.fetch(page_size=2)
+        while True:
+            pages.append(data)
+            seen.extend(row['id'] for row in data['results'])
+            if not data['next']:
+                break
+            data = self.fetch(data['next'])
+        self.assertEqual(seen, everything)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]['previous'])
+
+        previous = self.fetch(pages[2]['previous'])
+        self.assertEqual([row['id'] for row in previous['results']], everything[2:4])
+
+    def test_type_and_date_filters(self):
+        top_ups = self.fetch(type='TOP_UP')['results']
+        self.assertEqual([row['status'] for row in top_ups], ['PENDING', 'REJECTED', 'COMPLETED'])
+
+        fees = self.fetch(type='PUBLISH_FEE')['results']
+        self.assertEqual([row['amount'] for row in fees], ['-10.00'])
+
+        day = (self.now - timedelta(days=3)).date()
+        window = self.fetch(start_date=(day - timedelta(days=1)).isoformat(), end_date=day.isoformat())['results']
+        self.assertEqual([row['status'] for row in window], ['REJECTED', 'COMPLETED'])
+
+    def test_invalid_filters(self):
+        self.assertEqual(self.client.get('/api/billing/transactions/', {'type': 'GIFT'}).status_code, 400)
+        self.assertEqual(self.client.get('/api/billing/transactions/', {'start_date': 'May'}).status_code, 400)
+
+
+class FinanceRollupTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username='payer', password='pass')
+        self.finance = User.objects.create_user(username='finance', password='pass', is_finance_admin=True)
+        self.admin = User.objects.create_superuser(username='admin', password='pass')
+
+    def snapshot(self):
+        # Wallet rollups may hold several rows per key until compacted
+        wallet_rollups = (
+            WalletRollup.objects.values('hour', 'transaction_type', 'credit')
+            .annotate(entries=Sum('count'), amount=Sum('total')).filter(entries__gt=0)
+            .values_list('hour', 'transaction_type', 'credit', 'entries', 'amount')
+        )
+        return (
+            sorted(wallet_rollups),
+            sorted(ReceiptRollup.objects.filter(count__gt=0).values_list('hour', 'status', 'count', 'total')),
+        )
+
+    def receipt(self, amount):
+        return PaymentReceipt.objects.create(user=self.user, amount=Decimal(amount), receipt_image='receipts/r.png')
+
+    def activity(self):
+        self.client.force_authenticate(self.admin)
+        # Not activity: left out of every rollup
+        wallet.apply(self.user, Decimal('-15.00'), 'OPENING_BALANCE', 'Opening balance', allow_overdraft=True)
+        approved, rejected, edited, deleted = (self.receipt(amount) for amount in ('50.00', '7.00', '9.00', '4.00'))
+        self.client.post(f'/api/admin-receipts/{approved.id}/approve/')
+        self.client.post(f'/api/admin-receipts/{rejected.id}/reject/')
+        edited.amount = Decimal('11.00')
+        edited.save()
+        deleted.delete()
+        wallet.debit(self.user, Decimal('20.00'), 'PUBLISH_FEE', 'Fee')
+        wallet.apply(self.user, Decimal('-5.00'), 'ADJUSTMENT', 'Correction', allow_overdraft=True)
+        wallet.apply(self.user, Decimal('2.50'), 'ADJUSTMENT', 'Correction', allow_overdraft=True)
+
+    def test_incremental_rollups_match_rebuild(self):
+        self.activity()
+        incremental = self.snapshot()
+
+        call_command('rebuild_finance_rollups', stdout=StringIO())
+
+        self.assertEqual(self.snapshot(), incremental)
+        hour = rollups.hour_of(timezone.now())
+        self.assertIn((hour, 'TOP_UP', True, 1, Decimal('50.00')), incremental[0])
+        self.assertIn((hour, 'PENDING', 1, Decimal('11.00')), incremental[1])
+
+    def test_wallet_entries_are_folded_after_commit(self):
+        self.activity()
+        fees = WalletRollup.objects.filter(transaction_type='PUBLISH_FEE')
+        with self.captureOnCommitCallbacks(execute=True):
+            wallet.debit(self.user, Decimal('3.00'), 'PUBLISH_FEE', 'Fee')
+        self.assertEqual(list(fees.values_list('count', 'total')), [(2, Decimal('-23.00'))])
+
+    def test_compaction_merges_rows_that_were_not_folded(self):
+        self.activity()
+        # In a TestCase nothing commits, so the fold never runs
+        wallet.debit(self.user, Decimal('3.00'), 'PUBLISH_FEE', 'Fee')
+        incremental = self.snapshot()
+        self.assertEqual(WalletRollup.objects.filter(transaction_type='PUBLISH_FEE').count(), 2)
+
+        # The current hour is still growing and is left alone by default
+        call_command('compact_finance_rollups', stdout=StringIO())
+        self.assertEqual(WalletRollup.objects.filter(transaction_type='PUBLISH_FEE').count(), 2)
+
+        self.assertEqual(rollups.compact(before=timezone.now() + timedelta(hours=1)), 1)
+        self.assertEqual(
+            list(WalletRollup.objects.filter(transaction_type='PUBLISH_FEE').values_list('count', 'total')),
+            [(2, Decimal('-23.00'))],
+        )
+        self.assertEqual(self.snapshot(), incremental)
+        self.assertEqual(rollups.compact(before=timezone.now() + timedelta(hours=1)), 0)
+
+    def test_finance_endpoints_read_rollups(self):
+        self.activity()
+        self.client.force_authenticate(self.finance)
+        today = timezone.localdate().isoformat()
+
+        with CaptureQueriesContext(connection) as queries:
+            dashboard = self.client.get('/api/finance/dashboard/', {'start_date': today, 'end_date': today}).data
+            breakdown = self.client.get('/api/finance/transaction-breakdown/').data
+            trend = self.client.get('/api/finance/revenue-trend/').data
+        self.assertFalse([q for q in queries if 'billing_wallettransaction' in q['sql'] or 'billing_paymentreceipt' in q['sql']])
+
+        # Compared as numbers: SQLite does not quantize sums
+        self.assertEqual(Decimal(dashboard['total_revenue']), Decimal('50.00'))
+        self.assertEqual(dashboard['pending_topups_count'], 1)
+        self.assertEqual(Decimal(dashboard['pending_topups_amount']), Decimal('11.00'))
+        self.assertEqual(
+            [(row['type'], row['count'], Decimal(row['total'])) for row in breakdown],
+            [('ADJUSTMENT', 2, Decimal('-2.50')), ('PUBLISH_FEE', 1, Decimal('-20.00')), ('TOP_UP', 1, Decimal('50.00'))],
+        )
+        self.assertEqual(
+            [(row['period'], Decimal(row['revenue'])) for row in trend],
+            [(timezone.now().strftime('%Y-%m'), Decimal('50.00'))],
+        )
+
+        yesterday = (timezone.localdate() - timedelta(days=1)).isoformat()
+        earlier = self.client.get('/api/finance/dashboard/', {'end_date': yesterday}).data
+        self.assertEqual(Decimal(earlier['total_revenue']), 0)
+
+
+@override_settings(SHARED_CACHE=True)
+class TopUsersTests(APITestCase):
+    def setUp(self):
+        self.finance = User.objects.create_user(username='finance', password='pass', is_finance_admin=True)
+        self.rich, self.spender, self.idle = (
+            User.objects.create_user(username=name, password='pass') for name in ('rich', 'spender', 'idle')
+        )
+        wallet.credit(self.rich, Decimal('500.00'), 'TOP_UP', 'Top-up')
+        wallet.credit(self.spender, Decimal('100.00'), 'TOP_UP', 'Top-up')
+        wallet.debit(self.spender, Decimal('60.00'), 'PUBLISH_FEE', 'Fee')
+        wallet.debit(self.spender, Decimal('30.00'), 'SUBSCRIPTION', 'Plan')
+        wallet.debit(self.rich, Decimal('10.00'), 'PUBLISH_FEE', 'Fee')
+        self.client.force_authenticate(self.finance)
+
+    def ranking(self, **params):
+        response = self.client.get('/api/finance/top-users/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['username'], Decimal(row['total_spent'])) for row in response.data]
+
+    def test_metrics(self):
+        self.assertEqual(self.ranking(), [('rich', Decimal('10.00')), ('spender', Decimal('90.00'))])
+        self.assertEqual(self.ranking(metric='spend'), [('spender', Decimal('90.00')), ('rich', Decimal('10.00'))])
+        self.assertEqual(self.ranking(metric='top_ups', limit=1), [('rich', Decimal('10.00'))])
+        self.assertEqual(self.client.get('/api/finance/top-users/', {'metric': 'karma'}).status_code, 400)
+
+    def test_opening_balances_are_not_spend(self):
+        wallet.apply(self.rich, Decimal('-200.00'), 'OPENING_BALANCE', 'Opening balance', allow_overdraft=True)
+        self.assertEqual(self.ranking(metric='spend'), [('spender', Decimal('90.00')), ('rich', Decimal('10.00'))])
+
+    def test_one_query_per_ranking(self):
+        today = timezone.localdate().isoformat()
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(
+                self.ranking(metric='spend', start_date=today, end_date=today),
+                [('spender', Decimal('90.00')), ('rich', Decimal('10.00'))],
+            )
+        self.assertEqual(len(queries), 1)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.ranking(limit=1), [('rich', Decimal('10.00'))])
+        self.assertEqual(len(queries), 1)
+        # Balance ranks users before their entries are aggregated
+        self.assertIn('IN (SELECT', queries[0]['sql'])
+
+        yesterday = (timezone.localdate() - timedelta(days=1)).isoformat()
+        self.assertEqual(self.ranking(end_date=yesterday), [('rich', Decimal('0')), ('spender', Decimal('0'))])
+
+    def test_cached_until_wallet_changes(self):
+        self.ranking()
+        with CaptureQueriesContext(connection) as queries:
+            self.ranking()
+        self.assertFalse([q for q in queries if 'billing_wallettransaction' in q['sql']])
+
+        wallet.credit(self.idle, Decimal('900.00'), 'TOP_UP', 'Top-up')
+        self.assertEqual(self.ranking()[0], ('idle', Decimal('0')))
+
+
+@override_settings(SHARED_CACHE=True)
+class RevenueTrendTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username='finance', password='pass', is_finance_admin=True))
+        for moment, total in (('2026-01-01T10:00Z', '40.00'), ('2026-01-03T23:00Z', '15.50'), ('2026-05-20T12:00Z', '9.00')):
+            WalletRollup.objects.create(
+                hour=datetime.fromisoformat(moment), transaction_type='TOP_UP', credit=True, count=1, total=Decimal(total)
+            )
+        WalletRollup.objects.create(
+            hour=datetime.fromisoformat('2026-01-02T10:00Z'), transaction_type='PUBLISH_FEE', credit=False, count=1,
+            total=Decimal('-5.00'),
+        )
+
+    def trend(self, **params):
+        response = self.client.get('/api/finance/revenue-trend/', params)
+        self.assertEqual(response.status_code, 200)
+        return [(row['period'], row['revenue']) for row in response.data]
+
+    def test_buckets_are_gap_filled_in_the_timezone(self):
+        self.assertEqual(
+            self.trend(granularity='day', tz='Asia/Tashkent', start_date='2026-01-01', end_date='2026-01-04'),
+            [('2026-01-01', '40.00'), ('2026-01-02', '0.00'), ('2026-01-03', '0.00'), ('2026-01-04', '15.50')],
+        )
+        self.assertEqual(
+            self.trend(granularity='day', tz='UTC', start_date='2026-01-03', end_date='2026-01-03'),
+            [('2026-01-03', '15.50')],
+        )
+        self.assertEqual(
+            self.trend(granularity='week', start_date='2026-01-01', end_date='2026-01-12'),
+            [('2025-12-29', '55.50'), ('2026-01-05', '0.00'), ('2026-01-12', '0.00')],
+        )
+        self.assertEqual(
+            self.trend(granularity='quarter', start_date='2026-01-01', end_date='2026-06-30'),
+            [('2026-Q1', '55.50'), ('2026-Q2', '9.00')],
+        )
+        months = self.trend(end_date='2026-05-31')
+        self.assertEqual(len(months), 5)
+        self.assertEqual(months[1:4], [('2026-02', '0.00'), ('2026-03', '0.00'), ('2026-04', '0.00')])
+
+    def test_past_buckets_are_cached(self):
+        params = {'granularity': 'week', 'start_date': '2026-01-01', 'end_date': '2026-01-12'}
+        expected = self.trend(**params)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.trend(**params), expected)
+        self.assertFalse(queries.captured_queries)
+
+        # The rollups were written directly, so a rebuild from the (empty) ledger drops them
+        call_command('rebuild_finance_rollups', stdout=StringIO())
+        self.assertEqual(self.trend(**params), [('2025-12-29', '0.00'), ('2026-01-05', '0.00'), ('2026-01-12', '0.00')])
+
+    def test_current_bucket_is_extended(self):
+        user = User.objects.create_user(username='payer', password='pass')
+        self.trend(granularity='month', tz='UTC')
+        wallet.credit(user, Decimal('12.00'), 'TOP_UP', 'Top-up')
+
+        with CaptureQueriesContext(connection) as queries:
+            months = self.trend(granularity='month', tz='UTC')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(months[-1], (timezone.now().strftime('%Y-%m'), '12.00'))
+        self.assertEqual(months[0], ('2026-01', '55.50'))
+
+    def test_invalid_parameters(self):
+        for params in ({'granularity': 'year'}, {'tz': 'Mars/Olympus'}, {'granularity': 'day', 'start_date': '2020-01-01'}):
+            self.assertEqual(self.client.get('/api/finance/revenue-trend/', params).status_code, 400)
+
+    def test_timezones_off_the_hour_are_rejected(self):
+        response = self.client.get('/api/finance/revenue-trend/', {'granularity': 'day', 'tz': 'Asia/Kolkata'})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('tz', response.data)
+
+        # Lord Howe Island is UTC+11 in daylight saving time and UTC+10:30 otherwise
+        lord_howe = {'granularity': 'day', 'tz': 'Australia/Lord_Howe'}
+        self.assertEqual(self.trend(**lord_howe, start_date='2026-01-01', end_date='2026-01-01'), [('2026-01-01', '40.00')])
+        response = self.client.get(
+            '/api/finance/revenue-trend/', {**lord_howe, 'start_date': '2026-03-01', 'end_date': '2026-05-31'},
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class WalletConcurrencyTests(TransactionTestCase):
+    """Many threads debit one wallet at once: no lost updates, no overdraft"""
+
+    THREADS = 8
+    ATTEMPTS = 25
+    BALANCE = 100
+
+    def debit_with_retry(self, user):
+        # SQLite's test database reports lock contention instead of waiting
+        while True:
+            try:
+                return wallet.debit(user, Decimal('1.00'), 'PUBLISH_FEE', 'Fee')
+            except OperationalError:
+                time.sleep(0.001)
+
+    def test_concurrent_debits(self):
+        user = User.objects.create_user(username='payer', password='pass', balance=Decimal(self.BALANCE))
+        outcomes = []
+        start = threading.Barrier(self.THREADS)
+
+        def worker():
+            # Each thread works on its own copy, as separate requests would
+            payer = User.objects.get(pk=user.pk)
+            start.wait()
+            try:
+                for _ in range(self.ATTEMPTS):
+                    try:
+                        self.debit_with_retry(payer)
+                        outcomes.append(True)
+                    except wallet.InsufficientBalance:
+                        outcomes.append(False)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=worker) for _ in range(self.THREADS)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(outcomes.count(True), self.BALANCE)
+        self.assertEqual(User.objects.get(pk=user.pk).balance, Decimal('0.00'))
+        self.assertEqual(WalletTransaction.objects.filter(user=user).count(), self.BALANCE)
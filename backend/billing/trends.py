@@ -0,0 +1,154 @@
+"""
+Top-up revenue per day, week, month or quarter in a given timezone.
+
+Buckets are truncated by the database from the hourly WalletRollup rows,
+so they are exact in any whole-hour timezone. Where a bucket would start
+off the hour (Asia/Kolkata, or Lord Howe Island outside daylight saving
+time) the request is rejected rather than answered inexactly. The result
+has a row for every bucket in the range, with zero revenue where there was
+none, from the first bucket with revenue (or ``start``) to the current one
+(or ``end``).
+
+Only the current hour's rollups still change, so everything before the
+current bucket is cached per (granularity, timezone, range) and each call
+adds just the current bucket: a single small query. The cache key carries
+the current bucket, so at rollover the closed part is recomputed once, and
+a 'rollups' version stamp that rebuilds and deleted entries bump.
+"""
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+
+from django.db.models import Sum
+from django.db.models.functions import Trunc
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+
+from config.cache import catalog_cache, catalog_version
+from .models import WalletRollup
+from .periods import date_bounds, in_period
+
+GRANULARITIES = ('day', 'week', 'month', 'quarter')
+
+CENT = Decimal('0.01')
+
+MAX_BUCKETS = 1000
+
+HOUR = timedelta(hours=1)
+
+
+def trend_params(query_params):
+    """(granularity, tzinfo, bounds) from the request, bounds in that timezone"""
+    granularity = query_params.get('granularity', 'month')
+    if granularity not in GRANULARITIES:
+        raise ValidationError({'granularity': f"Expected one of {', '.join(GRANULARITIES)}"})
+    tzinfo = timezone.get_current_timezone()
+    if query_params.get('tz'):
+        try:
+            tzinfo = ZoneInfo(query_params['tz'])
+        except (ZoneInfoNotFoundError, ValueError):
+            raise ValidationError({'tz': 'Expected an IANA timezone name'})
+    with timezone.override(tzinfo):
+        bounds = date_bounds(query_params)
+    return granularity, tzinfo, bounds
+
+
+def bucket_of(day, granularity):
+    """Start date of the bucket holding ``day``; weeks start on Monday"""
+    if granularity == 'day':
+        return day
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day.replace(month=(day.month - 1) // 3 * 3 + 1, day=1)
+
+
+def next_bucket(start, granularity):
+    if granularity == 'day':
+        return start + timedelta(days=1)
+    if granularity == 'week':
+        return start + timedelta(weeks=1)
+    month = start.month - 1 + (1 if granularity == 'month' else 3)
+    return date(start.year + month // 12, month % 12 + 1, 1)
+
+
+def boundary(day, tzinfo):
+    return timezone.make_aware(datetime.combine(day, time.min), tzinfo)
+
+
+def label(start, granularity):
+    if granularity == 'month':
+        return start.strftime('%Y-%m')
+    if granularity == 'quarter':
+        return f'{start.year}-Q{(start.month - 1) // 3 + 1}'
+    return start.isoformat()
+
+
+def top_ups(bounds):
+    return in_period(WalletRollup.objects.filter(transaction_type='TOP_UP', credit=True), bounds, 'hour')
+
+
+def closed_buckets(granularity, tzinfo, bounds):
+    """[(bucket start date, revenue)] for buckets with revenue, in order"""
+    rows = (
+        top_ups(bounds)
+        .annotate(bucket=Trunc('hour', granularity, tzinfo=tzinfo))
+        .values('bucket')
+        .annotate(revenue=Sum('total'))
+        .order_by('bucket')
+    )
+    return [(timezone.localtime(row['bucket'], tzinfo).date(), row['revenue']) for row in rows]
+
+
+def revenue_trend(granularity, tzinfo, bounds):
+    current = bucket_of(timezone.localdate(timezone=tzinfo), granularity)
+    current_start = boundary(current, tzinfo)
+    end = bounds.get('end')
+
+    closed_bounds = {**bounds, 'end': min(end, current_start) if end else current_start}
+    key = ':'.join([
+        'finance:trend', granularity, str(tzinfo),
+        *(bounds[name].isoformat() if name in bounds else '' for name in ('start', 'end')),
+        current.isoformat(), str(catalog_version('rollups')),
+    ])
+    revenue = catalog_cache.get(key)
+    if revenue is None:
+        revenue = closed_buckets(granularity, tzinfo, closed_bounds)
+        catalog_cache.set(key, revenue)
+    revenue = dict(revenue)
+
+    if end is None or end > current_start:
+        open_bounds = {**bounds, 'start': max(bounds.get('start', current_start), current_start)}
+        total = top_ups(open_bounds).aggregate(revenue=Sum('total'))['revenue']
+        if total:
+            revenue[current] = total
+
+    if 'start' in bounds:
+        first = bucket_of(timezone.localtime(bounds['start'], tzinfo).date(), granularity)
+    elif revenue:
+        first = min(revenue)
+    else:
+        return []
+    last = bucket_of(timezone.localtime(end - timedelta(microseconds=1), tzinfo).date(), granularity) if end else current
+
+    data = []
+    boundaries = [bounds[name] for name in ('start', 'end') if name in bounds]
+    bucket = first
+    while bucket <= last:
+        if len(data) == MAX_BUCKETS:
+            raise ValidationError({'granularity': f'The range spans more than {MAX_BUCKETS} buckets'})
+        boundaries.append(boundary(bucket, tzinfo))
+        data.append({
+            'period': label(bucket, granularity),
+            'start': bucket.isoformat(),
+            'revenue': str(Decimal(revenue.get(bucket, 0)).quantize(CENT)),
+        })
+        bucket = next_bucket(bucket, granularity)
+    boundaries.append(boundary(bucket, tzinfo))
+
+    for moment in boundaries:
+        moment = timezone.localtime(moment, tzinfo)
+        if moment.utcoffset() % HOUR:
+            raise ValidationError({'tz': f'Revenue is kept per UTC hour, and {moment.isoformat()} is not on one'})
+    return data
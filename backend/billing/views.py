@@ -8,13 +8,25 @@ from django.utils import timezone
 from django.shortcuts import get_object_or_404
 from django.db import transaction
 from datetime import timedelta
-from .models import SubscriptionPlan, UserSubscription, Invoice, SubscriptionHistory, PaymentReceipt, BillingConfig, WalletTransaction
-from .serializers import SubscriptionPlanSerializer, UserSubscriptionSerializer, InvoiceSerializer, SubscriptionHistorySerializer, PaymentReceiptSerializer, BillingConfigSerializer, AdminPaymentReceiptSerializer, WalletTransactionSerializer
-
-class PlanViewSet(viewsets.ReadOnlyModelViewSet):
+from django.core.files.storage import default_storage
+from rest_framework.exceptions import ValidationError
+from config.conditional import ConditionalGetMixin
+from config.db_router import ReplicaReadMixin
+from config.pagination import CreatedAtPagination
+from config.values_serializer import ValuesListMixin
+from . import wallet
+from .history import TransactionFeedPagination, transaction_feed
+from .periods import date_bounds
+from .models import SubscriptionPlan, UserSubscription, Invoice, SubscriptionHistory, PaymentReceipt, BillingConfig, WalletTransaction, ReceiptRollup
+from .serializers import SubscriptionPlanSerializer, SubscriptionPlanValuesSerializer, UserSubscriptionSerializer, InvoiceSerializer, SubscriptionHistorySerializer, PaymentReceiptSerializer, BillingConfigSerializer, AdminPaymentReceiptSerializer, WalletTransactionSerializer
+
+class PlanViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ReadOnlyModelViewSet):
     queryset = SubscriptionPlan.objects.filter(is_active=True)
     serializer_class = SubscriptionPlanSerializer
+    values_serializer_class = SubscriptionPlanValuesSerializer
     permission_classes = [permissions.AllowAny]
+    catalog_actions = {'list': ('plans',), 'retrieve': ('plans',)}
+    replica_actions = ('list', 'retrieve')
 
 class MySubscriptionView(views.APIView):
     permission_classes = [permissions.IsAuthenticated]
@@ -57,32 +69,22 @@ class AdminPaymentReceiptViewSet(viewsets.ModelViewSet):
     queryset = PaymentReceipt.objects.all().order_by('-created_at')
     serializer_class = AdminPaymentReceiptSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = CreatedAtPagination
 
     @action(detail=True, methods=['post'])
     def approve(self, request, pk=None):
         receipt = self.get_object()
-        if receipt.status != 'PENDING':
-            return Response({'error': 'Receipt is already processed'}, status=400)
-
         with transaction.atomic():
-            receipt.status = 'APPROVED'
-            receipt.processed_at = timezone.now()
-            receipt.admin_notes = request.data.get('admin_notes', '')
-            receipt.save()
-
-            # Update user balance
-            user = receipt.user
-            user.balance += receipt.amount
-            user.save()
-
-            # Record unified transaction
-            WalletTransaction.objects.create(
-                user=user,
-                amount=receipt.amount,
-                transaction_type='TOP_UP',
-                description=f"Balance top-up via receipt #{receipt.id}",
-                receipt=receipt
+            # Conditional on PENDING, so concurrent approvals credit once
+            approved = PaymentReceipt.objects.filter(pk=receipt.pk, status='PENDING').update(
+                status='APPROVED',
+                processed_at=timezone.now(),
+                admin_notes=request.data.get('admin_notes', ''),
             )
+            if not approved:
+                return Response({'error': 'Receipt is already processed'}, status=400)
+            user = receipt.user
+            wallet.credit(user, receipt.amount, 'TOP_UP', f"Balance top-up via receipt #{receipt.id}", receipt=receipt)
 
         return Response({'status': 'Approved', 'new_balance': user.balance})
 
@@ -102,10 +104,10 @@ class AdminPaymentReceiptViewSet(viewsets.ModelViewSet):
     @action(detail=False, methods=['get'])
     def stats(self, request):
         import django.db.models as db_models
-        stats = PaymentReceipt.objects.aggregate(
-            total_approved=db_models.Sum('amount', filter=db_models.Q(status='APPROVED')),
-            total_pending=db_models.Sum('amount', filter=db_models.Q(status='PENDING')),
-            total_rejected=db_models.Sum('amount', filter=db_models.Q(status='REJECTED')),
+        stats = ReceiptRollup.objects.aggregate(
+            total_approved=db_models.Sum('total', filter=db_models.Q(status='APPROVED')),
+            total_pending=db_models.Sum('total', filter=db_models.Q(status='PENDING')),
+            total_rejected=db_models.Sum('total', filter=db_models.Q(status='REJECTED')),
         )
         return Response(stats)
 
@@ -131,21 +133,9 @@ class AdminPaymentReceiptViewSet(viewsets.ModelViewSet):
             return Response({'error': 'Missing user_id or amount'}, status=400)
 
         user = get_object_or_404(User, id=user_id)
-        amount_val = Decimal(str(amount))
-        user.balance += amount_val
-        user.save()
-
-        # Record unified transaction
-        WalletTransaction.objects.create(
-            user=user,
-            amount=amount_val,
-            transaction_type='ADJUSTMENT',
-            description=notes
-        )
+        # Admins may take a wallet below zero, e.g. to reverse a mistaken top-up
+        wallet.apply(user, Decimal(str(amount)), 'ADJUSTMENT', notes, allow_overdraft=True)
 
-        # Log in history/invoice if needed?
-        # For now, just direct update as requested for admin ease.
-        
         return Response({'status': 'Balance adjusted', 'new_balance': user.balance})
 
 class SubscribeView(views.APIView):
@@ -156,13 +146,6 @@ class SubscribeView(views.APIView):
         plan = get_object_or_404(SubscriptionPlan, id=plan_id)
         user = request.user
 
-        if user.balance < plan.price:
-            return Response({'error': 'Insufficient balance. Please top up your account.'}, status=400)
-
-        # Deduct balance
-        user.balance -= plan.price
-        user.save()
-
         # Check existing subscription for upgrade/downgrade tracking
         existing_sub = UserSubscription.objects.filter(user=request.user).first()
         action = 'SUBSCRIBED'
@@ -174,45 +157,42 @@ class SubscribeView(views.APIView):
             else:
                 action = 'RENEWED'
 
-        # Create Invoice (marked as PAID immediately since deducted from balance)
-        invoice = Invoice.objects.create(
-            user=user,
-            amount=plan.price,
-            description=f"Subscription to {plan.name}",
-            status='PAID',
-            provider='INTERNAL_BALANCE',
-            paid_at=timezone.now()
-        )
-        
-        # Update/Create Subscription
-        UserSubscription.objects.update_or_create(
-            user=user,
-            defaults={
-                'plan': plan,
-                'start_date': timezone.now(),
-                'end_date': timezone.now() + timedelta(days=30),
-                'is_active': True
-            }
-        )
-
-        # Create History Record
-        SubscriptionHistory.objects.create(
-            user=user,
-            plan=plan,
-            action=action,
-            amount_paid=plan.price,
-            invoice=invoice,
-            notes=f"Subscribed to {plan.name} plan via balance"
-        )
-
-        # Record unified transaction
-        WalletTransaction.objects.create(
-            user=user,
-            amount=-plan.price, # Negative for deduction
-            transaction_type='SUBSCRIPTION',
-            description=f"Subscription to {plan.name}",
-            invoice=invoice
-        )
+        try:
+            with transaction.atomic():
+                # Create Invoice (marked as PAID immediately since deducted from balance)
+                invoice = Invoice.objects.create(
+                    user=user,
+                    amount=plan.price,
+                    description=f"Subscription to {plan.name}",
+                    status='PAID',
+                    provider='INTERNAL_BALANCE',
+                    paid_at=timezone.now()
+                )
+                # Deduct balance; rolls the invoice back if it does not cover the plan
+                wallet.debit(user, plan.price, 'SUBSCRIPTION', f"Subscription to {plan.name}", invoice=invoice)
+
+                # Update/Create Subscription
+                UserSubscription.objects.update_or_create(
+                    user=user,
+                    defaults={
+                        'plan': plan,
+                        'start_date': timezone.now(),
+                        'end_date': timezone.now() + timedelta(days=30),
+                        'is_active': True
+                    }
+                )
+
+                # Create History Record
+                SubscriptionHistory.objects.create(
+                    user=user,
+                    plan=plan,
+                    action=action,
+                    amount_paid=plan.price,
+                    invoice=invoice,
+                    notes=f"Subscribed to {plan.name} plan via balance"
+                )
+        except wallet.InsufficientBalance:
+            return Response({'error': 'Insufficient balance. Please top up your account.'}, status=400)
 
         return Response({
             'status': 'Subscribed successfully',
@@ -221,48 +201,34 @@ class SubscribeView(views.APIView):
         })
 
 class TransactionHistoryView(views.APIView):
+    """
+    Wallet entries and unapproved receipts, newest first. Optional filters:
+    ``type`` (a WalletTransaction type) and ``start_date``/``end_date``
+    (YYYY-MM-DD, inclusive).
+    """
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = TransactionFeedPagination
+
+    def get_filters(self, request):
+        transaction_type = request.query_params.get('type') or None
+        if transaction_type and transaction_type not in dict(WalletTransaction.TRANSACTION_TYPES):
+            raise ValidationError({'type': f"Unknown transaction type '{transaction_type}'"})
+        return {'transaction_type': transaction_type, **date_bounds(request.query_params)}
 
     def get(self, request):
-        user = request.user
-        
-        # 1. Fetch WalletTransactions (Completed balance movements)
-        wallets = WalletTransaction.objects.filter(user=user).order_by('-created_at')
-        
-        # 2. Fetch PaymentReceipts that are NOT Approved (already in WalletTransaction)
-        # or show all but label them. Actually, Approved ones are duplicated if we show both.
-        # Let's show: All WalletTransactions + Pending/Rejected Receipts.
-        receipts = PaymentReceipt.objects.filter(user=user).exclude(status='APPROVED').order_by('-created_at')
-        
-        history = []
-        
-        # Normalize WalletTransactions
-        for tx in wallets:
-            history.append({
-                'id': f"TRX-{tx.id}",
-                'amount': str(tx.amount),
-                'type': tx.transaction_type,
-                'description': tx.description,
-                'status': 'COMPLETED',
-                'created_at': tx.created_at,
-                'receipt_image': tx.receipt.receipt_image.url if tx.receipt and tx.receipt.receipt_image else None,
-                'admin_note': tx.receipt.admin_notes if tx.receipt else None
-            })
-            
-        # Normalize Receipts
-        for rc in receipts:
-            history.append({
-                'id': f"RCP-{rc.id}",
-                'amount': str(rc.amount),
-                'type': 'TOP_UP',
-                'description': "Balance Top-Up (Verification)",
-                'status': rc.status,
-                'created_at': rc.created_at,
-                'receipt_image': rc.receipt_image.url if rc.receipt_image else None,
-                'admin_note': rc.admin_notes
-            })
-            
-        # Sort by date
-        history.sort(key=lambda x: x['created_at'], reverse=True)
-        
-        return Response(history)
+        paginator = self.pagination_class()
+        rows = paginator.paginate_feed(transaction_feed(request.user, **self.get_filters(request)), request)
+        return paginator.get_paginated_response([
+            {
+                'id': f"{kind}-{pk}",
+                'amount': str(amount),
+                'balance_after': str(balance_after) if balance_after is not None else None,
+                'type': transaction_type,
+                'description': description,
+                'status': row_status,
+                'created_at': created_at,
+                'receipt_image': default_storage.url(image) if image else None,
+                'admin_note': admin_notes,
+            }
+            for created_at, kind, pk, amount, balance_after, transaction_type, description, row_status, image, admin_notes in rows
+        ])
@@ -0,0 +1,79 @@
+"""
+Wallet balance mutations and the ledger behind them.
+
+Every change is a single ``UPDATE ... SET balance = balance + amount``,
+conditional on ``balance >= amount`` for debits, written in the same
+transaction as its WalletTransaction row. Concurrent requests cannot lose
+updates or overdraw a wallet, and no other User column is rewritten.
+
+The UPDATE takes the user's row lock, so each user's entries are appended
+strictly one after another. Each carries its per-user ``sequence`` and the
+``balance_after`` it produced, which makes the ledger self-checking (every
+entry is the previous balance plus its amount, see reconcile_wallets) and
+any past balance a single index lookup.
+"""
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import F
+
+from .models import WalletTransaction
+
+User = get_user_model()
+
+
+class InsufficientBalance(Exception):
+    def __init__(self, balance, amount):
+        super().__init__(f"Balance {balance} does not cover {amount}")
+        self.balance = balance
+        self.amount = amount
+
+
+def apply(user, amount, transaction_type, description, allow_overdraft=False, **refs):
+    """
+    Add ``amount`` (negative for debits) to the user's balance and record it.
+    Refreshes ``user.balance`` and returns the WalletTransaction. Raises
+    InsufficientBalance, without writing anything, if a debit would take the
+    balance below zero and ``allow_overdraft`` is False.
+    """
+    amount = Decimal(amount)
+    with transaction.atomic():
+        rows = User.objects.filter(pk=user.pk)
+        if amount < 0 and not allow_overdraft:
+            rows = rows.filter(balance__gte=-amount)
+        if not rows.update(balance=F('balance') + amount):
+            user.balance = User.objects.values_list('balance', flat=True).get(pk=user.pk)
+            raise InsufficientBalance(user.balance, -amount)
+        # Our UPDATE holds the row lock, so this is the balance it produced
+        # and nobody else can append to this user's ledger until we commit
+        user.balance = User.objects.values_list('balance', flat=True).get(pk=user.pk)
+        last = WalletTransaction.objects.filter(user=user).order_by('-sequence').values_list('sequence', flat=True).first()
+        return WalletTransaction.objects.create(
+            user=user,
+            amount=amount,
+            transaction_type=transaction_type,
+            description=description,
+            sequence=(last or 0) + 1,
+            balance_after=user.balance,
+            **refs
+        )
+
+
+def credit(user, amount, transaction_type, description, **refs):
+    return apply(user, amount, transaction_type, description, **refs)
+
+
+def debit(user, amount, transaction_type, description, **refs):
+    return apply(user, -Decimal(amount), transaction_type, description, **refs)
+
+
+def balance_at(user, moment):
+    """The user's balance right after the last entry at or before ``moment``"""
+    balance = (
+        WalletTransaction.objects.filter(user=user, created_at__lte=moment)
+        .order_by('-created_at', '-sequence')
+        .values_list('balance_after', flat=True)
+        .first()
+    )
+    return Decimal('0.00') if balance is None else balance
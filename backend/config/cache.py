@@ -0,0 +1,135 @@
+"""
+Catalog caching: version stamps and a two-tier response cache.
+
+Every catalog (journals, issues, plans, published articles, and wallets
+for the finance leaderboard) has a version stamp in the shared cache: the
+time in nanoseconds of its last change, bumped by model signals and by
+CatalogQuerySet bulk writes. A missing stamp (cold or flushed cache) is
+re-seeded with the current time, which can only make clients refetch,
+never keep stale data.
+
+The shared tier is Django's default cache: Redis when ``REDIS_URL`` is set,
+or files under ``CACHE_DIR`` on a single host. In front of it every process
+keeps a small LRU of recently served payloads, so hot pages skip the network
+round-trip and unpickling. Keys embed the version stamps, which makes both
+tiers self-invalidating: a change bumps the stamp, new keys miss, and old
+entries age out of the LRU and expire in Redis.
+
+Stamps kept in a per-process cache would only ever change in the worker
+that made the change, so without ``SHARED_CACHE`` ``catalog_cache`` stores
+nothing and callers skip conditional GET (see config.conditional).
+"""
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import models, transaction
+
+_MISSING = object()
+
+VERSION_KEY = 'catalog:version:{}'
+
+
+def catalog_version(name):
+    key = VERSION_KEY.format(name)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, time.time_ns(), None)
+        # Still None when the cache backend is down: never match anything
+        version = cache.get(key) or time.time_ns()
+    return version
+
+
+def touch_catalog(*names):
+    """Mark catalogs as changed, now and again once the transaction commits"""
+    def touch():
+        cache.set_many({VERSION_KEY.format(name): time.time_ns() for name in names}, None)
+
+    touch()
+    # Responses built from the old rows while the transaction was open must
+    # not keep the new stamp
+    transaction.on_commit(touch)
+
+
+class CatalogQuerySet(models.QuerySet):
+    """
+    QuerySet for catalog models. Bulk writes send no model signals, so they
+    touch ``catalog`` themselves.
+    """
+    catalog = None
+
+    def update(self, **kwargs):
+        rows = super().update(**kwargs)
+        if rows:
+            touch_catalog(self.catalog)
+        return rows
+
+    def bulk_create(self, objs, *args, **kwargs):
+        objs = super().bulk_create(objs, *args, **kwargs)
+        if objs:
+            touch_catalog(self.catalog)
+        return objs
+
+
+class LocalLRU:
+    """Thread-safe, size-bounded least-recently-used mapping"""
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self.lock:
+            value = self.entries.get(key, _MISSING)
+            if value is _MISSING:
+                return default
+            self.entries.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        if self.maxsize <= 0:
+            return
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.maxsize:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+    def __len__(self):
+        return len(self.entries)
+
+
+class TieredCache:
+    def __init__(self, maxsize, timeout):
+        self.local = LocalLRU(maxsize)
+        self.timeout = timeout
+
+    def get(self, key):
+        if not settings.SHARED_CACHE:
+            return None
+        value = self.local.get(key)
+        if value is None:
+            value = cache.get(key)
+            if value is not None:
+                self.local.set(key, value)
+        return value
+
+    def set(self, key, value):
+        if not settings.SHARED_CACHE:
+            return
+        self.local.set(key, value)
+        cache.set(key, value, self.timeout)
+
+    def clear(self):
+        """Drop this process's front tier; shared entries expire on their own"""
+        self.local.clear()
+
+
+catalog_cache = TieredCache(settings.CATALOG_LOCAL_CACHE_SIZE, settings.CATALOG_CACHE_TIMEOUT)
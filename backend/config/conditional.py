@@ -0,0 +1,91 @@
+"""
+Conditional GET and response caching for public catalog endpoints.
+
+Views derive their ETag and Last-Modified from the version stamps of the
+catalogs they depend on (see ``config.cache``), so a request with matching
+validators gets a 304 before any query or serialization runs.
+Other requests are answered from ``catalog_cache`` under a key built from
+the same stamps, and only a miss reaches the database. Without
+``SHARED_CACHE`` views answer every request in full.
+"""
+import hashlib
+
+from django.conf import settings
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+from .cache import catalog_cache, catalog_version
+
+
+class EarlyResponse(Exception):
+    """Raised from ``initial()`` to answer without running the handler"""
+
+    def __init__(self, response):
+        self.response = response
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin: ``catalog_actions`` maps an action to the catalogs its
+    response depends on. Those actions get ETag, Last-Modified and public
+    Cache-Control headers, a 304 when the client's copy is current, and
+    their response data is cached until one of the catalogs changes.
+    """
+    catalog_actions = {}
+    catalog_vary = ('Accept',)
+
+    def get_catalog_versions(self):
+        """Catalog names for this request, or None when it is not cacheable"""
+        if self.request.method not in ('GET', 'HEAD'):
+            return None
+        return self.catalog_actions.get(self.action)
+
+    def get_validators(self, versions):
+        # Same stamps, different URL or format: different representation
+        variant = f"{self.request.get_full_path()}|{self.request.accepted_media_type}|{versions}"
+        etag = '"%s"' % hashlib.md5(variant.encode()).hexdigest()
+        return etag, max(versions) // 10**9
+
+    def get_response_cache_key(self, versions):
+        # Absolute URI: paginated data embeds next/previous links
+        variant = f"{self.request.build_absolute_uri()}|{versions}"
+        return f"catalog:response:{hashlib.md5(variant.encode()).hexdigest()}"
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        self.validators = self.response_cache_key = self.catalog_stamps = None
+        names = self.get_catalog_versions() if settings.SHARED_CACHE else None
+        if not names:
+            return
+        versions = self.catalog_stamps = [catalog_version(name) for name in names]
+        self.validators = self.get_validators(versions)
+        etag, last_modified = self.validators
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is not None:
+            raise EarlyResponse(response)
+
+        key = self.get_response_cache_key(versions)
+        data = catalog_cache.get(key)
+        if data is not None:
+            raise EarlyResponse(Response(data))
+        self.response_cache_key = key
+
+    def handle_exception(self, exc):
+        if isinstance(exc, EarlyResponse):
+            return exc.response
+        return super().handle_exception(exc)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        response = super().finalize_response(request, response, *args, **kwargs)
+        validators = getattr(self, 'validators', None)
+        if validators and response.status_code in (200, 304):
+            etag, last_modified = validators
+            response.headers['ETag'] = etag
+            response.headers['Last-Modified'] = http_date(last_modified)
+            patch_cache_control(response, public=True, max_age=settings.CATALOG_MAX_AGE)
+            patch_vary_headers(response, self.catalog_vary)
+            # Set only on a miss, so hits and 304s are not stored again
+            if self.response_cache_key and response.status_code == 200:
+                catalog_cache.set(self.response_cache_key, response.data)
+        return response
@@ -0,0 +1,98 @@
+"""
+Read-replica routing for public read traffic.
+
+Reads go to ``REPLICA_DATABASE`` only inside views using ReplicaReadMixin,
+for their ``replica_actions`` on safe requests. Everything else, including
+all writes, uses the primary. A user who just wrote is pinned to the
+primary for ``REPLICA_STICKY_SECONDS`` so they read their own writes, and a
+catalog that just changed is read from the primary for the same window so
+ETags and cached responses are never built from lagging replica rows.
+Both pins live in the cache, so without ``SHARED_CACHE`` every read stays
+on the primary.
+"""
+import time
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+PIN_KEY = 'db:primary-pin:{}'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+_use_replica = ContextVar('use_replica', default=False)
+
+
+def pin_to_primary(user):
+    cache.set(PIN_KEY.format(user.pk), True, settings.REPLICA_STICKY_SECONDS)
+
+
+def is_pinned_to_primary(user):
+    return user.is_authenticated and cache.get(PIN_KEY.format(user.pk)) is not None
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _use_replica.get() and settings.REPLICA_DATABASE:
+            return settings.REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model, **hints):
+        # Explicit, or Django would write objects read from the replica back to it
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        if db == settings.REPLICA_DATABASE:
+            return False
+        return None
+
+
+class PrimaryPinMiddleware:
+    """Pins users to the primary after any successful unsafe request"""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        response = self.get_response(request)
+        # DRF sets request.user on the Django request once it authenticates
+        user = getattr(request, 'user', None)
+        if (settings.REPLICA_DATABASE and request.method not in SAFE_METHODS
+                and response.status_code < 400 and user is not None and user.is_authenticated):
+            pin_to_primary(user)
+        return response
+
+
+class ReplicaReadMixin:
+    """
+    ViewSet mixin: safe requests to ``replica_actions`` read from the replica,
+    unless the user is pinned or a catalog the view depends on (see
+    ConditionalGetMixin) changed within ``REPLICA_STICKY_SECONDS``.
+    """
+    replica_actions = ()
+
+    def reads_from_replica(self, request):
+        if not settings.REPLICA_DATABASE or not settings.SHARED_CACHE or request.method not in SAFE_METHODS:
+            return False
+        if self.action not in self.replica_actions or is_pinned_to_primary(request.user):
+            return False
+        stamps = getattr(self, 'catalog_stamps', None)
+        if stamps and max(stamps) > time.time_ns() - settings.REPLICA_STICKY_SECONDS * 10**9:
+            return False
+        return True
+
+    def dispatch(self, request, *args, **kwargs):
+        token = _use_replica.set(False)
+        try:
+            return super().dispatch(request, *args, **kwargs)
+        finally:
+            _use_replica.reset(token)
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.reads_from_replica(request):
+            _use_replica.set(True)
@@ -0,0 +1,101 @@
+import multiprocessing
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand
+
+ACCOUNTS = 100
+
+
+def _worker(db_path, production, seconds, read_ratio, seed, results):
+    """
+    Runs in a fresh process so Django builds its connection from the real
+    settings: DATABASE_URL points at the scratch file and SQLITE_PRODUCTION
+    picks the profile.
+    """
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ['SQLITE_PRODUCTION'] = 'True' if production else 'False'
+    import django
+    django.setup()
+    from django.db import OperationalError, connection, transaction
+
+    rng = random.Random(seed)
+    reads = writes = errors = 0
+    deadline = time.perf_counter() + seconds
+    while time.perf_counter() < deadline:
+        try:
+            if rng.random() < read_ratio:
+                with connection.cursor() as cursor:
+                    cursor.execute('SELECT COUNT(*), SUM(amount) FROM bench_ledger WHERE account_id = %s',
+                                   [rng.randrange(ACCOUNTS)])
+                    cursor.fetchone()
+                reads += 1
+            else:
+                # Read-modify-write, like a wallet debit
+                account = rng.randrange(ACCOUNTS)
+                with transaction.atomic(), connection.cursor() as cursor:
+                    cursor.execute('SELECT balance FROM bench_account WHERE id = %s', [account])
+                    balance = cursor.fetchone()[0]
+                    cursor.execute('UPDATE bench_account SET balance = %s WHERE id = %s', [balance - 1, account])
+                    cursor.execute('INSERT INTO bench_ledger (account_id, amount) VALUES (%s, %s)', [account, -1])
+                writes += 1
+        except OperationalError:
+            errors += 1
+    results.put((reads, writes, errors))
+
+
+class Command(BaseCommand):
+    help = (
+        'Runs concurrent read/write workers against a scratch SQLite database, once with '
+        'the default settings and once with the SQLITE_PRODUCTION profile, and reports '
+        'throughput and "database is locked" errors'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=8)
+        parser.add_argument('--seconds', type=float, default=5)
+        parser.add_argument('--read-ratio', type=float, default=0.8)
+
+    def create_database(self, path):
+        with sqlite3.connect(path) as db:
+            db.execute('CREATE TABLE bench_account (id INTEGER PRIMARY KEY, balance INTEGER NOT NULL)')
+            db.execute('CREATE TABLE bench_ledger (id INTEGER PRIMARY KEY, account_id INTEGER, amount INTEGER)')
+            db.execute('CREATE INDEX bench_ledger_account ON bench_ledger (account_id)')
+            db.executemany('INSERT INTO bench_account VALUES (?, ?)', [(i, 10**6) for i in range(ACCOUNTS)])
+        db.close()
+
+    def run_profile(self, production, options):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'bench.sqlite3'
+            self.create_database(path)
+            context = multiprocessing.get_context('spawn')
+            results = context.Queue()
+            workers = [
+                context.Process(target=_worker, args=(
+                    str(path), production, options['seconds'], options['read_ratio'], seed, results,
+                ))
+                for seed in range(options['workers'])
+            ]
+            for worker in workers:
+                worker.start()
+            totals = [sum(column) for column in zip(*(results.get() for _ in workers))]
+            for worker in workers:
+                worker.join()
+        reads, writes, errors = totals
+        seconds = options['seconds']
+        label = 'SQLITE_PRODUCTION' if production else 'default'
+        self.stdout.write(
+            f"  {label:<18} {reads / seconds:10.0f} reads/s {writes / seconds:10.0f} writes/s "
+            f"{errors:8d} lock errors"
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(self.style.MIGRATE_HEADING(
+            f"{options['workers']} workers, {options['seconds']}s, {options['read_ratio']:.0%} reads"
+        ))
+        self.run_profile(False, options)
+        self.run_profile(True, options)
@@ -0,0 +1,107 @@
+"""
+Keyset (cursor) pagination for list endpoints.
+
+Each class pins a stable ordering that ends in the primary key. DRF's
+CursorPagination positions on the first field only and skips ties with an
+offset, which a low-cardinality first field like an issue's year turns into
+a scan; here the cursor holds the whole sort key, so it maps to a single
+row and fetching page N costs the same as page 1.
+"""
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, _reverse_ordering
+
+
+class KeysetPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = 'page_size'
+    max_page_size = 100
+    ordering = ('-id',)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.cursor = self.decode_cursor(request)
+        reverse = bool(self.cursor and self.cursor.reverse)
+        ordering = _reverse_ordering(self.ordering) if reverse else self.ordering
+
+        queryset = queryset.order_by(*ordering)
+        if self.cursor and self.cursor.position is not None:
+            queryset = queryset.filter(self.past(queryset, ordering, self.cursor.position))
+        rows = list(queryset[:self.page_size + 1])
+
+        more = len(rows) > self.page_size
+        self.page = rows[:self.page_size]
+        if reverse:
+            self.page.reverse()
+        self.has_next = True if reverse else more
+        self.has_previous = more if reverse else self.cursor is not None
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+        return self.page
+
+    def past(self, queryset, ordering, position):
+        """Rows after ``position`` in ``ordering``: (a, b) < (x, y) as a < x OR (a = x AND b < y)"""
+        try:
+            values = json.loads(position)
+            if not isinstance(values, list) or len(values) != len(ordering):
+                raise ValueError
+            values = [
+                self.field(queryset, name.lstrip('-')).to_python(value)
+                for name, value in zip(ordering, values)
+            ]
+        except (ValueError, ValidationError, FieldDoesNotExist):
+            raise NotFound(self.invalid_cursor_message)
+
+        condition, ties = Q(), {}
+        for name, value in zip(ordering, values):
+            field = name.lstrip('-')
+            lookup = 'lt' if name.startswith('-') else 'gt'
+            condition |= Q(**ties, **{f'{field}__{lookup}': value})
+            ties[field] = value
+        return condition
+
+    def field(self, queryset, name):
+        if name in queryset.query.annotations:
+            return queryset.query.annotations[name].output_field
+        return queryset.model._meta.get_field(name)
+
+    def _get_position_from_instance(self, instance, ordering):
+        values = [
+            instance[name.lstrip('-')] if isinstance(instance, dict) else getattr(instance, name.lstrip('-'))
+            for name in ordering
+        ]
+        return json.dumps([value if isinstance(value, (int, float)) else str(value) for value in values])
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+
+class CreatedAtPagination(KeysetPagination):
+    # Also used for articles: submitted_at is NULL for drafts and for
+    # articles published from the admin, so it cannot carry a cursor.
+    ordering = ('-created_at', '-id')
+
+
+class IssuePagination(KeysetPagination):
+    ordering = ('-year', '-volume', '-number', '-id')
+
+
+class UserPagination(KeysetPagination):
+    ordering = ('-date_joined', '-id')
@@ -0,0 +1,55 @@
+"""
+Per-endpoint SQL query budgets for DRF views.
+
+A view declares ``query_budget = {'list': 3, 'retrieve': 3, ...}`` and every
+request handled by that action is checked against it. Over-budget requests
+are logged; with ``QUERY_BUDGET_STRICT`` enabled (tests, CI) they raise.
+"""
+import logging
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetExceeded(Exception):
+    pass
+
+
+class QueryCounter:
+    """``execute_wrapper`` callable that counts the queries passing through it"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+class QueryBudgetMixin:
+    query_budget = {}
+
+    def dispatch(self, request, *args, **kwargs):
+        counter = QueryCounter()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(counter))
+            response = super().dispatch(request, *args, **kwargs)
+        self.check_query_budget(counter.count)
+        return response
+
+    def check_query_budget(self, count):
+        action = getattr(self, 'action', None)
+        budget = self.query_budget.get(action)
+        if budget is None or count <= budget:
+            return
+        message = (
+            f"{self.__class__.__name__}.{action} ran {count} queries "
+            f"(budget {budget})"
+        )
+        if getattr(settings, 'QUERY_BUDGET_STRICT', False):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
@@ -13,6 +13,8 @@ https://docs.djangoproject.com/en/6.0/ref/settings/
 import os
 from pathlib import Path
 
+from .database import SQLITE_PRODUCTION_OPTIONS, database_from_url
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -48,6 +50,7 @@ INSTALLED_APPS = [
     'submissions',
     'billing',
     'ai_engine',
+    'config',
 ]
 
 MIDDLEWARE = [
@@ -60,6 +63,7 @@ MIDDLEWARE = [
     'django.contrib.auth.middleware.AuthenticationMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
+    'config.db_router.PrimaryPinMiddleware',
 ]
 
 ROOT_URLCONF = 'config.urls'
@@ -85,14 +89,54 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': BASE_DIR / 'db.sqlite3',
-        'DEFAULT_AUTO_FIELD': 'django.db.models.BigAutoField'
-    }
+DATABASE_URL = os.environ.get('DATABASE_URL')
+# Optional replica for public reads, see config/db_router.py
+DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+
+# With DATABASE_POOL each worker process keeps its own psycopg pool, so
+# workers * DATABASE_POOL_MAX_SIZE must stay below Postgres max_connections
+DATABASE_POOL = os.environ.get('DATABASE_POOL', 'False') == 'True'
+DATABASE_URL_OPTIONS = {
+    'conn_max_age': int(os.environ.get('DATABASE_CONN_MAX_AGE', 60)),
+    'pool': {
+        'min_size': int(os.environ.get('DATABASE_POOL_MIN_SIZE', 2)),
+        'max_size': int(os.environ.get('DATABASE_POOL_MAX_SIZE', 10)),
+        'timeout': int(os.environ.get('DATABASE_POOL_TIMEOUT', 10)),
+    } if DATABASE_POOL else None,
+    # Milliseconds per query for web and Celery workers. manage.py commands
+    # other than runserver default to 0 (none), see manage.py
+    'statement_timeout': int(os.environ.get('DATABASE_STATEMENT_TIMEOUT', 30000)),
 }
 
+if DATABASE_URL:
+    DATABASES = {'default': database_from_url(DATABASE_URL, **DATABASE_URL_OPTIONS)}
+else:
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': BASE_DIR / 'db.sqlite3',
+            'DEFAULT_AUTO_FIELD': 'django.db.models.BigAutoField'
+        }
+    }
+
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = database_from_url(DATABASE_REPLICA_URL, **DATABASE_URL_OPTIONS)
+    # Tests read the replica alias through the default test database
+    DATABASES['replica']['TEST'] = {'MIRROR': 'default'}
+# DATABASE_REPLICA_READS=False keeps the alias but sends every read to the
+# primary, e.g. while the replica is rebuilt
+REPLICA_DATABASE = 'replica' if DATABASE_REPLICA_URL and os.environ.get('DATABASE_REPLICA_READS', 'True') == 'True' else None
+# Seconds a user's reads stay on the primary after a write, and a changed
+# catalog stays off the replica: an upper bound on replication lag
+REPLICA_STICKY_SECONDS = int(os.environ.get('REPLICA_STICKY_SECONDS', 10))
+DATABASE_ROUTERS = ['config.db_router.ReplicaRouter']
+
+# Opt-in tuning for installations that stay on SQLite: WAL, per-connection
+# PRAGMAs and BEGIN IMMEDIATE for atomic() blocks
+SQLITE_PRODUCTION = os.environ.get('SQLITE_PRODUCTION', 'False') == 'True'
+if SQLITE_PRODUCTION and DATABASES['default']['ENGINE'] == 'django.db.backends.sqlite3':
+    DATABASES['default']['OPTIONS'] = dict(SQLITE_PRODUCTION_OPTIONS)
+
 # Logging configuration
 LOGGING = {
     'version': 1,
@@ -177,6 +221,74 @@ STATICFILES_DIRS = [BASE_DIR / 'static']
 MEDIA_URL = '/media/'
 MEDIA_ROOT = BASE_DIR / 'media'
 
+# Rendered publication certificates, keyed by a hash of their inputs
+CERTIFICATE_CACHE_DIR = os.environ.get('CERTIFICATE_CACHE_DIR', BASE_DIR / 'cache' / 'certificates')
+CERTIFICATE_MAX_AGE = 60 * 60 * 24
+# Render processes shared by all issue ZIP exports in a web worker (0 = render inline)
+CERTIFICATE_EXPORT_WORKERS = int(os.environ.get('CERTIFICATE_EXPORT_WORKERS', min(4, os.cpu_count() or 1)))
+# TTF with Latin + Cyrillic glyphs; DejaVu Sans ships with the app. Without a
+# readable font certificates fall back to Helvetica, which has no Cyrillic
+CERTIFICATE_FONT_PATH = os.environ.get('CERTIFICATE_FONT_PATH', str(BASE_DIR / 'submissions' / 'fonts' / 'DejaVuSans.ttf'))
+# Public verification endpoint encoded in certificate QR codes
+CERTIFICATE_VERIFY_URL = os.environ.get('CERTIFICATE_VERIFY_URL', 'http://localhost:8000/api/certificates/verify')
+# Key for certificate ID signatures. Set it before rotating SECRET_KEY, or
+# every printed certificate's QR code stops verifying
+CERTIFICATE_SIGNING_KEY = os.environ.get('CERTIFICATE_SIGNING_KEY') or SECRET_KEY
+# Languages rendered in the background when an article is published
+CERTIFICATE_PRERENDER_LANGS = ('en', 'uz', 'ru')
+
+# Celery
+REDIS_URL = os.environ.get('REDIS_URL')
+CELERY_BROKER_URL = REDIS_URL or 'memory://'
+# Without a broker, tasks run inline so publishing still works locally.
+# Certificate prerendering needs a broker and is skipped in that case
+CELERY_TASK_ALWAYS_EAGER = not REDIS_URL
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django_redis.cache.RedisCache',
+            'LOCATION': REDIS_URL,
+            'KEY_PREFIX': 'journal',
+            'OPTIONS': {
+                'CLIENT_CLASS': 'django_redis.client.DefaultClient',
+                # A Redis outage degrades to cache misses instead of 500s
+                'IGNORE_EXCEPTIONS': True,
+                'SOCKET_CONNECT_TIMEOUT': 2,
+                'SOCKET_TIMEOUT': 2,
+            },
+        }
+    }
+    DJANGO_REDIS_LOG_IGNORED_EXCEPTIONS = True
+elif os.environ.get('CACHE_DIR'):
+    # Shared by every worker on one host, e.g. the SQLITE_PRODUCTION profile
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ['CACHE_DIR'],
+        }
+    }
+else:
+    # Per-process stand-in for local runs and tests
+    CACHES = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+# Catalog version stamps, cached responses and facets, and replica pins only
+# work if every worker sees the same cache. With a per-process one the other
+# workers would keep serving stale data and 304s, so those features stay off
+# (no conditional GET or response caching, all reads on the primary). Set
+# SHARED_CACHE=True when running a single process, or when CACHES is
+# overridden with another shared backend such as DatabaseCache.
+PROCESS_LOCAL_CACHES = (
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+)
+SHARED_CACHE = os.environ.get(
+    'SHARED_CACHE', str(CACHES['default']['BACKEND'] not in PROCESS_LOCAL_CACHES)
+) == 'True'
+
 AUTH_USER_MODEL = 'users.User'
 
 REST_FRAMEWORK = {
@@ -184,8 +296,26 @@ REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework_simplejwt.authentication.JWTAuthentication',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'config.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
 }
 
+# Raise instead of logging when a view exceeds its query budget (tests/CI)
+QUERY_BUDGET_STRICT = os.environ.get('QUERY_BUDGET_STRICT', 'False') == 'True'
+
+# Seconds clients and shared caches may reuse a catalog response before
+# revalidating it with its ETag
+CATALOG_MAX_AGE = int(os.environ.get('CATALOG_MAX_AGE', 60))
+# Catalog response data: seconds kept in the shared cache, and entries kept
+# in each process's in-memory LRU in front of it (0 disables that tier)
+CATALOG_CACHE_TIMEOUT = int(os.environ.get('CATALOG_CACHE_TIMEOUT', 60 * 60))
+CATALOG_LOCAL_CACHE_SIZE = int(os.environ.get('CATALOG_LOCAL_CACHE_SIZE', 256))
+
+# Max age of each worker's in-memory autocomplete index before it is rebuilt
+AUTOCOMPLETE_REFRESH_SECONDS = int(os.environ.get('AUTOCOMPLETE_REFRESH_SECONDS', 300))
+
 SPECTACULAR_SETTINGS = {
     'TITLE': 'Central Asian Journal API',
     'VERSION': '1.0.0',
@@ -0,0 +1,72 @@
+"""
+Sparse fieldsets for read endpoints.
+
+``?fields=id,title`` limits a response to the named fields and
+``?expand=reviews`` opts in to nested relations that lists leave out by
+default. Views use the same selection to load only the columns and
+relations the serializer will read.
+"""
+
+
+def parse_list_param(request, name):
+    """Comma-separated query parameter as a list, or None when absent"""
+    value = request.query_params.get(name)
+    if value is None:
+        return None
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+class DynamicFieldsMixin:
+    """Serializer mixin: a ``fields`` argument keeps only the named fields"""
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop('fields', None)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
+
+
+class SparseFieldsetMixin:
+    """
+    ViewSet mixin for serializers using DynamicFieldsMixin.
+
+    ``expandable_fields`` are only serialized when named in ``?expand=`` or
+    ``?fields=``, except for ``expanded_actions`` without ``?fields=``.
+    ``field_sources`` maps computed serializer fields to the model lookups
+    they read, so ``trim_queryset`` can defer everything else.
+    """
+    expandable_fields = ()
+    expanded_actions = ('retrieve',)
+    field_sources = {}
+
+    def get_selected_fields(self):
+        """Serializer field names for this read request, or None for all of them"""
+        if self.request is None or self.request.method not in ('GET', 'HEAD'):
+            return None
+        fields = parse_list_param(self.request, 'fields')
+        expand = [name for name in parse_list_param(self.request, 'expand') or () if name in self.expandable_fields]
+        if fields is None:
+            if self.action in self.expanded_actions or set(expand) >= set(self.expandable_fields):
+                return None
+            fields = [name for name in self.get_serializer_class()().fields if name not in self.expandable_fields]
+        return list(dict.fromkeys(fields + expand))
+
+    def get_serializer(self, *args, **kwargs):
+        kwargs.setdefault('fields', self.get_selected_fields())
+        return super().get_serializer(*args, **kwargs)
+
+    def trim_queryset(self, queryset, fields, always=()):
+        """Restrict ``queryset`` to the columns and joins that ``fields`` need"""
+        concrete = {field.name for field in queryset.model._meta.concrete_fields}
+        columns = list(always)
+        for name in fields:
+            if name in self.field_sources:
+                columns.extend(self.field_sources[name])
+            elif name in concrete:
+                columns.append(name)
+        queryset = queryset.only(*columns)
+        relations = {column.split('__', 1)[0] for column in columns if '__' in column}
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset
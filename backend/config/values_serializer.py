@@ -0,0 +1,168 @@
+"""
+Read-only serialization straight from ``values()`` rows.
+
+A ModelSerializer builds a field tree for every response and calls each
+field's ``to_representation`` per row. A ValuesSerializer resolves its fields
+once per class into (name, lookups, converter) mappers, selects exactly
+those lookups with ``values()`` and turns each row dict into output with
+plain dict access. Output matches the ModelSerializer for the same fields;
+writes keep going through the ModelSerializer.
+"""
+from decimal import Decimal
+
+from django.db import models
+from django.utils import timezone
+from rest_framework.response import Response
+
+
+def _datetime(value):
+    if value is None:
+        return None
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    text = value.isoformat()
+    return text[:-6] + 'Z' if text.endswith('+00:00') else text
+
+
+def _date(value):
+    return value.isoformat() if value is not None else None
+
+
+def _decimal(places):
+    exponent = Decimal(1).scaleb(-places)
+
+    def convert(value):
+        return '{:f}'.format(value.quantize(exponent)) if value is not None else None
+    return convert
+
+
+def _resolve_field(model, lookup):
+    parts = lookup.split('__')
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    return model._meta.get_field(parts[-1])
+
+
+class ValuesSerializer:
+    """
+    Subclasses declare:
+
+    ``model`` and ``fields`` -- model field names, or '__all__'. Relations
+    serialize as their primary key, like PrimaryKeyRelatedField.
+    ``sources`` -- output name to a ``values()`` lookup across relations.
+    ``method_fields`` -- output name to the lookups passed, in order, to
+    ``get_<name>()``, like SerializerMethodField.
+    """
+    model = None
+    fields = '__all__'
+    sources = {}
+    method_fields = {}
+
+    @classmethod
+    def compile(cls):
+        """(name, lookups, kind) for every field, resolved once per class"""
+        if '_spec' not in cls.__dict__:
+            opts = cls.model._meta
+            if cls.fields == '__all__':
+                names = [field.name for field in opts.concrete_fields]
+            else:
+                names = list(cls.fields)
+            spec = [(name, (name,), cls.converter_kind(opts.get_field(name))) for name in names]
+            spec += [
+                (name, (lookup,), cls.converter_kind(_resolve_field(cls.model, lookup)))
+                for name, lookup in cls.sources.items()
+            ]
+            spec += [(name, tuple(lookups), 'method') for name, lookups in cls.method_fields.items()]
+            cls._spec = spec
+        return cls._spec
+
+    @staticmethod
+    def converter_kind(field):
+        if isinstance(field, models.DateTimeField):
+            return 'datetime'
+        if isinstance(field, models.DateField):
+            return 'date'
+        if isinstance(field, models.DecimalField):
+            return ('decimal', field.decimal_places)
+        if isinstance(field, models.FileField):
+            return ('file', field.storage)
+        return None
+
+    def __init__(self, fields=None, context=None):
+        self.context = context or {}
+        self.request = self.context.get('request')
+        self.direct = []
+        self.converted = []
+        for name, lookups, kind in self.compile():
+            if fields is not None and name not in fields:
+                continue
+            if kind is None:
+                self.direct.append((name, lookups[0]))
+            else:
+                self.converted.append((name, lookups, self.converter(name, kind)))
+
+    def converter(self, name, kind):
+        if kind == 'datetime':
+            return _datetime
+        if kind == 'date':
+            return _date
+        if kind == 'method':
+            return getattr(self, f'get_{name}')
+        if kind[0] == 'decimal':
+            return _decimal(kind[1])
+        storage = kind[1]
+        return lambda value: self.file_url(storage, value)
+
+    def file_url(self, storage, name):
+        if not name:
+            return None
+        url = storage.url(name)
+        return self.request.build_absolute_uri(url) if self.request is not None else url
+
+    @property
+    def columns(self):
+        lookups = [lookup for _, lookup in self.direct]
+        for _, field_lookups, _ in self.converted:
+            lookups.extend(field_lookups)
+        return list(dict.fromkeys(lookups))
+
+    def to_representation(self, rows):
+        direct, converted = self.direct, self.converted
+        data = []
+        for row in rows:
+            item = {name: row[lookup] for name, lookup in direct}
+            for name, lookups, convert in converted:
+                item[name] = convert(*[row[lookup] for lookup in lookups])
+            data.append(item)
+        return data
+
+
+class ValuesListMixin:
+    """
+    Serves ``list()`` through ``values_serializer_class`` instead of the
+    ModelSerializer. Honours ``get_selected_fields()`` when the view has it.
+    """
+    values_serializer_class = None
+
+    def get_values_serializer(self):
+        fields = self.get_selected_fields() if hasattr(self, 'get_selected_fields') else None
+        return self.values_serializer_class(fields=fields, context=self.get_serializer_context())
+
+    def get_values_columns(self, serializer):
+        """Selected lookups plus the keyset ordering columns the paginator reads"""
+        ordering = getattr(self.pagination_class, 'ordering', None) or ()
+        if isinstance(ordering, str):
+            ordering = (ordering,)
+        return list(dict.fromkeys(serializer.columns + [name.lstrip('-') for name in ordering]))
+
+    def serialize_rows(self, serializer, rows):
+        return serializer.to_representation(rows)
+
+    def list(self, request, *args, **kwargs):
+        serializer = self.get_values_serializer()
+        queryset = self.get_queryset().prefetch_related(None).values(*self.get_values_columns(serializer))
+        queryset = self.filter_queryset(queryset)
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.serialize_rows(serializer, page))
+        return Response(self.serialize_rows(serializer, queryset))
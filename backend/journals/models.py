@@ -1,8 +1,18 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from config.cache import CatalogQuerySet
 
 User = get_user_model()
 
+
+class JournalQuerySet(CatalogQuerySet):
+    catalog = 'journals'
+
+
+class IssueQuerySet(CatalogQuerySet):
+    catalog = 'issues'
+
+
 class Journal(models.Model):
     name_en = models.CharField(max_length=255)
     name_uz = models.CharField(max_length=255, blank=True)
@@ -20,6 +30,8 @@ class Journal(models.Model):
     
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = JournalQuerySet.as_manager()
+
     def __str__(self):
         return self.name_en
 
@@ -38,6 +50,8 @@ class Issue(models.Model):
     file = models.FileField(upload_to='issues/files/', blank=True, null=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='DRAFT')
 
+    objects = IssueQuerySet.as_manager()
+
     class Meta:
         ordering = ['-year', '-volume', '-number']
         unique_together = ['journal', 'volume', 'number']
@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from config.values_serializer import ValuesSerializer
 from .models import Journal, Issue
 
 class JournalSerializer(serializers.ModelSerializer):
@@ -10,3 +11,11 @@ class IssueSerializer(serializers.ModelSerializer):
     class Meta:
         model = Issue
         fields = '__all__'
+
+class JournalValuesSerializer(ValuesSerializer):
+    """Read-only JournalSerializer for list responses"""
+    model = Journal
+
+class IssueValuesSerializer(ValuesSerializer):
+    """Read-only IssueSerializer for list responses"""
+    model = Issue
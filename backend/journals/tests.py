@@ -1,3 +1,391 @@
-from django.test import TestCase
+import base64
+import io
+import json
+import shutil
+import tempfile
+import time
+import unittest
+import warnings
+import zipfile
 
-# Create your tests here.
+from decimal import Decimal
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection, connections
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase, APITransactionTestCase
+
+from billing.models import SubscriptionPlan
+from billing.serializers import SubscriptionPlanSerializer
+from config.cache import LocalLRU, catalog_cache
+from config.db_router import ReplicaRouter, _use_replica, is_pinned_to_primary, pin_to_primary
+from config.renderers import FastJSONRenderer
+from submissions import certificate_export
+from submissions.models import Article
+from .models import Journal, Issue
+from .serializers import JournalSerializer, IssueSerializer
+from .views import JournalViewSet
+
+User = get_user_model()
+
+
+class IssueCertificateExportTests(APITestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        override = override_settings(CERTIFICATE_CACHE_DIR=self.cache_dir, CERTIFICATE_EXPORT_WORKERS=2)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.editor = User.objects.create_user(username='editor', password='pass', is_staff=True)
+        author = User.objects.create_user(username='author', password='pass')
+        journal = Journal.objects.create(name_en='Tech Review', description_en='Tech', slug='tech-review')
+        self.issue = Issue.objects.create(journal=journal, volume=2, number=1, year=2025)
+        self.published = [
+            Article.objects.create(
+                title=f'Article {i}', abstract='A', author=author, journal=journal,
+                issue=self.issue, status='PUBLISHED', submitted_at=timezone.now(),
+            )
+            for i in range(3)
+        ]
+        Article.objects.create(title='Draft', abstract='A', author=author, journal=journal, issue=self.issue)
+        self.url = f'/api/issues/{self.issue.id}/certificates/'
+
+    def download(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Content-Type'], 'application/zip')
+        return zipfile.ZipFile(io.BytesIO(b''.join(response.streaming_content)))
+
+    def test_streams_all_published_certificates(self):
+        self.client.force_authenticate(self.editor)
+        archive = self.download(lang='en,ru')
+
+        expected = {f'Certificate_{a.id}_{lang}.pdf' for a in self.published for lang in ('en', 'ru')}
+        self.assertEqual(set(archive.namelist()), expected)
+        for name in archive.namelist():
+            self.assertTrue(archive.read(name).startswith(b'%PDF'))
+
+        # Renders land in the certificate cache and are reused next time
+        self.assertEqual(set(self.download(lang='en,ru').namelist()), expected)
+
+    def test_languages_are_deduplicated_and_validated(self):
+        self.client.force_authenticate(self.editor)
+        with warnings.catch_warnings():
+            warnings.filterwarnings('error', 'Duplicate name')
+            names = self.download(lang='en,en, en').namelist()
+        self.assertEqual(sorted(names), sorted(f'Certificate_{a.id}_en.pdf' for a in self.published))
+
+        for lang in ('en,de', 'fr', ','):
+            self.assertEqual(self.client.get(self.url, {'lang': lang}).status_code, 400)
+
+    def test_exports_share_one_render_pool(self):
+        self.client.force_authenticate(self.editor)
+        self.download(lang='en')
+        pool = certificate_export.render_pool()
+        self.download(lang='uz')
+        self.assertIs(certificate_export.render_pool(), pool)
+
+    def test_cached_certificates_stream_before_all_articles_are_read(self):
+        self.client.force_authenticate(self.editor)
+        self.download(lang='en')
+
+        read = []
+
+        def articles():
+            for article in Article.objects.filter(status='PUBLISHED').select_related('author', 'journal', 'issue'):
+                read.append(article.id)
+                yield article
+
+        stream = certificate_export.stream_certificates_zip(articles(), ['en'])
+        self.assertTrue(next(stream).startswith(b'PK'))
+        self.assertEqual(len(read), 1)
+        stream.close()
+
+    def test_requires_editor(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 401)
+
+
+class IssuePaginationTests(APITestCase):
+    def setUp(self):
+        journals = [
+            Journal.objects.create(name_en=f'Journal {i}', description_en='J', slug=f'journal-{i}') for i in range(2)
+        ]
+        # Issues tie on year, and across journals on volume and number too
+        for journal in journals:
+            for number in range(1, 5):
+                Issue.objects.create(journal=journal, volume=1, number=number, year=2025)
+        self.expected = list(Issue.objects.order_by('-year', '-volume', '-number', '-id').values_list('id', flat=True))
+
+    def ids(self, response):
+        self.assertEqual(response.status_code, 200)
+        return [issue['id'] for issue in response.data['results']]
+
+    def test_cursor_walks_ties_both_ways(self):
+        response = self.client.get('/api/issues/', {'page_size': 3})
+        pages = [self.ids(response)]
+        while response.data['next']:
+            # The cursor holds the full sort key, never an offset past ties
+            self.assertNotIn('o=', base64.b64decode(parse_qs(urlparse(response.data['next']).query)['cursor'][0]).decode())
+            response = self.client.get(response.data['next'])
+            pages.append(self.ids(response))
+        self.assertEqual(sum(pages, []), self.expected)
+
+        back = []
+        while response.data['previous']:
+            response = self.client.get(response.data['previous'])
+            back.insert(0, self.ids(response))
+        self.assertEqual(back, pages[:-1])
+
+    def test_invalid_cursor_is_not_found(self):
+        for position in ('oops', '[1]', '["x", 1, 1, 1]'):
+            cursor = base64.b64encode(urlencode({'p': position}).encode()).decode()
+            self.assertEqual(self.client.get('/api/issues/', {'cursor': cursor}).status_code, 404)
+
+
+class ValuesSerializerTests(APITestCase):
+    """List endpoints serve values() rows; output must match the ModelSerializers"""
+
+    def setUp(self):
+        self.media_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_dir, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=self.media_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.journal = Journal.objects.create(
+            name_en='Tech Review', description_en='Tech', slug='tech-review', is_paid=True,
+            price_per_page=Decimal('12.5'),
+        )
+        self.journal.cover_image.save('cover.png', ContentFile(b'png'))
+        Issue.objects.create(journal=self.journal, volume=1, number=1, year=2024, published_at=timezone.now().date())
+        Issue.objects.create(journal=self.journal, volume=1, number=2, year=2025)
+        SubscriptionPlan.objects.create(name='Pro', slug='pro', price=Decimal('9.90'), description='Pro plan')
+
+    def test_journals_match(self):
+        response = self.client.get('/api/journals/')
+        expected = JournalSerializer(Journal.objects.all(), many=True, context={'request': response.wsgi_request})
+        self.assertEqual(response.json(), json.loads(JSONRenderer().render(expected.data)))
+
+    def test_issues_match(self):
+        response = self.client.get('/api/issues/')
+        issues = Issue.objects.order_by('-year', '-volume', '-number', '-id')
+        expected = IssueSerializer(issues, many=True, context={'request': response.wsgi_request})
+        self.assertEqual(response.json()['results'], json.loads(JSONRenderer().render(expected.data)))
+
+    def test_plans_match(self):
+        response = self.client.get('/api/plans/')
+        expected = SubscriptionPlanSerializer(SubscriptionPlan.objects.all(), many=True)
+        self.assertEqual(response.json(), json.loads(JSONRenderer().render(expected.data)))
+
+    def test_fast_renderer_matches_json_renderer(self):
+        data = {
+            'text': 'Line\u2028separator </script>', 'amount': Decimal('1.50'),
+            'at': timezone.now(), 'day': timezone.now().date(), 'nested': [{'id': 1}, None],
+        }
+        fast = FastJSONRenderer().render(data, renderer_context={})
+        self.assertEqual(json.loads(fast), json.loads(JSONRenderer().render(data, renderer_context={})))
+        self.assertNotIn('\u2028'.encode(), fast)
+
+
+@override_settings(SHARED_CACHE=True)
+class CatalogConditionalGetTests(APITestCase):
+    def setUp(self):
+        self.journal = Journal.objects.create(name_en='Tech Review', description_en='Tech', slug='tech-review')
+        Issue.objects.create(journal=self.journal, volume=1, number=1, year=2025)
+        SubscriptionPlan.objects.create(name='Pro', slug='pro', price=Decimal('9.90'), description='Pro plan')
+
+    def assertRevalidates(self, url, change):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('public', response['Cache-Control'])
+        etag = response['ETag']
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+        self.assertEqual(response.content, b'')
+
+        change()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_journals(self):
+        def rename():
+            self.journal.name_en = 'Science Review'
+            self.journal.save()
+        self.assertRevalidates('/api/journals/', rename)
+        self.assertRevalidates(f'/api/journals/{self.journal.id}/', rename)
+
+    def test_issues(self):
+        def add_issue():
+            Issue.objects.create(journal=self.journal, volume=2, number=Issue.objects.count(), year=2026)
+        self.assertRevalidates('/api/issues/', add_issue)
+        self.assertRevalidates('/api/issues/years/', add_issue)
+        # Deleting the journal cascades to its issues
+        self.assertRevalidates('/api/issues/', self.journal.delete)
+
+    def test_plans(self):
+        self.assertRevalidates('/api/plans/', SubscriptionPlan.objects.get().delete)
+
+    def test_variants_and_last_modified(self):
+        response = self.client.get('/api/journals/')
+        self.assertNotEqual(self.client.get('/api/journals/?format=api')['ETag'], response['ETag'])
+        response = self.client.get('/api/journals/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified'])
+        self.assertEqual(response.status_code, 304)
+
+
+@override_settings(SHARED_CACHE=True)
+class CatalogResponseCacheTests(APITestCase):
+    def setUp(self):
+        cache.clear()
+        catalog_cache.clear()
+        self.journal = Journal.objects.create(name_en='Tech Review', description_en='Tech', slug='tech-review')
+
+    def test_repeat_requests_skip_the_database(self):
+        first = self.client.get('/api/journals/')
+        with self.assertNumQueries(0):
+            second = self.client.get('/api/journals/')
+        self.assertEqual(second.json(), first.json())
+
+    def test_shared_tier_refills_local_tier(self):
+        self.client.get('/api/journals/')
+        catalog_cache.clear()
+        with self.assertNumQueries(0):
+            self.client.get('/api/journals/')
+        self.assertEqual(len(catalog_cache.local), 1)
+
+    def test_bulk_update_invalidates(self):
+        self.client.get('/api/journals/')
+        Journal.objects.filter(pk=self.journal.pk).update(name_en='Science Review')
+        self.assertEqual(self.client.get('/api/journals/').json()[0]['name_en'], 'Science Review')
+
+        self.client.get('/api/issues/')
+        Issue.objects.bulk_create([Issue(journal=self.journal, volume=1, number=1, year=2025)])
+        self.assertEqual(len(self.client.get('/api/issues/').json()['results']), 1)
+
+        self.client.get('/api/plans/')
+        SubscriptionPlan.objects.bulk_create([SubscriptionPlan(name='Pro', slug='pro', price=1, description='-')])
+        SubscriptionPlan.objects.update(is_active=False)
+        self.assertEqual(self.client.get('/api/plans/').json(), [])
+
+    def test_local_lru_evicts_least_recently_used(self):
+        lru = LocalLRU(2)
+        lru.set('a', 1)
+        lru.set('b', 2)
+        lru.get('a')
+        lru.set('c', 3)
+        self.assertEqual((lru.get('a'), lru.get('b'), lru.get('c')), (1, None, 3))
+
+    @override_settings(SHARED_CACHE=False)
+    def test_process_local_cache_serves_fresh_data(self):
+        response = self.client.get('/api/journals/')
+        self.assertNotIn('ETag', response)
+        # As if another worker renamed it: no stamp is bumped in this process
+        with connection.cursor() as cursor:
+            cursor.execute(f'UPDATE {Journal._meta.db_table} SET name_en = %s', ['Science Review'])
+        self.assertEqual(self.client.get('/api/journals/').json()[0]['name_en'], 'Science Review')
+        self.assertEqual(len(catalog_cache.local), 0)
+
+
+
+@override_settings(REPLICA_DATABASE='replica', REPLICA_STICKY_SECONDS=10, SHARED_CACHE=True)
+class ReplicaRouterTests(APITestCase):
+    """Routing decisions; ReplicaRoutingTests below runs them against a real second alias"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='editor', password='pass')
+
+    def reads_from_replica(self, method='GET', action='list', user=None, stamps=None):
+        request = Request(APIRequestFactory().generic(method, '/api/journals/'))
+        request.user = user or AnonymousUser()
+        view = JournalViewSet(action=action, request=request, catalog_stamps=stamps)
+        return view.reads_from_replica(request)
+
+    def test_only_safe_replica_actions(self):
+        self.assertTrue(self.reads_from_replica())
+        self.assertFalse(self.reads_from_replica(method='POST'))
+        self.assertFalse(self.reads_from_replica(action='update'))
+
+    def test_recent_writes_stay_on_primary(self):
+        self.assertTrue(self.reads_from_replica(user=self.user))
+        pin_to_primary(self.user)
+        self.assertFalse(self.reads_from_replica(user=self.user))
+        self.assertTrue(self.reads_from_replica())
+        self.assertFalse(self.reads_from_replica(stamps=[time.time_ns()]))
+        self.assertTrue(self.reads_from_replica(stamps=[time.time_ns() - 60 * 10**9]))
+
+    def test_process_local_cache_reads_primary(self):
+        # Pins set by other workers would be invisible
+        with override_settings(SHARED_CACHE=False):
+            self.assertFalse(self.reads_from_replica())
+
+    def test_router(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Journal))
+        token = _use_replica.set(True)
+        try:
+            self.assertEqual(router.db_for_read(Journal), 'replica')
+            self.assertEqual(router.db_for_write(Journal), 'default')
+        finally:
+            _use_replica.reset(token)
+        self.assertFalse(router.allow_migrate('replica', 'journals'))
+
+    def test_successful_writes_pin_the_user(self):
+        self.client.force_authenticate(self.user)
+        self.client.post('/api/journals/', {'name_en': 'Bad'})
+        self.assertFalse(is_pinned_to_primary(self.user))
+        self.client.post('/api/journals/', {'name_en': 'Tech Review', 'description_en': 'Tech', 'slug': 'tech'})
+        self.assertTrue(is_pinned_to_primary(self.user))
+
+
+@unittest.skipUnless('replica' in settings.DATABASES, 'needs a replica alias, see docstring')
+@override_settings(REPLICA_DATABASE='replica', REPLICA_STICKY_SECONDS=1, SHARED_CACHE=True)
+class ReplicaRoutingTests(APITransactionTestCase):
+    """
+    Run with DATABASE_REPLICA_URL=sqlite:///replica.sqlite3 (or a Postgres
+    URL) and DATABASE_REPLICA_READS=False: the alias then mirrors the default
+    test database, and only these tests route reads to it. Transaction test
+    case, because a second connection cannot see an open transaction.
+    """
+    databases = '__all__'
+
+    def setUp(self):
+        cache.clear()
+        catalog_cache.clear()
+        self.user = User.objects.create_user(username='editor', password='pass')
+        Journal.objects.create(name_en='Tech Review', description_en='Tech', slug='tech-review')
+
+    def replica_queries(self, url, **kwargs):
+        with CaptureQueriesContext(connections['replica']) as queries:
+            response = self.client.get(url, **kwargs)
+        self.assertEqual(response.status_code, 200)
+        return len(queries)
+
+    def test_public_reads_use_replica_once_catalog_settles(self):
+        # Just changed: the replica may lag behind, so the primary answers
+        self.assertEqual(self.replica_queries('/api/journals/'), 0)
+        time.sleep(1.1)
+        self.assertGreater(self.replica_queries('/api/journals/?uncached'), 0)
+
+    def test_writers_read_their_writes_from_primary(self):
+        time.sleep(1.1)
+        self.client.force_authenticate(self.user)
+        self.client.post('/api/issues/', {})  # rejected: not pinned
+        self.assertGreater(self.replica_queries('/api/submissions/'), 0)
+
+        self.client.post('/api/journals/', {'name_en': 'Other', 'description_en': '-', 'slug': 'other'})
+        self.assertEqual(self.replica_queries('/api/submissions/'), 0)
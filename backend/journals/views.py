@@ -1,21 +1,33 @@
-from rest_framework import viewsets, permissions, response
+from django.http import StreamingHttpResponse
+from rest_framework import viewsets, permissions, response, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from config.conditional import ConditionalGetMixin
+from config.db_router import ReplicaReadMixin
+from config.pagination import IssuePagination
+from config.values_serializer import ValuesListMixin
 from .models import Journal, Issue
-from .serializers import JournalSerializer, IssueSerializer
+from .serializers import JournalSerializer, IssueSerializer, JournalValuesSerializer, IssueValuesSerializer
 
-class JournalViewSet(viewsets.ModelViewSet):
+class JournalViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Journal.objects.all()
     serializer_class = JournalSerializer
+    values_serializer_class = JournalValuesSerializer
+    catalog_actions = {'list': ('journals',), 'retrieve': ('journals',)}
+    replica_actions = ('list', 'retrieve')
     
     def get_permissions(self):
         if self.action in ['list', 'retrieve']:
             return [permissions.AllowAny()]
         return [permissions.IsAuthenticated()]
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(ReplicaReadMixin, ConditionalGetMixin, ValuesListMixin, viewsets.ModelViewSet):
     queryset = Issue.objects.all()  # Required for router basename
     serializer_class = IssueSerializer
+    values_serializer_class = IssueValuesSerializer
+    pagination_class = IssuePagination
+    catalog_actions = {'list': ('issues',), 'retrieve': ('issues',), 'years': ('issues',)}
+    replica_actions = ('list', 'retrieve', 'years')
     
     def get_queryset(self):
         queryset = Issue.objects.all()
@@ -32,3 +44,23 @@ class IssueViewSet(viewsets.ModelViewSet):
     def years(self, request):
         years = Issue.objects.order_by('-year').values_list('year', flat=True).distinct()
         return Response(years)
+
+    @action(detail=True, methods=['get'])
+    def certificates(self, request, pk=None):
+        """
+        Stream a ZIP of certificates for every published article in the issue.
+        GET /api/issues/{id}/certificates/?lang=en,uz,ru
+        """
+        from submissions.certificate_export import stream_certificates_zip
+
+        issue = self.get_object()
+        # Each language once, in the order asked for
+        langs = list(dict.fromkeys(l.strip() for l in request.query_params.get('lang', 'en,uz,ru').split(',')))
+        if not langs or not set(langs) <= {'en', 'uz', 'ru'}:
+            return Response({'error': 'lang must be a comma-separated list of en, uz, ru'}, status=status.HTTP_400_BAD_REQUEST)
+
+        articles = issue.articles.filter(status='PUBLISHED').select_related('author', 'journal', 'issue').order_by('id')
+        response = StreamingHttpResponse(stream_certificates_zip(articles.iterator(), langs), content_type='application/zip')
+        filename = f"Certificates_Vol{issue.volume}_No{issue.number}_{issue.year}.zip"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
@@ -7,6 +7,10 @@ import sys
 def main():
     """Run administrative tasks."""
     os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+    # The statement timeout guards web requests; migrations, their backfills
+    # and maintenance commands (rebuild_*, reconcile_wallets) run longer
+    if sys.argv[1:2] != ['runserver']:
+        os.environ.setdefault('DATABASE_STATEMENT_TIMEOUT', '0')
     try:
         from django.core.management import execute_from_command_line
     except ImportError as exc:
@@ -35,22 +35,22 @@ class ArticleAdmin(admin.ModelAdmin):
     
     @admin.action(description='Mark selected articles as PUBLISHED')
     def mark_as_published(self, request, queryset):
-        updated = queryset.update(status='PUBLISHED')
+        updated = queryset.set_status('PUBLISHED')
         self.message_user(request, f'{updated} article(s) marked as PUBLISHED.')
     
     @admin.action(description='Mark selected articles as ACCEPTED')
     def mark_as_accepted(self, request, queryset):
-        updated = queryset.update(status='ACCEPTED')
+        updated = queryset.set_status('ACCEPTED')
         self.message_user(request, f'{updated} article(s) marked as ACCEPTED.')
     
     @admin.action(description='Mark selected articles as REJECTED')
     def mark_as_rejected(self, request, queryset):
-        updated = queryset.update(status='REJECTED')
+        updated = queryset.set_status('REJECTED')
         self.message_user(request, f'{updated} article(s) marked as REJECTED.')
     
     @admin.action(description='Mark selected articles as UNDER_REVIEW')
     def mark_as_under_review(self, request, queryset):
-        updated = queryset.update(status='UNDER_REVIEW')
+        updated = queryset.set_status('UNDER_REVIEW')
         self.message_user(request, f'{updated} article(s) marked as UNDER_REVIEW.')
 
 @admin.register(ArticleReview)
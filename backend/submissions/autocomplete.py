@@ -0,0 +1,192 @@
+"""
+In-memory prefix index for search-box autocomplete.
+
+Suggestions come from published article titles, keywords, author names and
+journal names. Each suggestion is stored under every word position, so
+"cot" matches "Irrigating cotton fields". Keys live in one sorted list and a
+lookup is a bisect plus a short forward scan, with no database access.
+
+Requests never touch the database. A background thread builds the index,
+one at a time, and swaps the new snapshot in atomically while lookups keep
+reading the old one; a process answers with no suggestions until its first
+build is done. Newly published articles are merged in place; any other
+committed change marks the index stale, and each process also rebuilds
+after ``AUTOCOMPLETE_REFRESH_SECONDS`` so workers pick up changes made
+elsewhere.
+"""
+import logging
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from django.conf import settings
+from django.db import connections, transaction
+
+from journals.models import Journal
+from .models import Article
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_WORDS = 6
+
+
+def normalize(text):
+    return ' '.join(text.casefold().split())
+
+
+class _Snapshot:
+    """Immutable sorted keys with a parallel array of suggestion offsets"""
+
+    def __init__(self, entries, suggestions):
+        entries.sort()
+        self.keys = [key for key, _ in entries]
+        self.refs = array('I', (ref for _, ref in entries))
+        self.suggestions = suggestions
+
+    def lookup(self, prefix, limit):
+        results = []
+        seen = set()
+        i = bisect_left(self.keys, prefix)
+        while i < len(self.keys) and len(results) < limit:
+            if not self.keys[i].startswith(prefix):
+                break
+            ref = self.refs[i]
+            if ref not in seen:
+                seen.add(ref)
+                results.append(self.suggestions[ref])
+            i += 1
+        return results
+
+
+class PrefixIndex:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._refreshing = threading.Lock()
+        self._snapshot = None
+        self._built_at = 0.0
+        # Committed changes seen so far, and how many the snapshot includes
+        self._changes = 0
+        self._built_changes = -1
+        self._suggestion_ids = {}
+        self._article_ids = set()
+
+    def _entries_for(self, suggestion, ref):
+        words = normalize(suggestion['text']).split(' ')
+        for i in range(len(words)):
+            yield ' '.join(words[i:i + MAX_KEY_WORDS]), ref
+
+    def _collect(self, articles, journals):
+        suggestions = {}
+
+        def add(kind, text, obj_id):
+            text = text.strip()
+            if text:
+                suggestions.setdefault((kind, normalize(text), obj_id), {'type': kind, 'text': text, 'id': obj_id})
+
+        for article in articles:
+            add('title', article['title'], article['id'])
+            for keyword in article['keywords'].split(','):
+                add('keyword', keyword, None)
+            full_name = f"{article['author__first_name']} {article['author__last_name']}".strip()
+            add('author', full_name or article['author__username'], article['author_id'])
+        for journal in journals:
+            for name in (journal['name_en'], journal['name_uz'], journal['name_ru']):
+                add('journal', name, journal['id'])
+        return suggestions
+
+    def _article_rows(self, queryset):
+        return queryset.values(
+            'id', 'title', 'keywords', 'author_id',
+            'author__first_name', 'author__last_name', 'author__username',
+        )
+
+    def rebuild(self):
+        changes = self._changes
+        articles = self._article_rows(Article.objects.filter(status='PUBLISHED'))
+        journals = Journal.objects.values('id', 'name_en', 'name_uz', 'name_ru')
+        collected = self._collect(articles, journals)
+        suggestions = list(collected.values())
+        entries = []
+        for ref, suggestion in enumerate(suggestions):
+            entries.extend(self._entries_for(suggestion, ref))
+        with self._lock:
+            self._suggestion_ids = {key: ref for ref, key in enumerate(collected)}
+            self._article_ids = {key[2] for key in collected if key[0] == 'title'}
+            self._snapshot = _Snapshot(entries, suggestions)
+            self._built_at = time.monotonic()
+            self._built_changes = changes
+
+    def refresh(self):
+        """Rebuild in a background thread, unless a rebuild is already running"""
+        if not self._refreshing.acquire(blocking=False):
+            return
+
+        def run():
+            try:
+                self.rebuild()
+            except Exception:
+                logger.exception("Autocomplete index rebuild failed")
+            finally:
+                # This thread's own connections
+                connections.close_all()
+                self._refreshing.release()
+
+        threading.Thread(target=run, name='autocomplete-refresh', daemon=True).start()
+
+    def add_articles(self, queryset):
+        """Merge newly published articles into the current snapshot"""
+        if self._snapshot is None:
+            return
+        if self._refreshing.locked():
+            # The running rebuild may have read the table before these rows
+            self.invalidate()
+            return
+        collected = self._collect(self._article_rows(queryset), [])
+        with self._lock:
+            snapshot = self._snapshot
+            suggestions = list(snapshot.suggestions)
+            entries = list(zip(snapshot.keys, snapshot.refs))
+            for key, suggestion in collected.items():
+                if key in self._suggestion_ids:
+                    continue
+                ref = len(suggestions)
+                self._suggestion_ids[key] = ref
+                if key[0] == 'title':
+                    self._article_ids.add(key[2])
+                suggestions.append(suggestion)
+                entries.extend(self._entries_for(suggestion, ref))
+            self._snapshot = _Snapshot(entries, suggestions)
+
+    def article_changed(self, article, deleted=False):
+        """Keep the index in step with a saved or deleted article"""
+        indexed = article.pk in self._article_ids
+        if article.status == 'PUBLISHED' and not indexed and not deleted:
+            self.add_articles(Article.objects.filter(pk=article.pk))
+        elif indexed:
+            # Edited or unpublished: entries can't be removed in place
+            self.invalidate()
+
+    def invalidate(self):
+        # Counted at commit, so a rebuild cannot read the old rows afterwards
+        transaction.on_commit(self._changed)
+
+    def _changed(self):
+        with self._lock:
+            self._changes += 1
+
+    def is_stale(self):
+        max_age = getattr(settings, 'AUTOCOMPLETE_REFRESH_SECONDS', 300)
+        return self._changes != self._built_changes or time.monotonic() - self._built_at > max_age
+
+    def lookup(self, query, limit=10):
+        prefix = normalize(query)
+        if not prefix:
+            return []
+        if self.is_stale():
+            self.refresh()
+        snapshot = self._snapshot
+        return snapshot.lookup(prefix, limit) if snapshot else []
+
+
+autocomplete_index = PrefixIndex()
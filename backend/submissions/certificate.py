@@ -1,219 +1,82 @@
 import io
-import os
+import logging
 import qrcode
+from functools import lru_cache
+from pathlib import Path
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, landscape
-from reportlab.lib.units import inch, mm
+from reportlab.lib.units import mm
 from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfbase.ttfonts import TTFont
 from reportlab.lib import colors
 from django.conf import settings
 
-# Register Fonts
-FONT_PATH = r"C:\Windows\Fonts\arial.ttf"
-try:
-    pdfmetrics.registerFont(TTFont('Arial', FONT_PATH))
-    # Fake Bold by reusing same font or strictly it should beArialbd.ttf
-    # For now we stick to Arial as base.
-    FONT_NAME = 'Arial'
-except:
-    FONT_NAME = 'Helvetica'
+from .verification import make_certificate_id
 
-def generate_certificate_pdf(article, lang='en'):
+logger = logging.getLogger(__name__)
+
+# Bump when the layout changes so cached PDFs are re-rendered
+TEMPLATE_VERSION = 2
+
+PAGE_WIDTH, PAGE_HEIGHT = landscape(A4)
+GOLD_COLOR = colors.Color(0.83, 0.68, 0.21)  # #D4AF37ish
+BLUE_COLOR = colors.Color(0.1, 0.2, 0.4)     # #1a365d
+
+TEXTS = {
+    'en': {
+        'header': "CERTIFICATE OF PUBLICATION",
+        'awarded_to': "This certificate is awarded to",
+        'for_publishing': "for successfully publishing the article titled",
+        'in_journal': "in the",
+        'date': "Date of Publication",
+        'signed': "Chief Editor",
+        'verify': "Scan to verify",
+        'id': "Certificate ID"
+    },
+    'uz': {
+        'header': "NASHR QILINGANLIK HAQIDA SERTIFIKAT",
+        'awarded_to': "Ushbu sertifikat taqdim etiladi:",
+        'for_publishing': "quyidagi mavzudagi maqolani muvaffaqiyatli nashr etgani uchun:",
+        'in_journal': "Jurnal:",
+        'date': "Nashr sanasi",
+        'signed': "Bosh Muharrir",
+        'verify': "Tekshirish uchun",
+        'id': "Sertifikat ID"
+    },
+    'ru': {
+        'header': "СЕРТИФИКАТ О ПУБЛИКАЦИИ",
+        'awarded_to': "Настоящий сертификат вручается",
+        'for_publishing': "за успешную публикацию статьи на тему:",
+        'in_journal': "в журнале:",
+        'date': "Дата публикации",
+        'signed': "Главный редактор",
+        'verify': "Сканируйте для проверки",
+        'id': "ID Сертификата"
+    }
+}
+
+# QR placement (right side of the footer)
+QR_SIZE = 35*mm
+QR_X = PAGE_WIDTH - 65*mm
+QR_Y = 25*mm
+QR_BORDER = 4  # quiet zone, in modules
+
+@lru_cache(maxsize=None)
+def get_font_name():
     """
-    Generates a PDF certificate for the given article using a Premium Design.
-    Returns a BytesIO buffer.
+    Registers the certificate font once, named after its file, which is
+    part of the cache key. Falls back to Helvetica, which has no Cyrillic.
     """
-    buffer = io.BytesIO()
-    
-    # Setup Canvas (Landscape A4)
-    c = canvas.Canvas(buffer, pagesize=landscape(A4))
-    width, height = landscape(A4)
-    
-    # --- TRANSLATIONS ---
-    texts = {
-        'en': {
-            'header': "CERTIFICATE OF PUBLICATION",
-            'awarded_to': "This certificate is awarded to",
-            'for_publishing': "for successfully publishing the article titled",
-            'in_journal': "in the",
-            'date': "Date of Publication",
-            'signed': "Chief Editor",
-            'verify': "Scan to verify",
-            'id': "Certificate ID"
-        },
-        'uz': {
-            'header': "NASHR QILINGANLIK HAQIDA SERTIFIKAT",
-            'awarded_to': "Ushbu sertifikat taqdim etiladi:",
-            'for_publishing': "quyidagi mavzudagi maqolani muvaffaqiyatli nashr etgani uchun:",
-            'in_journal': "Jurnal:",
-            'date': "Nashr sanasi",
-            'signed': "Bosh Muharrir",
-            'verify': "Tekshirish uchun",
-            'id': "Sertifikat ID"
-        },
-        'ru': {
-            'header': "СЕРТИФИКАТ О ПУБЛИКАЦИИ",
-            'awarded_to': "Настоящий сертификат вручается",
-            'for_publishing': "за успешную публикацию статьи на тему:",
-            'in_journal': "в журнале:",
-            'date': "Дата публикации",
-            'signed': "Главный редактор",
-            'verify': "Сканируйте для проверки",
-            'id': "ID Сертификата"
-        }
-    }
-    
-    t = texts.get(lang, texts['en'])
-    
-    # --- DESIGN IMPLEMENTATION ---
-    
-    # 0. Background
-    c.setFillColor(colors.white)
-    c.rect(0, 0, width, height, fill=1)
-    
-    # 1. Ornamental Border
-    # Outer Gold Line
-    gold_color = colors.Color(0.83, 0.68, 0.21) # #D4AF37ish
-    blue_color = colors.Color(0.1, 0.2, 0.4)    # #1a365d
-    
-    c.setStrokeColor(gold_color)
-    c.setLineWidth(5)
-    c.rect(10*mm, 10*mm, width-20*mm, height-20*mm)
-    
-    # Inner Blue Line
-    c.setStrokeColor(blue_color)
-    c.setLineWidth(1.5)
-    c.rect(13*mm, 13*mm, width-26*mm, height-26*mm)
-    
-    # Corner Accents (L-shapes)
-    c.setStrokeColor(gold_color)
-    c.setLineWidth(3)
-    corner_len = 20*mm
-    
-    # Top Left
-    c.line(13*mm, 13*mm+corner_len, 13*mm, 13*mm)
-    c.line(13*mm, 13*mm, 13*mm+corner_len, 13*mm)
-    # Top Right
-    c.line(width-13*mm, 13*mm+corner_len, width-13*mm, 13*mm)
-    c.line(width-13*mm, 13*mm, width-13*mm-corner_len, 13*mm)
-    # Bottom Left
-    c.line(13*mm, height-13*mm-corner_len, 13*mm, height-13*mm)
-    c.line(13*mm, height-13*mm, 13*mm+corner_len, height-13*mm)
-    # Bottom Right
-    c.line(width-13*mm, height-13*mm-corner_len, width-13*mm, height-13*mm)
-    c.line(width-13*mm, height-13*mm, width-13*mm-corner_len, height-13*mm)
-
-    # 2. Header
-    c.setFont(FONT_NAME, 32)
-    c.setFillColor(blue_color)
-    c.drawCentredString(width / 2, height - 50*mm, t['header'])
-    
-    # Certificate ID
-    c.setFont(FONT_NAME, 10)
-    c.setFillColor(colors.gray)
-    cert_id = f"CAJ-{article.id}-{article.created_at.strftime('%Y')}"
-    c.drawCentredString(width / 2, height - 60*mm, f"{t['id']}: {cert_id}")
-    
-    # 3. Awarded To
-    c.setFont(FONT_NAME, 14)
-    c.setFillColor(colors.gray)
-    c.drawCentredString(width / 2, height - 80*mm, t['awarded_to'])
-    
-    # Author Name
-    author_name = article.author.get_full_name() or article.author.username
-    c.setFont(FONT_NAME, 26) 
-    c.setFillColor(colors.black)
-    c.drawCentredString(width / 2, height - 95*mm, author_name)
-    
-    # Divider Line
-    c.setStrokeColor(gold_color)
-    c.setLineWidth(1)
-    c.line(width/2 - 50*mm, height - 100*mm, width/2 + 50*mm, height - 100*mm)
-
-    # 4. For Publishing
-    c.setFont(FONT_NAME, 14)
-    c.setFillColor(colors.gray)
-    c.drawCentredString(width / 2, height - 110*mm, t['for_publishing'])
-    
-    # Article Title
-    c.setFont(FONT_NAME, 18)
-    c.setFillColor(colors.black)
-    title = article.title
-    
-    # Basic word wrap logic
-    words = title.split(' ')
-    line1 = ""
-    line2 = ""
-    for w in words:
-        if len(line1 + w) < 60:
-            line1 += w + " "
-        else:
-            line2 += w + " "
-            
-    c.drawCentredString(width / 2, height - 122*mm, line1.strip())
-    if line2:
-        c.drawCentredString(width / 2, height - 130*mm, line2.strip())
-
-    # 5. In Journal
-    c.setFont(FONT_NAME, 14)
-    c.setFillColor(colors.gray)
-    c.drawCentredString(width / 2, height - 138*mm, t['in_journal'])
-    
-    # Journal Name Logic
-    journal_name = getattr(article.journal, f'name_{lang}', article.journal.name_en)
-    if not journal_name:
-        journal_name = article.journal.name_en
-        
-    c.setFont(FONT_NAME, 22)
-    c.setFillColor(blue_color)
-    
-    # Text Wrapping for Journal Name
-    j_name_upper = journal_name.upper()
-    if len(j_name_upper) > 40:
-        c.setFont(FONT_NAME, 16) # Slightly smaller font for multi-line
-        words = j_name_upper.split(' ')
-        lines = []
-        current_line = []
-        for w in words:
-            if len(" ".join(current_line + [w])) < 45: # Char limit per line
-                current_line.append(w)
-            else:
-                lines.append(" ".join(current_line))
-                current_line = [w]
-        if current_line:
-            lines.append(" ".join(current_line))
-            
-        # Draw lines centered
-        start_y = height - 148*mm
-        for i, line in enumerate(lines[:2]): # Limit to 2 lines as requested
-            c.drawCentredString(width / 2, start_y - (i * 7*mm), line)
-    else:
-        c.drawCentredString(width / 2, height - 150*mm, j_name_upper)
-
-    # 6. Footer Info - Publication Details
-    footer_y = 35*mm
-    
-    c.setFont(FONT_NAME, 11)
-    c.setFillColor(colors.black)
-    
-    # Left: Publication Date
-    date_str = article.created_at.strftime("%d.%m.%Y")
-    c.drawString(30*mm, footer_y, f"{t['date']}: {date_str}")
-    
-    # Center: Volume, Issue, Pages (if available)
-    if article.issue:
-        c.setFont(FONT_NAME, 10)
-        c.setFillColor(blue_color)
-        issue_text = f"Vol. {article.issue.volume}, No. {article.issue.number} ({article.issue.year})"
-        if article.page_range:
-            issue_text += f" • pp. {article.page_range}"
-        c.drawCentredString(width / 2, footer_y, issue_text)
-    
-    # Right side will have QR code (moved from bottom)
-    
-    # 7. QR Code (Right side, larger and more prominent)
-    # Robust URL Generation
+    path = Path(settings.CERTIFICATE_FONT_PATH)
+    try:
+        pdfmetrics.registerFont(TTFont(path.stem, str(path)))
+        return path.stem
+    except Exception:
+        logger.warning("Certificate font %s could not be loaded; Russian certificates will lack glyphs", path,
+                       exc_info=True)
+        return 'Helvetica'
+
+def get_verify_base_url():
     base_url = "http://localhost:3000"
     if hasattr(settings, 'CSRF_TRUSTED_ORIGINS') and len(settings.CSRF_TRUSTED_ORIGINS) > 0:
         base_url = settings.CSRF_TRUSTED_ORIGINS[0]
@@ -223,22 +86,231 @@ def generate_certificate_pdf(article, lang='en'):
             base_url = f"http://{host}:3000"
         else:
              base_url = f"https://{host}"
-             
-    qr_data = f"{base_url}/articles/{article.id}"
-    qr = qrcode.make(qr_data)
-    from reportlab.lib.utils import ImageReader
-    qr_img = ImageReader(qr._img)
-    
-    qr_size = 35*mm
-    qr_x = width - 65*mm # Moved further left to avoid border
-    qr_y = 25*mm
-    c.drawImage(qr_img, qr_x, qr_y, width=qr_size, height=qr_size)
-    c.setFillColor(blue_color)
-    c.setFont(FONT_NAME, 8)
-    c.drawCentredString(qr_x + qr_size/2, qr_y - 5*mm, t['verify'])
+    return base_url
+
+def get_certificate_verify_url(cert_id):
+    return f"{settings.CERTIFICATE_VERIFY_URL.rstrip('/')}/{cert_id}/"
+
+def certificate_inputs(article, lang='en'):
+    """
+    Every per-article value drawn on the certificate. The PDF is a pure
+    function of this dict, which is what the certificate cache hashes.
+    """
+    journal_name = getattr(article.journal, f'name_{lang}', article.journal.name_en)
+    if not journal_name:
+        journal_name = article.journal.name_en
+
+    issue_text = None
+    if article.issue:
+        issue_text = f"Vol. {article.issue.volume}, No. {article.issue.number} ({article.issue.year})"
+        if article.page_range:
+            issue_text += f" • pp. {article.page_range}"
+
+    cert_id = make_certificate_id(article.id, article.created_at.year)
+    return {
+        'template': TEMPLATE_VERSION,
+        'font': get_font_name(),
+        'lang': lang,
+        'cert_id': cert_id,
+        'author_name': article.author.get_full_name() or article.author.username,
+        'title': article.title,
+        'journal_name': journal_name,
+        'date': article.created_at.strftime("%d.%m.%Y"),
+        'issue_text': issue_text,
+        'qr_data': get_certificate_verify_url(cert_id),
+    }
+
+
+class CertificateTemplate:
+    """
+    The static layer of a certificate for one language.
+
+    The ornamental frame is pure vector graphics, so its PDF content stream is
+    built once and stamped into each document as a form XObject. Labels are
+    still drawn per document because embedded TTF subsets are per document.
+    """
 
+    FORM_NAME = 'certificate_frame'
+
+    def __init__(self, lang):
+        self.lang = lang
+        self.texts = TEXTS.get(lang, TEXTS['en'])
+        self.font_name = get_font_name()
+        self.frame_stream = self._build_frame_stream()
+
+    @staticmethod
+    def _build_frame_stream():
+        width, height = PAGE_WIDTH, PAGE_HEIGHT
+        ops = []
+
+        def stroke(color, line_width):
+            ops.append(f"{color.red:.3f} {color.green:.3f} {color.blue:.3f} RG {line_width:.2f} w")
+
+        def line(x1, y1, x2, y2):
+            ops.append(f"{x1:.2f} {y1:.2f} m {x2:.2f} {y2:.2f} l S")
+
+        # 0. Background
+        ops.append(f"1 1 1 rg 0 0 {width:.2f} {height:.2f} re f")
+
+        # 1. Ornamental Border: outer gold line, inner blue line
+        stroke(GOLD_COLOR, 5)
+        ops.append(f"{10*mm:.2f} {10*mm:.2f} {width-20*mm:.2f} {height-20*mm:.2f} re S")
+        stroke(BLUE_COLOR, 1.5)
+        ops.append(f"{13*mm:.2f} {13*mm:.2f} {width-26*mm:.2f} {height-26*mm:.2f} re S")
+
+        # Corner Accents (L-shapes)
+        stroke(GOLD_COLOR, 3)
+        corner_len = 20*mm
+        inset = 13*mm
+        for x, dx in ((inset, corner_len), (width - inset, -corner_len)):
+            for y, dy in ((inset, corner_len), (height - inset, -corner_len)):
+                line(x, y + dy, x, y)
+                line(x, y, x + dx, y)
+
+        # Divider under the author name
+        stroke(GOLD_COLOR, 1)
+        line(width/2 - 50*mm, height - 100*mm, width/2 + 50*mm, height - 100*mm)
+        return '\n'.join(ops)
+
+    def draw_static(self, c):
+        width, height = PAGE_WIDTH, PAGE_HEIGHT
+        t = self.texts
+
+        c.beginForm(self.FORM_NAME)
+        c.addLiteral(self.frame_stream)
+        c.endForm()
+        c.doForm(self.FORM_NAME)
+
+        c.setFont(self.font_name, 32)
+        c.setFillColor(BLUE_COLOR)
+        c.drawCentredString(width / 2, height - 50*mm, t['header'])
+
+        c.setFont(self.font_name, 14)
+        c.setFillColor(colors.gray)
+        c.drawCentredString(width / 2, height - 80*mm, t['awarded_to'])
+        c.drawCentredString(width / 2, height - 110*mm, t['for_publishing'])
+        c.drawCentredString(width / 2, height - 138*mm, t['in_journal'])
+
+        c.setFillColor(BLUE_COLOR)
+        c.setFont(self.font_name, 8)
+        c.drawCentredString(QR_X + QR_SIZE/2, QR_Y - 5*mm, t['verify'])
+
+    def draw_fields(self, c, data):
+        width, height = PAGE_WIDTH, PAGE_HEIGHT
+        font_name = self.font_name
+        t = self.texts
+
+        # Certificate ID
+        c.setFont(font_name, 10)
+        c.setFillColor(colors.gray)
+        c.drawCentredString(width / 2, height - 60*mm, f"{t['id']}: {data['cert_id']}")
+
+        # Author Name
+        c.setFont(font_name, 26)
+        c.setFillColor(colors.black)
+        c.drawCentredString(width / 2, height - 95*mm, data['author_name'])
+
+        # Article Title, basic word wrap
+        c.setFont(font_name, 18)
+        words = data['title'].split(' ')
+        line1 = ""
+        line2 = ""
+        for w in words:
+            if len(line1 + w) < 60:
+                line1 += w + " "
+            else:
+                line2 += w + " "
+
+        c.drawCentredString(width / 2, height - 122*mm, line1.strip())
+        if line2:
+            c.drawCentredString(width / 2, height - 130*mm, line2.strip())
+
+        # Journal Name, wrapped to two lines when long
+        c.setFont(font_name, 22)
+        c.setFillColor(BLUE_COLOR)
+        j_name_upper = data['journal_name'].upper()
+        if len(j_name_upper) > 40:
+            c.setFont(font_name, 16) # Slightly smaller font for multi-line
+            words = j_name_upper.split(' ')
+            lines = []
+            current_line = []
+            for w in words:
+                if len(" ".join(current_line + [w])) < 45: # Char limit per line
+                    current_line.append(w)
+                else:
+                    lines.append(" ".join(current_line))
+                    current_line = [w]
+            if current_line:
+                lines.append(" ".join(current_line))
+
+            start_y = height - 148*mm
+            for i, line in enumerate(lines[:2]):
+                c.drawCentredString(width / 2, start_y - (i * 7*mm), line)
+        else:
+            c.drawCentredString(width / 2, height - 150*mm, j_name_upper)
+
+        # Footer: publication date (left), volume/issue/pages (center)
+        footer_y = 35*mm
+        c.setFont(font_name, 11)
+        c.setFillColor(colors.black)
+        c.drawString(30*mm, footer_y, f"{t['date']}: {data['date']}")
+
+        if data['issue_text']:
+            c.setFont(font_name, 10)
+            c.setFillColor(BLUE_COLOR)
+            c.drawCentredString(width / 2, footer_y, data['issue_text'])
+
+        draw_qr(c, data['qr_data'], QR_X, QR_Y, QR_SIZE)
+
+
+def draw_qr(c, qr_data, x, y, size):
+    """
+    Draws the QR code as vector modules, merging horizontal runs into single
+    rectangles. This skips rasterizing and re-encoding a PNG for every PDF.
+    """
+    qr = qrcode.QRCode(border=0)
+    qr.add_data(qr_data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()
+
+    module = size / (len(matrix) + 2 * QR_BORDER)
+    top = y + size - QR_BORDER * module
+    path = c.beginPath()
+    for row_index, row in enumerate(matrix):
+        row_y = top - (row_index + 1) * module
+        col = 0
+        while col < len(row):
+            if not row[col]:
+                col += 1
+                continue
+            start = col
+            while col < len(row) and row[col]:
+                col += 1
+            path.rect(x + (QR_BORDER + start) * module, row_y, (col - start) * module, module)
+    c.setFillColor(colors.black)
+    c.drawPath(path, stroke=0, fill=1)
+
+
+@lru_cache(maxsize=None)
+def get_template(lang):
+    return CertificateTemplate(lang if lang in TEXTS else 'en')
+
+def generate_certificate_pdf(article, lang='en'):
+    """
+    Generates a PDF certificate for the given article using a Premium Design.
+    Returns a BytesIO buffer.
+    """
+    return render_certificate(certificate_inputs(article, lang), lang)
+
+def render_certificate(data, lang='en'):
+    """Renders a certificate from ``certificate_inputs()`` output"""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=(PAGE_WIDTH, PAGE_HEIGHT))
+    template = get_template(lang)
+    template.draw_static(c)
+    template.draw_fields(c, data)
     c.showPage()
     c.save()
-    
+
     buffer.seek(0)
     return buffer
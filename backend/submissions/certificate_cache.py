@@ -0,0 +1,96 @@
+"""
+Content-addressed on-disk cache for rendered certificates.
+
+A certificate is stored as ``<article_id>/<lang>-<digest>.pdf`` where the
+digest hashes ``certificate_inputs()``. Any change to the title, author
+name, journal name, issue or page range yields a new digest, so stale PDFs
+are never served; older files for the same article/language are removed
+when the new one is written. Another process may remove a file at any time,
+so readers open it directly and render again if it has gone.
+"""
+import hashlib
+import io
+import json
+import os
+import tempfile
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone as dt_timezone
+from pathlib import Path
+
+from django.conf import settings
+
+from .certificate import certificate_inputs, generate_certificate_pdf
+
+
+@dataclass
+class CachedCertificate:
+    file: io.BufferedIOBase
+    etag: str
+    last_modified: datetime
+
+
+def get_cache_dir():
+    return Path(settings.CERTIFICATE_CACHE_DIR)
+
+
+def certificate_digest(data):
+    """Hash of a ``certificate_inputs()`` dict"""
+    payload = json.dumps(data, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode()).hexdigest()[:32]
+
+
+def certificate_path(article_id, lang, digest):
+    return get_cache_dir() / str(article_id) / f"{lang}-{digest}.pdf"
+
+
+def _write_atomic(path, content):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def _remove_stale(path, lang):
+    for old in path.parent.glob(f"{lang}-*.pdf"):
+        if old != path:
+            old.unlink(missing_ok=True)
+
+
+def store_certificate(path, lang, content):
+    """Write rendered PDF bytes to ``path`` and drop older renders it replaces"""
+    _write_atomic(path, content)
+    _remove_stale(path, lang)
+
+
+def read_certificate(path):
+    """Cached PDF bytes at ``path``, or None when there are none"""
+    try:
+        return path.read_bytes()
+    except FileNotFoundError:
+        return None
+
+
+def get_certificate(article, lang='en'):
+    """
+    Return the cached certificate for ``article`` as an open file, rendering
+    it on a miss. The caller closes the file.
+    """
+    digest = certificate_digest(certificate_inputs(article, lang))
+    path = certificate_path(article.id, lang, digest)
+    try:
+        file = path.open('rb')
+        mtime = os.fstat(file.fileno()).st_mtime
+    except FileNotFoundError:
+        content = generate_certificate_pdf(article, lang=lang).getvalue()
+        store_certificate(path, lang, content)
+        # Served from memory: the stored file may already be gone again
+        file, mtime = io.BytesIO(content), time.time()
+    return CachedCertificate(
+        file=file, etag=f'"{digest}"', last_modified=datetime.fromtimestamp(mtime, tz=dt_timezone.utc),
+    )
@@ -0,0 +1,117 @@
+"""
+Streaming ZIP export of every certificate in an issue.
+
+Articles are read one at a time. Certificates already in the on-disk cache
+are written to the archive straight away. The rest are rendered by a process
+pool shared by every export in the web worker, with at most 2x its size in
+flight per export, and each PDF is written as soon as it finishes. Memory stays
+flat however many articles the issue has, and the first bytes go out before
+any render completes.
+"""
+import io
+import threading
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+from .certificate import certificate_inputs, render_certificate
+from .certificate_cache import certificate_digest, certificate_path, read_certificate, store_certificate
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def render_pool():
+    """Process pool shared by all exports, started on first use"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(max_workers=settings.CERTIFICATE_EXPORT_WORKERS)
+        return _pool
+
+
+def _discard_pool(pool):
+    # A crashed worker breaks the pool for good; the next export starts another
+    global _pool
+    with _pool_lock:
+        if _pool is pool:
+            _pool = None
+    pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _ChunkWriter(io.RawIOBase):
+    """Unseekable sink that hands written bytes back to the response generator"""
+
+    def __init__(self):
+        self.chunks = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def pop(self):
+        data = b''.join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def _render(data, lang):
+    return render_certificate(data, lang).getvalue()
+
+
+def _completed_certificates(articles, langs):
+    """Yield (job, pdf_bytes): cached certificates as they are read, renders as they finish"""
+    workers = settings.CERTIFICATE_EXPORT_WORKERS
+    pool = render_pool() if workers > 0 else None
+    pending = {}
+
+    def finished(block):
+        done, _ = wait(pending, return_when=FIRST_COMPLETED, timeout=None if block else 0)
+        for future in done:
+            job = pending.pop(future)
+            content = future.result()
+            store_certificate(job['path'], job['lang'], content)
+            yield job, content
+
+    try:
+        for article in articles:
+            for lang in langs:
+                data = certificate_inputs(article, lang)
+                path = certificate_path(article.id, lang, certificate_digest(data))
+                job = {'article_id': article.id, 'lang': lang, 'data': data, 'path': path}
+                content = read_certificate(path)
+                if content is not None:
+                    yield job, content
+                elif pool is None:
+                    content = _render(data, lang)
+                    store_certificate(path, lang, content)
+                    yield job, content
+                else:
+                    pending[pool.submit(_render, data, lang)] = job
+                    yield from finished(block=len(pending) >= workers * 2)
+        while pending:
+            yield from finished(block=True)
+    except BrokenProcessPool:
+        _discard_pool(pool)
+        raise
+    finally:
+        # The client went away: don't leave its renders queued in the shared pool
+        for future in pending:
+            future.cancel()
+
+
+def stream_certificates_zip(articles, langs):
+    """Generator of ZIP archive bytes with one PDF per article and language"""
+    langs = list(dict.fromkeys(langs))
+    sink = _ChunkWriter()
+    with zipfile.ZipFile(sink, 'w', compression=zipfile.ZIP_STORED) as archive:
+        for job, content in _completed_certificates(articles, langs):
+            # PDFs are already compressed, so entries are stored as-is
+            archive.writestr(f"Certificate_{job['article_id']}_{job['lang']}.pdf", content)
+            yield sink.pop()
+    yield sink.pop()
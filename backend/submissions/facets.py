@@ -0,0 +1,73 @@
+"""
+Facet counts for the public archive.
+
+All facets come from one GROUP BY over (journal, year, language) that is
+rolled up in Python. Results are cached per filter combination under a
+version number that is bumped whenever articles change status, when the
+cache is shared by all workers (``SHARED_CACHE``). A per-process cache
+would only see the bumps made in its own worker, so without one facets are
+computed on every request.
+"""
+import hashlib
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+
+FACET_PARAMS = ('journal', 'issue', 'language', 'year', 'author', 'author_name', 'search')
+VERSION_KEY = 'facets:version'
+TIMEOUT = 60 * 60
+
+
+def invalidate_facets():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+
+
+def cache_key(params):
+    version = cache.get(VERSION_KEY, 0)
+    filters = '&'.join(f'{name}={params[name]}' for name in FACET_PARAMS if params.get(name))
+    digest = hashlib.md5(filters.encode()).hexdigest()
+    return f'facets:{version}:{digest}'
+
+
+def compute_facets(queryset):
+    rows = (
+        queryset.order_by()
+        .values('journal_id', 'journal__name_en', 'issue__year', 'language')
+        .annotate(count=Count('id'))
+    )
+    journals, journal_names = Counter(), {}
+    years, languages = Counter(), Counter()
+    total = 0
+    for row in rows:
+        total += row['count']
+        journals[row['journal_id']] += row['count']
+        journal_names[row['journal_id']] = row['journal__name_en']
+        if row['issue__year'] is not None:
+            years[row['issue__year']] += row['count']
+        languages[row['language']] += row['count']
+
+    return {
+        'total': total,
+        'journals': [
+            {'id': journal_id, 'name': journal_names[journal_id], 'count': count}
+            for journal_id, count in journals.most_common()
+        ],
+        'years': [{'year': year, 'count': years[year]} for year in sorted(years, reverse=True)],
+        'languages': [{'language': lang, 'count': count} for lang, count in languages.most_common()],
+    }
+
+
+def get_facets(queryset, params):
+    if not settings.SHARED_CACHE:
+        return compute_facets(queryset)
+    key = cache_key(params)
+    facets = cache.get(key)
+    if facets is None:
+        facets = compute_facets(queryset)
+        cache.set(key, facets, TIMEOUT)
+    return facets
@@ -0,0 +1,134 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.db import connection, transaction
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from journals.models import Journal, Issue
+from submissions.models import Article
+from users.models import User
+
+STATUSES = ['PUBLISHED'] * 6 + ['SUBMITTED', 'UNDER_REVIEW', 'ACCEPTED', 'REJECTED', 'DRAFT']
+PAGE = ('-created_at', '-id')
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds a large article dataset inside a transaction, prints the query plan and '
+        'latency of each hot Article access path, then rolls everything back. Writes to '
+        'the configured database, so point DATABASE_URL at a scratch copy and pass --i-know'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--articles', type=int, default=50000)
+        parser.add_argument('--authors', type=int, default=2000)
+        parser.add_argument('--journals', type=int, default=10)
+        parser.add_argument('--repeat', type=int, default=20, help='Timed runs per query')
+        parser.add_argument('--compare', action='store_true',
+                            help='Run again with the Article Meta.indexes dropped')
+        parser.add_argument('--no-plans', action='store_true')
+        parser.add_argument('--i-know', action='store_true',
+                            help='Confirm the configured database is a scratch copy')
+
+    def seed(self, options):
+        rng = random.Random(42)
+        now = timezone.now()
+        journals = Journal.objects.bulk_create(
+            Journal(name_en=f'Benchmark Journal {i}', description_en='-', slug=f'benchmark-journal-{i}')
+            for i in range(options['journals'])
+        )
+        issues = Issue.objects.bulk_create(
+            Issue(journal=journal, volume=year - 2014, number=number, year=year, status='PUBLISHED')
+            for journal in journals for year in range(2015, 2026) for number in (1, 2, 3, 4)
+        )
+        authors = User.objects.bulk_create(
+            User(username=f'benchmark-author-{i}', first_name='Author', last_name=str(i))
+            for i in range(options['authors'])
+        )
+
+        def article(i):
+            status = rng.choice(STATUSES)
+            issue = rng.choice(issues) if status == 'PUBLISHED' else None
+            return Article(
+                title=f'Benchmark article {i}', abstract='-',
+                author=rng.choice(authors), journal=issue.journal if issue else rng.choice(journals),
+                issue=issue, status=status, language=rng.choice(['en', 'uz', 'ru']),
+                submitted_at=None if status == 'DRAFT' else now - timedelta(minutes=rng.randrange(10**6)),
+            )
+
+        Article.objects.bulk_create((article(i) for i in range(options['articles'])), batch_size=2000)
+        # created_at is auto_now_add, so spread it out to get realistic ordering
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {Article._meta.db_table} SET created_at = submitted_at WHERE submitted_at IS NOT NULL"
+            )
+            cursor.execute('ANALYZE')
+        return journals[0], issues[len(issues) // 2], authors[0]
+
+    def access_paths(self, journal, issue, author):
+        published = Article.objects.filter(status='PUBLISHED')
+        return [
+            ('public archive', published.order_by(*PAGE)),
+            ('journal archive', published.filter(journal=journal).order_by(*PAGE)),
+            ('issue contents', published.filter(issue=issue).order_by(*PAGE)),
+            ('year filter', published.filter(issue__year=issue.year).order_by(*PAGE)),
+            ("author's submissions", Article.objects.filter(author=author).order_by(*PAGE)),
+            ("author's published", published.filter(author=author).order_by(*PAGE)),
+            ('status queue', Article.objects.filter(status='SUBMITTED').order_by('-submitted_at')),
+            ('admin changelist', Article.objects.order_by('-submitted_at', '-pk')),
+        ]
+
+    def measure(self, paths, options):
+        for label, queryset in paths:
+            page = queryset[:20]
+            list(page.all())  # warm up
+            timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                list(page.all())
+                timings.append((time.perf_counter() - start) * 1000)
+            self.stdout.write(
+                f"  {label:<22} median {statistics.median(timings):8.2f} ms   max {max(timings):8.2f} ms"
+            )
+            if not options['no_plans']:
+                for line in page.explain().splitlines():
+                    self.stdout.write(f"      {line}")
+
+    def handle(self, *args, **options):
+        if not options['i_know']:
+            # The rollback undoes the rows, but while it runs the seed holds
+            # write locks and --compare's DROP INDEX locks the whole table
+            raise CommandError(
+                f"This seeds {options['articles']} articles into {connection.settings_dict['NAME']} "
+                f"({connection.vendor}) and can drop its indexes until it rolls back. Point "
+                f"DATABASE_URL at a scratch copy and pass --i-know."
+            )
+        try:
+            with transaction.atomic():
+                start = time.perf_counter()
+                paths = self.access_paths(*self.seed(options))
+                self.stdout.write(
+                    f"Seeded {options['articles']} articles in {time.perf_counter() - start:.1f}s "
+                    f"({connection.vendor})"
+                )
+                self.stdout.write(self.style.MIGRATE_HEADING('With indexes'))
+                self.measure(paths, options)
+
+                if options['compare']:
+                    # Plain DROP INDEX: SQLite's schema editor can't run inside atomic()
+                    with connection.cursor() as cursor:
+                        for index in Article._meta.indexes:
+                            cursor.execute(f'DROP INDEX {connection.ops.quote_name(index.name)}')
+                        cursor.execute('ANALYZE')
+                    self.stdout.write(self.style.MIGRATE_HEADING('Without Article Meta.indexes'))
+                    self.measure(paths, options)
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Benchmark data rolled back')
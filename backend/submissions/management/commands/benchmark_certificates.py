@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from journals.models import Journal, Issue
+from submissions.certificate import generate_certificate_pdf
+from submissions.models import Article
+from users.models import User
+
+class Command(BaseCommand):
+    help = 'Measures certificate rendering throughput (certificates per second)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--count', type=int, default=200)
+
+    def sample_article(self, i):
+        # Unsaved objects: the benchmark never touches the database
+        journal = Journal(name_en='Central Asian Tech Review', name_uz='Markaziy Osiyo texnika sharhi',
+                          name_ru='Центральноазиатский технический обзор', slug='tech')
+        return Article(
+            id=i,
+            title=f'Irrigation networks and cotton yields in the Fergana valley, part {i}',
+            author=User(username=f'author{i}', first_name='Ali', last_name='Valiyev'),
+            journal=journal,
+            issue=Issue(journal=journal, volume=3, number=2, year=2025),
+            page_range='10-15',
+            created_at=timezone.now(),
+        )
+
+    def handle(self, *args, **options):
+        count = options['count']
+        self.stdout.write(f"Rendering {count} certificates per language")
+        for lang in ['en', 'uz', 'ru']:
+            articles = [self.sample_article(i + 1) for i in range(count)]
+            start = time.perf_counter()
+            for article in articles:
+                generate_certificate_pdf(article, lang=lang)
+            rate = count / (time.perf_counter() - start)
+            self.stdout.write(f"  {lang}: {rate:8.1f} certificates/sec")
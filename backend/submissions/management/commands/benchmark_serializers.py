@@ -0,0 +1,82 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import RequestFactory
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from config.renderers import FastJSONRenderer
+from journals.models import Journal, Issue
+from submissions.models import Article
+from submissions.views import ArticleSerializer, ArticleValuesSerializer
+from users.models import User
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        'Seeds articles inside a transaction and compares list serialization throughput of '
+        'ArticleSerializer vs ArticleValuesSerializer and JSONRenderer vs FastJSONRenderer, '
+        'then rolls everything back'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=1000, help='Rows per serialized list')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per variant')
+
+    def seed(self, rows):
+        journal = Journal.objects.create(name_en='Benchmark Journal', description_en='-', slug='benchmark-serializers')
+        issue = Issue.objects.create(journal=journal, volume=1, number=1, year=2025, status='PUBLISHED')
+        author = User.objects.create(username='benchmark-serializers', first_name='Bench', last_name='Mark')
+        now = timezone.now()
+        Article.objects.bulk_create(
+            (Article(title=f'Benchmark article {i}', abstract='Abstract ' * 40, keywords='a, b, c',
+                     author=author, journal=journal, issue=issue, status='PUBLISHED', submitted_at=now)
+             for i in range(rows)),
+            batch_size=1000,
+        )
+        return Article.objects.filter(journal=journal).order_by('-created_at', '-id')
+
+    def time(self, label, rows, repeat, func):
+        func()  # warm up
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append(time.perf_counter() - start)
+        median = statistics.median(timings)
+        self.stdout.write(f"  {label:<44} median {median * 1000:8.2f} ms   {rows / median:10.0f} rows/s")
+
+    def handle(self, *args, **options):
+        rows, repeat = options['rows'], options['repeat']
+        context = {'request': RequestFactory().get('/api/submissions/')}
+        try:
+            with transaction.atomic():
+                queryset = self.seed(rows)
+                values = ArticleValuesSerializer(context=context)
+                # Same fields on both sides: list responses leave reviews out by default
+                fields = [name for name, _, _ in ArticleValuesSerializer.compile()]
+
+                def model_serializer():
+                    articles = queryset.select_related('author', 'journal', 'issue')
+                    return ArticleSerializer(articles, many=True, context=context, fields=fields).data
+
+                def values_serializer():
+                    return values.to_representation(queryset.values(*values.columns))
+
+                self.stdout.write(self.style.MIGRATE_HEADING(f'Serialization, {rows} rows (query included)'))
+                self.time('ModelSerializer + select_related', rows, repeat, model_serializer)
+                self.time('ValuesSerializer + values()', rows, repeat, values_serializer)
+
+                data = values_serializer()
+                self.stdout.write(self.style.MIGRATE_HEADING('Rendering'))
+                self.time('JSONRenderer', rows, repeat, lambda: JSONRenderer().render(data))
+                self.time('FastJSONRenderer', rows, repeat, lambda: FastJSONRenderer().render(data))
+                raise Rollback
+        except Rollback:
+            self.stdout.write('Benchmark data rolled back')
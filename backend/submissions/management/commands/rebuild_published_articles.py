@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from submissions.models import PublishedArticle
+from submissions.read_model import rebuild_published_articles
+
+class Command(BaseCommand):
+    help = 'Rebuilds the PublishedArticle read table from the article tables'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        rebuild_published_articles(options['database'])
+        count = PublishedArticle.objects.using(options['database']).count()
+        self.stdout.write(self.style.SUCCESS(f'Successfully rebuilt {count} published article rows'))
@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand, CommandError
+from submissions.search import get_search_backend
+
+class Command(BaseCommand):
+    help = 'Rebuilds the full-text search index for all articles'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default='default')
+
+    def handle(self, *args, **options):
+        backend = get_search_backend(options['database'])
+        if backend is None:
+            raise CommandError('No full-text search index is installed for this database.')
+        backend.index_articles()
+        self.stdout.write(self.style.SUCCESS('Successfully rebuilt search index'))
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# The DDL and backfill are frozen here rather than taken from
+# submissions.search, so later changes there cannot alter this migration.
+
+PG_CREATE = [
+    'CREATE TABLE submissions_article_search ('
+    'article_id bigint PRIMARY KEY REFERENCES submissions_article (id) '
+    'ON DELETE CASCADE DEFERRABLE INITIALLY DEFERRED, '
+    'document tsvector NOT NULL)',
+    'CREATE INDEX submissions_article_search_document_gin ON submissions_article_search USING GIN (document)',
+]
+
+PG_CONFIG = (
+    "CASE a.language WHEN 'en' THEN 'english'::regconfig WHEN 'ru' THEN 'russian'::regconfig "
+    "WHEN 'uz' THEN 'simple'::regconfig ELSE 'simple'::regconfig END"
+)
+
+PG_BACKFILL = (
+    'INSERT INTO submissions_article_search (article_id, document) '
+    'SELECT a.id, '
+    f"setweight(to_tsvector({PG_CONFIG}, coalesce(a.title, '')), 'A') || "
+    "setweight(to_tsvector('simple', concat_ws(' ', u.first_name, u.last_name, u.username)), 'A') || "
+    f"setweight(to_tsvector({PG_CONFIG}, coalesce(a.keywords, '')), 'B') || "
+    f"setweight(to_tsvector({PG_CONFIG}, coalesce(a.abstract, '')), 'C') "
+    'FROM submissions_article a INNER JOIN users_user u ON u.id = a.author_id'
+)
+
+SQLITE_CREATE = [
+    'CREATE VIRTUAL TABLE submissions_article_fts USING fts5('
+    "title, abstract, keywords, authors, tokenize = 'porter unicode61 remove_diacritics 2')",
+]
+
+SQLITE_BACKFILL = (
+    'INSERT INTO submissions_article_fts (rowid, title, abstract, keywords, authors) '
+    "SELECT a.id, a.title, a.abstract, a.keywords, u.first_name || ' ' || u.last_name || ' ' || u.username "
+    'FROM submissions_article a INNER JOIN users_user u ON u.id = a.author_id'
+)
+
+SQL = {
+    'postgresql': (PG_CREATE, PG_BACKFILL, 'DROP TABLE IF EXISTS submissions_article_search'),
+    'sqlite': (SQLITE_CREATE, SQLITE_BACKFILL, 'DROP TABLE IF EXISTS submissions_article_fts'),
+}
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor not in SQL:
+        return
+    create, backfill, _ = SQL[schema_editor.connection.vendor]
+    for statement in create:
+        schema_editor.execute(statement)
+    schema_editor.execute(backfill)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor in SQL:
+        schema_editor.execute(SQL[schema_editor.connection.vendor][2])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0005_alter_articlereview_unique_together'),
+        ('users', '0005_user_is_expert'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
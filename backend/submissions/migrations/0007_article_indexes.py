@@ -0,0 +1,36 @@
+# Generated by Django 6.0 on 2026-10-18 03:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0002_issue_file'),
+        ('submissions', '0006_article_search_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(condition=models.Q(('status', 'PUBLISHED')), fields=['-created_at', '-id'], name='article_published_recent_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['journal', 'status', '-created_at', '-id'], name='article_journal_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['author', 'status', '-created_at', '-id'], name='article_author_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['status', '-submitted_at'], name='article_status_submitted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['-submitted_at', '-id'], name='article_submitted_idx'),
+        ),
+    ]
@@ -0,0 +1,86 @@
+# Generated by Django 6.0 on 2026-10-18 03:33
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Frozen copy of submissions.read_model.published_row as of this migration
+    Article = apps.get_model('submissions', 'Article')
+    PublishedArticle = apps.get_model('submissions', 'PublishedArticle')
+    using = schema_editor.connection.alias
+
+    articles = (
+        Article.objects.using(using).filter(status='PUBLISHED')
+        .select_related('author', 'journal', 'issue').order_by('pk')
+    )
+    rows = []
+    for article in articles.iterator(chunk_size=1000):
+        author, journal, issue = article.author, article.journal, article.issue
+        rows.append(PublishedArticle(
+            id=article.id,
+            title=article.title,
+            abstract=article.abstract,
+            keywords=article.keywords,
+            language=article.language,
+            page_count=article.page_count,
+            page_range=article.page_range,
+            manuscript_file=article.manuscript_file.name or '',
+            author_id=author.id,
+            author_name=f"{author.first_name} {author.last_name}".strip() or author.username,
+            author_username=author.username,
+            journal_id=journal.id,
+            journal_name=journal.name_en,
+            journal_slug=journal.slug,
+            issue_id=issue.id if issue else None,
+            issue_volume=issue.volume if issue else None,
+            issue_number=issue.number if issue else None,
+            issue_year=issue.year if issue else None,
+            submitted_at=article.submitted_at,
+            created_at=article.created_at,
+            updated_at=article.updated_at,
+        ))
+    PublishedArticle.objects.using(using).bulk_create(rows, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('journals', '0002_issue_file'),
+        ('submissions', '0007_article_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PublishedArticle',
+            fields=[
+                ('id', models.IntegerField(primary_key=True, serialize=False)),
+                ('title', models.CharField(max_length=500)),
+                ('abstract', models.TextField()),
+                ('keywords', models.CharField(blank=True, max_length=500)),
+                ('language', models.CharField(max_length=10)),
+                ('page_count', models.IntegerField(default=0)),
+                ('page_range', models.CharField(blank=True, max_length=50, null=True)),
+                ('manuscript_file', models.CharField(blank=True, max_length=100)),
+                ('author_name', models.CharField(max_length=301)),
+                ('author_username', models.CharField(max_length=150)),
+                ('journal_name', models.CharField(max_length=255)),
+                ('journal_slug', models.CharField(max_length=50)),
+                ('issue_volume', models.IntegerField(null=True)),
+                ('issue_number', models.IntegerField(null=True)),
+                ('issue_year', models.IntegerField(null=True)),
+                ('submitted_at', models.DateTimeField(null=True)),
+                ('created_at', models.DateTimeField()),
+                ('updated_at', models.DateTimeField()),
+                ('author', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('issue', models.ForeignKey(db_constraint=False, db_index=False, null=True, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='journals.issue')),
+                ('journal', models.ForeignKey(db_constraint=False, db_index=False, on_delete=django.db.models.deletion.DO_NOTHING, related_name='+', to='journals.journal')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['-created_at', '-id'], name='published_recent_idx'), models.Index(fields=['journal', '-created_at', '-id'], name='published_journal_idx'), models.Index(fields=['issue', '-created_at', '-id'], name='published_issue_idx'), models.Index(fields=['author', '-created_at', '-id'], name='published_author_idx'), models.Index(fields=['issue_year', '-created_at', '-id'], name='published_year_idx')],
+            },
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 6.0 on 2026-10-18 05:23
+
+from django.db import migrations, models
+from django.db.models import OuterRef, Subquery
+
+
+def backfill(apps, schema_editor):
+    Article = apps.get_model('submissions', 'Article')
+    PublishedArticle = apps.get_model('submissions', 'PublishedArticle')
+    PublishedArticle.objects.using(schema_editor.connection.alias).update(rejection_reason=Subquery(
+        Article.objects.filter(pk=OuterRef('pk')).values('rejection_reason')[:1]
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('submissions', '0008_published_article'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='publishedarticle',
+            name='rejection_reason',
+            field=models.TextField(blank=True, null=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -1,9 +1,38 @@
 from django.db import models
 from django.contrib.auth import get_user_model
+from django.dispatch import Signal
 from journals.models import Journal, Issue
 
 User = get_user_model()
 
+# Sent with the ids of articles that just became PUBLISHED, both for single
+# saves and for bulk ArticleQuerySet.set_status() updates.
+articles_published = Signal()
+# Sent with the ids of every article a bulk update() or set_status()
+# touched, and the database alias, since those fire no post_save.
+articles_updated = Signal()
+
+class ArticleQuerySet(models.QuerySet):
+    def update(self, **kwargs):
+        ids = list(self.values_list('id', flat=True))
+        updated = super().update(**kwargs)
+        if ids:
+            articles_updated.send(sender=Article, ids=ids, using=self.db)
+        return updated
+
+    def set_status(self, status):
+        """
+        Bulk status update. Unlike a plain update(), it also announces newly
+        published articles through ``articles_published``.
+        """
+        newly_published = []
+        if status == 'PUBLISHED':
+            newly_published = list(self.exclude(status='PUBLISHED').values_list('id', flat=True))
+        updated = self.update(status=status)
+        if newly_published:
+            articles_published.send(sender=Article, ids=newly_published)
+        return updated
+
 class Article(models.Model):
     STATUS_CHOICES = (
         ('DRAFT', 'Draft'),
@@ -34,9 +63,39 @@ class Article(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ArticleQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Public archive: published articles, newest first (the keyset order)
+            models.Index(
+                fields=['-created_at', '-id'], name='article_published_recent_idx',
+                condition=models.Q(status='PUBLISHED'),
+            ),
+            models.Index(fields=['journal', 'status', '-created_at', '-id'], name='article_journal_status_idx'),
+            models.Index(fields=['author', 'status', '-created_at', '-id'], name='article_author_status_idx'),
+            models.Index(fields=['status', '-submitted_at'], name='article_status_submitted_idx'),
+            # Admin changelist ordering and date hierarchy
+            models.Index(fields=['-submitted_at', '-id'], name='article_submitted_idx'),
+        ]
+
     def __str__(self):
         return f"{self.title} ({self.status})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so saves can detect publication
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        # post_save has seen the change; later saves compare against this one
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or 'status' in update_fields:
+            self._loaded_status = self.status
+
 class ArticleReview(models.Model):
     article = models.ForeignKey(Article, on_delete=models.CASCADE, related_name='reviews')
     expert = models.ForeignKey(User, on_delete=models.CASCADE, related_name='expert_reviews')
@@ -49,3 +108,49 @@ class ArticleReview(models.Model):
 
     def __str__(self):
         return f"Review for {self.article.title} by {self.expert.username}"
+
+
+class PublishedArticle(models.Model):
+    """
+    Denormalized, read-only copy of each published article with its author,
+    journal and issue fields flattened in. Public listings read flat rows from
+    here without joins. Kept in sync by submissions.read_model; never edit
+    directly.
+    """
+    id = models.IntegerField(primary_key=True)  # Article.id
+    title = models.CharField(max_length=500)
+    abstract = models.TextField()
+    keywords = models.CharField(max_length=500, blank=True)
+    language = models.CharField(max_length=10)
+    page_count = models.IntegerField(default=0)
+    page_range = models.CharField(max_length=50, blank=True, null=True)
+    manuscript_file = models.CharField(max_length=100, blank=True)
+    rejection_reason = models.TextField(blank=True, null=True)
+
+    # Plain columns rather than constraints: rows are rewritten on every change
+    author = models.ForeignKey(User, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+')
+    author_name = models.CharField(max_length=301)
+    author_username = models.CharField(max_length=150)
+    journal = models.ForeignKey(Journal, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, related_name='+')
+    journal_name = models.CharField(max_length=255)
+    journal_slug = models.CharField(max_length=50)
+    issue = models.ForeignKey(Issue, on_delete=models.DO_NOTHING, db_constraint=False, db_index=False, null=True, related_name='+')
+    issue_volume = models.IntegerField(null=True)
+    issue_number = models.IntegerField(null=True)
+    issue_year = models.IntegerField(null=True)
+
+    submitted_at = models.DateTimeField(null=True)
+    created_at = models.DateTimeField()
+    updated_at = models.DateTimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='published_recent_idx'),
+            models.Index(fields=['journal', '-created_at', '-id'], name='published_journal_idx'),
+            models.Index(fields=['issue', '-created_at', '-id'], name='published_issue_idx'),
+            models.Index(fields=['author', '-created_at', '-id'], name='published_author_idx'),
+            models.Index(fields=['issue_year', '-created_at', '-id'], name='published_year_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
@@ -0,0 +1,91 @@
+"""
+Incremental maintenance of the PublishedArticle read table.
+
+Rows are upserted from the normalized tables whenever an article, its
+author, journal or issue changes, and dropped once an article is no longer
+published. Public listings then serve flat ``values()`` rows from it.
+"""
+from itertools import islice
+
+from django.db import DEFAULT_DB_ALIAS
+
+from config.cache import touch_catalog
+from .models import Article, PublishedArticle
+
+BATCH_SIZE = 1000
+
+
+def published_row(article):
+    """
+    Read-table values for one article. Uses fields only, no model methods,
+    so it also works with the historical models in migrations.
+    """
+    author, journal, issue = article.author, article.journal, article.issue
+    return {
+        'id': article.id,
+        'title': article.title,
+        'abstract': article.abstract,
+        'keywords': article.keywords,
+        'language': article.language,
+        'page_count': article.page_count,
+        'page_range': article.page_range,
+        'manuscript_file': article.manuscript_file.name or '',
+        'rejection_reason': article.rejection_reason,
+        'author_id': author.id,
+        'author_name': f"{author.first_name} {author.last_name}".strip() or author.username,
+        'author_username': author.username,
+        'journal_id': journal.id,
+        'journal_name': journal.name_en,
+        'journal_slug': journal.slug,
+        'issue_id': issue.id if issue else None,
+        'issue_volume': issue.volume if issue else None,
+        'issue_number': issue.number if issue else None,
+        'issue_year': issue.year if issue else None,
+        'submitted_at': article.submitted_at,
+        'created_at': article.created_at,
+        'updated_at': article.updated_at,
+    }
+
+
+def sync_published_articles(article_model, read_model, ids=None, using=DEFAULT_DB_ALIAS):
+    """
+    Upsert read rows for the published articles among ``ids`` (all articles
+    if None) and delete rows whose article is no longer published.
+    """
+    articles = (
+        article_model._default_manager.using(using)
+        .filter(status='PUBLISHED')
+        .select_related('author', 'journal', 'issue')
+        .order_by('pk')
+    )
+    manager = read_model._default_manager.db_manager(using)
+    rows = manager.all()
+    if ids is not None:
+        ids = list(ids)
+        if not ids:
+            return
+        articles = articles.filter(pk__in=ids)
+        rows = rows.filter(pk__in=ids)
+
+    published = articles.values_list('pk', flat=True)
+    rows.exclude(pk__in=published).delete()
+
+    update_fields = [field.name for field in read_model._meta.concrete_fields if not field.primary_key]
+    iterator = articles.iterator(chunk_size=BATCH_SIZE)
+    while batch := list(islice(iterator, BATCH_SIZE)):
+        manager.bulk_create(
+            [read_model(**published_row(article)) for article in batch],
+            update_conflicts=True,
+            unique_fields=['id'],
+            update_fields=update_fields,
+        )
+
+
+def refresh_published_articles(ids, using=DEFAULT_DB_ALIAS):
+    sync_published_articles(Article, PublishedArticle, ids, using)
+    touch_catalog('articles')
+
+
+def rebuild_published_articles(using=DEFAULT_DB_ALIAS):
+    sync_published_articles(Article, PublishedArticle, None, using)
+    touch_catalog('articles')
@@ -0,0 +1,209 @@
+"""
+Full-text search over articles.
+
+PostgreSQL keeps a weighted tsvector per article in ``submissions_article_search``
+(GIN indexed), built with the text search configuration that matches
+``Article.language``. SQLite keeps the same fields in an FTS5 table whose
+porter tokenizer stems English only; Russian and Uzbek words match by prefix
+alone, so "журнал" finds "журналов" but not every inflection. Rows are
+refreshed from ``submissions.signals`` whenever an article or its author is
+saved or articles are bulk-updated, and can be rebuilt with
+``manage.py rebuild_search_index``.
+"""
+import re
+from abc import ABC, abstractmethod
+
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.models import FloatField
+from django.db.models.expressions import RawSQL
+from rest_framework import filters
+
+from .models import Article
+
+User = get_user_model()
+
+PG_TABLE = 'submissions_article_search'
+FTS_TABLE = 'submissions_article_fts'
+
+# Uzbek has no snowball stemmer in PostgreSQL, so it falls back to 'simple'
+PG_CONFIGS = {'en': 'english', 'ru': 'russian', 'uz': 'simple'}
+
+# bm25 column weights for the FTS5 table: title, abstract, keywords, authors
+FTS_WEIGHTS = (10.0, 2.0, 5.0, 8.0)
+
+_available = {}
+
+
+class SearchBackend(ABC):
+    table = None
+
+    def __init__(self, connection):
+        self.connection = connection
+
+    def is_available(self):
+        key = (self.connection.alias, self.connection.settings_dict['NAME'])
+        if key not in _available:
+            with self.connection.cursor() as cursor:
+                tables = self.connection.introspection.table_names(cursor)
+            _available[key] = self.table in tables
+        return _available[key]
+
+    @abstractmethod
+    def index_articles(self, ids=None):
+        """(Re)build index rows for the given article ids, or for all articles"""
+
+    def remove_articles(self, ids):
+        if not ids:
+            return
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'DELETE FROM {self.table} WHERE {self.key_column} IN ({self._placeholders(ids)})',
+                list(ids),
+            )
+
+    @abstractmethod
+    def search(self, queryset, query):
+        """
+        Restrict ``queryset`` to matches and annotate ``search_rank`` (higher
+        is better). Works on Article and PublishedArticle, which share ids.
+        """
+
+    def _placeholders(self, ids):
+        return ', '.join(['%s'] * len(ids))
+
+    def _source_sql(self, ids):
+        """SELECT over articles joined to their authors, optionally limited to ``ids``"""
+        where = f'WHERE a.id IN ({self._placeholders(ids)})' if ids is not None else ''
+        return (
+            f'FROM {Article._meta.db_table} a '
+            f'INNER JOIN {User._meta.db_table} u ON u.id = a.author_id {where}'
+        )
+
+
+class PostgresSearchBackend(SearchBackend):
+    table = PG_TABLE
+    key_column = 'article_id'
+
+    def index_articles(self, ids=None):
+        if ids is not None and not ids:
+            return
+        config = 'CASE a.language ' + ' '.join(
+            f"WHEN '{lang}' THEN '{cfg}'::regconfig" for lang, cfg in PG_CONFIGS.items()
+        ) + " ELSE 'simple'::regconfig END"
+        document = (
+            f"setweight(to_tsvector({config}, coalesce(a.title, '')), 'A') || "
+            f"setweight(to_tsvector('simple', concat_ws(' ', u.first_name, u.last_name, u.username)), 'A') || "
+            f"setweight(to_tsvector({config}, coalesce(a.keywords, '')), 'B') || "
+            f"setweight(to_tsvector({config}, coalesce(a.abstract, '')), 'C')"
+        )
+        with self.connection.cursor() as cursor:
+            cursor.execute(
+                f'INSERT INTO {self.table} (article_id, document) '
+                f'SELECT a.id, {document} {self._source_sql(ids)} '
+                f'ON CONFLICT (article_id) DO UPDATE SET document = EXCLUDED.document',
+                list(ids or []),
+            )
+
+    def _tsquery(self):
+        # The query language is unknown, so match it under every configuration
+        return ' || '.join(
+            f"websearch_to_tsquery('{cfg}', %s)" for cfg in sorted(set(PG_CONFIGS.values()))
+        )
+
+    def search(self, queryset, query):
+        tsquery = self._tsquery()
+        params = [query] * tsquery.count('%s')
+        matches = RawSQL(f'SELECT article_id FROM {self.table} WHERE document @@ ({tsquery})', params)
+        rank = RawSQL(
+            f'SELECT ts_rank_cd(s.document, {tsquery}) FROM {self.table} s '
+            f'WHERE s.article_id = {queryset.model._meta.db_table}.id',
+            params,
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank)
+
+
+class SQLiteSearchBackend(SearchBackend):
+    table = FTS_TABLE
+    key_column = 'rowid'
+
+    def index_articles(self, ids=None):
+        if ids is not None and not ids:
+            return
+        params = list(ids or [])
+        with self.connection.cursor() as cursor:
+            if ids is None:
+                cursor.execute(f'DELETE FROM {self.table}')
+            else:
+                cursor.execute(f'DELETE FROM {self.table} WHERE rowid IN ({self._placeholders(ids)})', params)
+            cursor.execute(
+                f'INSERT INTO {self.table} (rowid, title, abstract, keywords, authors) '
+                f"SELECT a.id, a.title, a.abstract, a.keywords, "
+                f"u.first_name || ' ' || u.last_name || ' ' || u.username {self._source_sql(ids)}",
+                params,
+            )
+
+    def _match_expression(self, query):
+        # Quote every term so user input can't inject FTS5 syntax, and match
+        # prefixes: the porter stemmer only knows English, so this is all
+        # ru/uz inflections get.
+        terms = re.findall(r'\w+', query)
+        return ' '.join(f'"{term}"*' for term in terms)
+
+    def search(self, queryset, query):
+        expression = self._match_expression(query)
+        if not expression:
+            return queryset
+        weights = ', '.join(str(w) for w in FTS_WEIGHTS)
+        matches = RawSQL(f'SELECT rowid FROM {self.table} WHERE {self.table} MATCH %s', [expression])
+        rank = RawSQL(
+            f'SELECT -bm25({self.table}, {weights}) FROM {self.table} '
+            f'WHERE {self.table} MATCH %s AND rowid = {queryset.model._meta.db_table}.id',
+            [expression],
+            output_field=FloatField(),
+        )
+        return queryset.filter(id__in=matches).annotate(search_rank=rank)
+
+
+BACKENDS = {
+    'postgresql': PostgresSearchBackend,
+    'sqlite': SQLiteSearchBackend,
+}
+
+
+def get_search_backend(using='default'):
+    """Full-text backend for the given database alias, or None if it has no index"""
+    connection = connections[using]
+    backend_class = BACKENDS.get(connection.vendor)
+    if backend_class is None:
+        return None
+    backend = backend_class(connection)
+    return backend if backend.is_available() else None
+
+
+class FullTextSearchFilter(filters.SearchFilter):
+    """
+    ``?search=`` backed by the full-text index and ordered by relevance.
+    Falls back to DRF's ``icontains`` search over ``search_fields`` when the
+    database has no index.
+    """
+
+    def get_query(self, request):
+        return request.query_params.get(self.search_param, '').strip()
+
+    def filter_queryset(self, request, queryset, view):
+        query = self.get_query(request)
+        if not query:
+            return queryset
+        backend = get_search_backend(queryset.db)
+        if backend is None:
+            return super().filter_queryset(request, queryset, view)
+        return backend.search(queryset, query)
+
+    def get_ordering(self, request, queryset, view):
+        """Lets cursor pagination page through ranked results"""
+        ordering = tuple(view.pagination_class.ordering)
+        if 'search_rank' in queryset.query.annotations:
+            return ('-search_rank',) + ordering
+        return ordering
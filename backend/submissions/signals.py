@@ -0,0 +1,126 @@
+import logging
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from config.cache import touch_catalog
+from journals.models import Journal, Issue
+from .autocomplete import autocomplete_index
+from .facets import invalidate_facets
+from .models import Article, ArticleReview, PublishedArticle, articles_published, articles_updated
+from .read_model import refresh_published_articles
+from .search import get_search_backend
+from .tasks import prerender_certificates
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=Article)
+def index_article(sender, instance, using, **kwargs):
+    backend = get_search_backend(using)
+    if backend:
+        backend.index_articles([instance.pk])
+    refresh_published_articles([instance.pk], using)
+    autocomplete_index.article_changed(instance)
+    invalidate_facets()
+
+
+@receiver(post_save, sender=Article)
+def detect_publication(sender, instance, **kwargs):
+    if instance.status == 'PUBLISHED' and getattr(instance, '_loaded_status', None) != 'PUBLISHED':
+        articles_published.send(sender=Article, ids=[instance.pk])
+
+
+@receiver(articles_published)
+def enqueue_certificate_prerender(sender, ids, **kwargs):
+    if settings.CELERY_TASK_ALWAYS_EAGER:
+        # Without a broker the renders would run inside the publishing
+        # request; the download view renders on a miss instead
+        return
+
+    def enqueue():
+        for article_id in ids:
+            try:
+                prerender_certificates.delay(article_id)
+            except Exception:
+                # A broker outage must not fail the publish itself
+                logger.exception("Could not enqueue certificate prerender for article %s", article_id)
+
+    transaction.on_commit(enqueue)
+
+
+@receiver(post_delete, sender=Article)
+def unindex_article(sender, instance, using, **kwargs):
+    backend = get_search_backend(using)
+    if backend:
+        backend.remove_articles([instance.pk])
+    refresh_published_articles([instance.pk], using)
+    autocomplete_index.article_changed(instance, deleted=True)
+    invalidate_facets()
+
+
+@receiver(articles_updated)
+def bulk_articles_updated(sender, ids, using, **kwargs):
+    backend = get_search_backend(using)
+    if backend:
+        backend.index_articles(ids)
+    refresh_published_articles(ids, using)
+    autocomplete_index.invalidate()
+    invalidate_facets()
+
+
+@receiver(post_save, sender=Journal)
+@receiver(post_delete, sender=Journal)
+def journal_changed(sender, instance, using, **kwargs):
+    # Deleting a journal cascades to its articles, which clean up after themselves
+    if kwargs['signal'] is post_save:
+        refresh_published_articles(instance.articles.using(using).values_list('id', flat=True), using)
+    autocomplete_index.invalidate()
+    invalidate_facets()
+    touch_catalog('journals')
+
+
+@receiver(post_save, sender=Issue)
+def issue_saved(sender, instance, using, created, **kwargs):
+    if not created:
+        refresh_published_articles(instance.articles.using(using).values_list('id', flat=True), using)
+    touch_catalog('issues')
+
+
+@receiver(post_delete, sender=Issue)
+def issue_deleted(sender, instance, using, **kwargs):
+    # Articles are detached with a bulk SET NULL, so find them via the read table
+    rows = PublishedArticle.objects.using(using).filter(issue_id=instance.pk)
+    refresh_published_articles(rows.values_list('id', flat=True), using)
+    invalidate_facets()
+    touch_catalog('issues')
+
+
+@receiver(post_save, sender=ArticleReview)
+@receiver(post_delete, sender=ArticleReview)
+def review_changed(sender, **kwargs):
+    # Reviews are nested in published listings with ?expand=reviews
+    touch_catalog('articles')
+
+
+AUTHOR_FIELDS = {'first_name', 'last_name', 'username'}
+
+
+@receiver(post_save, sender=User)
+def reindex_author_articles(sender, instance, using, created, update_fields, **kwargs):
+    # Author names are part of the search document; logins only touch last_login
+    if created or (update_fields and not AUTHOR_FIELDS & set(update_fields)):
+        return
+    ids = list(Article.objects.using(using).filter(author=instance).values_list('id', flat=True))
+    backend = get_search_backend(using)
+    if backend:
+        backend.index_articles(ids)
+    refresh_published_articles(ids, using)
+    if ids:
+        # Author names are suggestions too
+        autocomplete_index.invalidate()
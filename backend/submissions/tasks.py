@@ -0,0 +1,30 @@
+import logging
+
+from celery import shared_task
+from django.conf import settings
+
+from .certificate_cache import get_certificate
+from .models import Article
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task
+def prerender_certificates(article_id, langs=None):
+    """
+    Render and cache the certificates of a newly published article so the
+    first download is served straight from disk.
+    """
+    article = (
+        Article.objects.select_related('author', 'journal', 'issue')
+        .filter(pk=article_id, status='PUBLISHED')
+        .first()
+    )
+    if article is None:
+        return
+    for lang in langs or settings.CERTIFICATE_PRERENDER_LANGS:
+        try:
+            get_certificate(article, lang).file.close()
+        except Exception:
+            # The download view renders on a miss, so one failure isn't fatal
+            logger.exception("Failed to prerender %s certificate for article %s", lang, article_id)
@@ -1,3 +1,709 @@
-from django.test import TestCase
+import json
+import re
+import shutil
+import tempfile
+import threading
+from io import StringIO
+from decimal import Decimal
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APITestCase, APITransactionTestCase
+
+from billing.models import WalletTransaction
+from journals.models import Journal, Issue
+from . import certificate_cache
+from .autocomplete import autocomplete_index
+from .certificate import certificate_inputs, generate_certificate_pdf, get_font_name
+from .read_model import rebuild_published_articles
+from .tasks import prerender_certificates
+from .models import Article, ArticleReview, PublishedArticle
+from .verification import make_certificate_id
+from .views import ArticleSerializer
+
+User = get_user_model()
+
+
+class SubmissionTestMixin:
+    """Shared fixtures for submission API tests"""
+
+    def setUp(self):
+        self.author = User.objects.create_user(username='author', password='pass', first_name='Ali', last_name='Valiyev')
+        self.expert = User.objects.create_user(username='expert', password='pass', is_expert=True)
+        self.journal = Journal.objects.create(name_en='Tech Review', description_en='Tech', slug='tech-review')
+        self.issue = Issue.objects.create(journal=self.journal, volume=1, number=1, year=2025, status='PUBLISHED')
+
+    def make_articles(self, count, **kwargs):
+        articles = []
+        for i in range(count):
+            fields = {
+                'title': f'Article {i}',
+                'abstract': 'Abstract',
+                'author': self.author,
+                'journal': self.journal,
+                'issue': self.issue,
+                'status': 'PUBLISHED',
+                'submitted_at': timezone.now(),
+            }
+            fields.update(kwargs)
+            article = Article.objects.create(**fields)
+            ArticleReview.objects.create(article=article, expert=self.expert, critique='Solid work')
+            articles.append(article)
+        return articles
+
+
+@override_settings(QUERY_BUDGET_STRICT=True)
+class SubmissionQueryBudgetTests(SubmissionTestMixin, APITestCase):
+    def test_list_query_count_is_independent_of_size(self):
+        self.make_articles(2)
+        self.client.force_authenticate(self.author)
+        with self.assertNumQueries(2):
+            self.client.get('/api/submissions/', {'expand': 'reviews'})
+
+        self.make_articles(20)
+        with self.assertNumQueries(2):
+            response = self.client.get('/api/submissions/', {'expand': 'reviews'})
+        self.assertEqual(response.status_code, 200)
+
+    def test_retrieve_within_budget(self):
+        article = self.make_articles(1)[0]
+        self.client.force_authenticate(self.author)
+        response = self.client.get(f'/api/submissions/{article.id}/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['reviews'][0]['expert_name'], 'expert')
+
+    def test_withdraw_within_budget(self):
+        article = self.make_articles(1, status='SUBMITTED')[0]
+        self.client.force_authenticate(self.author)
+        response = self.client.post(f'/api/submissions/{article.id}/withdraw/')
+        self.assertEqual(response.status_code, 200)
+        article.refresh_from_db()
+        self.assertEqual(article.status, 'WITHDRAWN')
+
+    def test_facets_within_budget(self):
+        self.make_articles(3)
+        for shared in (False, True):
+            with self.subTest(shared=shared), override_settings(SHARED_CACHE=shared):
+                cache.clear()
+                response = self.client.get('/api/submissions/facets/', {'language': 'en'})
+                self.assertEqual(response.status_code, 200)
+
+    def test_certificate_within_budget(self):
+        article = self.make_articles(1)[0]
+        cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, cache_dir, ignore_errors=True)
+        with override_settings(CERTIFICATE_CACHE_DIR=cache_dir):
+            for _ in range(2):
+                response = self.client.get(f'/api/submissions/{article.id}/certificate/')
+                self.assertEqual(response.status_code, 200)
+
+
+class SubmissionPaginationTests(SubmissionTestMixin, APITestCase):
+    def test_cursor_walks_archive_without_overlap(self):
+        self.make_articles(25)
+        response = self.client.get('/api/submissions/', {'status': 'PUBLISHED', 'page_size': 10})
+        seen = [a['id'] for a in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen.extend(a['id'] for a in response.data['results'])
+
+        self.assertEqual(len(seen), 25)
+        self.assertEqual(len(set(seen)), 25)
+        self.assertEqual(seen, sorted(seen, reverse=True))
+
+
+class SubmissionSearchTests(SubmissionTestMixin, APITestCase):
+    def search(self, query, **params):
+        response = self.client.get('/api/submissions/', {'status': 'PUBLISHED', 'search': query, **params})
+        self.assertEqual(response.status_code, 200)
+        return [a['id'] for a in response.data['results']]
+
+    def test_stemmed_match_ranks_title_above_abstract(self):
+        in_abstract = self.make_articles(1, title='Soil study', abstract='Irrigation networks in deserts')[0]
+        in_title = self.make_articles(1, title='Irrigating cotton fields', abstract='Water use')[0]
+        self.make_articles(1, title='Unrelated', abstract='Nothing here')
+
+        self.assertEqual(self.search('irrigation'), [in_title.id, in_abstract.id])
+
+    def test_matches_author_and_cyrillic_prefix(self):
+        article = self.make_articles(1, title='Развитие журналов', language='ru')[0]
+        self.assertEqual(self.search('журнал'), [article.id])
+        self.assertEqual(self.search('valiyev'), [article.id])
+
+    def test_index_follows_edits_and_author_renames(self):
+        article = self.make_articles(1, title='Old title')[0]
+        article.title = 'Brand new heading'
+        article.save()
+        self.assertEqual(self.search('heading'), [article.id])
+        self.assertEqual(self.search('old'), [])
+
+        self.author.last_name = 'Karimov'
+        self.author.save()
+        self.assertEqual(self.search('karimov'), [article.id])
+
+    def test_index_follows_bulk_updates(self):
+        article = self.make_articles(1, title='Old title')[0]
+        Article.objects.filter(pk=article.pk).update(title='Brand new heading')
+        self.assertEqual(self.search('heading'), [article.id])
+        self.assertEqual(self.search('old'), [])
+
+    def test_ranked_results_paginate(self):
+        self.make_articles(7, title='Cotton yields')
+        seen = []
+        response = self.client.get('/api/submissions/', {'status': 'PUBLISHED', 'search': 'cotton', 'page_size': 3})
+        while True:
+            seen.extend(a['id'] for a in response.data['results'])
+            if not response.data['next']:
+                break
+            response = self.client.get(response.data['next'])
+        self.assertEqual(len(set(seen)), 7)
+
+
+class AutocompleteTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        autocomplete_index.rebuild()
+
+    def suggest(self, q):
+        response = self.client.get('/api/submissions/autocomplete/', {'q': q})
+        self.assertEqual(response.status_code, 200)
+        return {(s['type'], s['text']) for s in response.data}
+
+    def test_prefix_matches_any_word_of_published_content(self):
+        self.make_articles(1, title='Irrigating cotton fields', keywords='water, Cotton yield')
+        self.make_articles(1, title='Cotton draft', status='DRAFT')
+
+        self.assertEqual(self.suggest('cot'), {('title', 'Irrigating cotton fields'), ('keyword', 'Cotton yield')})
+        self.assertIn(('author', 'Ali Valiyev'), self.suggest('vali'))
+        self.assertIn(('journal', 'Tech Review'), self.suggest('tech'))
+
+    def test_lookups_hit_memory_and_follow_publication(self):
+        self.make_articles(1, title='Wheat genetics')
+        self.suggest('wheat')
+        with self.assertNumQueries(0):
+            self.assertEqual(self.suggest('whe'), {('title', 'Wheat genetics')})
+
+        draft = self.make_articles(1, title='Wheat markets', status='DRAFT')[0]
+        draft.status = 'PUBLISHED'
+        draft.save()
+        with self.assertNumQueries(0):
+            self.assertIn(('title', 'Wheat markets'), self.suggest('wheat m'))
+
+    def test_limit_is_clamped(self):
+        self.make_articles(3, title='Cotton yields')
+        for limit, count in (('-5', 1), ('0', 1), ('2', 2), ('many', 3)):
+            response = self.client.get('/api/submissions/autocomplete/', {'q': 'cotton', 'limit': limit})
+            self.assertEqual(len(response.data), count)
+
+
+class AutocompleteRefreshTests(SubmissionTestMixin, APITransactionTestCase):
+    """Rebuilds run in a background thread, so the changes must be committed"""
+
+    def setUp(self):
+        super().setUp()
+        self.make_articles(1, title='Wheat genetics')
+        autocomplete_index.rebuild()
+
+    def suggest(self, q):
+        return {(s['type'], s['text']) for s in self.client.get('/api/submissions/autocomplete/', {'q': q}).data}
+
+    def wait_for_refresh(self):
+        with autocomplete_index._refreshing:
+            pass
+
+    def test_author_rename_is_served_from_the_old_snapshot_until_rebuilt(self):
+        self.author.last_name = 'Karimov'
+        self.author.save()
+        with self.assertNumQueries(0):
+            self.assertIn(('author', 'Ali Valiyev'), self.suggest('vali'))
+        self.wait_for_refresh()
+
+        self.assertNotIn(('author', 'Ali Valiyev'), self.suggest('vali'))
+        self.assertIn(('author', 'Ali Karimov'), self.suggest('kari'))
+
+    def test_one_rebuild_at_a_time(self):
+        release = threading.Event()
+        builds = []
+
+        def slow_rebuild():
+            builds.append(1)
+            release.wait(5)
+
+        # Any committed change marks the index stale
+        Journal.objects.create(name_en='Wheat Letters', description_en='Wheat', slug='wheat-letters')
+        with mock.patch.object(autocomplete_index, 'rebuild', side_effect=slow_rebuild):
+            for _ in range(5):
+                self.assertEqual(self.suggest('wheat'), {('title', 'Wheat genetics')})
+            release.set()
+            self.wait_for_refresh()
+        self.assertEqual(len(builds), 1)
+
+
+@override_settings(SHARED_CACHE=True)
+class FacetTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        other = Journal.objects.create(name_en='Medicine', description_en='Med', slug='medicine')
+        old_issue = Issue.objects.create(journal=other, volume=1, number=1, year=2023)
+        self.make_articles(3, language='en')
+        self.make_articles(2, language='ru', journal=other, issue=old_issue, title='Clinical trial')
+        self.make_articles(1, status='DRAFT')
+
+    def test_counts_all_facets_in_one_query_and_caches(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/submissions/facets/')
+        self.assertEqual(response.data['total'], 5)
+        self.assertEqual([j['count'] for j in response.data['journals']], [3, 2])
+        self.assertEqual(response.data['years'], [{'year': 2025, 'count': 3}, {'year': 2023, 'count': 2}])
+        self.assertEqual(response.data['languages'], [{'language': 'en', 'count': 3}, {'language': 'ru', 'count': 2}])
+
+        with self.assertNumQueries(0):
+            self.client.get('/api/submissions/facets/')
+
+    def test_respects_filters_and_search(self):
+        response = self.client.get('/api/submissions/facets/', {'language': 'ru'})
+        self.assertEqual(response.data['total'], 2)
+        response = self.client.get('/api/submissions/facets/', {'search': 'clinical'})
+        self.assertEqual(response.data['total'], 2)
+        self.assertEqual(response.data['years'], [{'year': 2023, 'count': 2}])
+
+    def test_numeric_filters_are_validated(self):
+        response = self.client.get('/api/submissions/facets/', {'year': '2023'})
+        self.assertEqual(response.data['total'], 2)
+        for url in ('/api/submissions/facets/', '/api/submissions/'):
+            for name in ('year', 'journal', 'issue', 'author'):
+                response = self.client.get(url, {name: 'abc'})
+                self.assertEqual(response.status_code, 400)
+                self.assertIn(name, response.data)
+
+    def test_publishing_invalidates(self):
+        self.client.get('/api/submissions/facets/')
+        draft = Article.objects.get(status='DRAFT')
+        draft.status = 'PUBLISHED'
+        draft.save()
+        response = self.client.get('/api/submissions/facets/')
+        self.assertEqual(response.data['total'], 6)
+
+
+class CertificateRenderTests(SubmissionTestMixin, TestCase):
+    def embedded_fonts(self, pdf):
+        # Embedded TrueType subsets are named like AAAAAA+DejaVuSans
+        return {name.split(b'+')[1].decode() for name in re.findall(rb'/BaseFont /(\w{6}\+[\w-]+)', pdf)}
+
+    def test_every_language_embeds_the_bundled_font(self):
+        article = self.make_articles(1, title='Развитие журналов')[0]
+        for lang in ('en', 'uz', 'ru'):
+            with self.subTest(lang=lang):
+                pdf = generate_certificate_pdf(article, lang).getvalue()
+                self.assertTrue(pdf.startswith(b'%PDF'))
+                self.assertEqual(self.embedded_fonts(pdf), {'DejaVuSans'})
+
+    def test_missing_font_falls_back_with_a_warning(self):
+        get_font_name.cache_clear()
+        self.addCleanup(get_font_name.cache_clear)
+        with override_settings(CERTIFICATE_FONT_PATH='/nonexistent/font.ttf'), \
+                self.assertLogs('submissions.certificate', 'WARNING'):
+            self.assertEqual(get_font_name(), 'Helvetica')
+
+
+class CertificateCacheTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        override = override_settings(CERTIFICATE_CACHE_DIR=self.cache_dir)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.article = self.make_articles(1, page_range='10-15')[0]
+        self.url = f'/api/submissions/{self.article.id}/certificate/'
+
+    def cached_files(self):
+        return sorted(p.name for p in (Path(self.cache_dir) / str(self.article.id)).glob('*.pdf'))
+
+    def test_renders_once_and_answers_conditional_gets(self):
+        response = self.client.get(self.url, {'lang': 'uz'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+        etag = response['ETag']
+
+        with mock.patch('submissions.certificate_cache.generate_certificate_pdf') as render:
+            response = self.client.get(self.url, {'lang': 'uz'}, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 304)
+            response = self.client.get(self.url, {'lang': 'uz'})
+            self.assertEqual(response.status_code, 200)
+            render.assert_not_called()
+
+    def test_file_removed_by_another_process_is_rendered_again(self):
+        self.client.get(self.url)
+        for path in (Path(self.cache_dir) / str(self.article.id)).glob('*.pdf'):
+            path.unlink()
+
+        # The fresh render is removed again before it can be reopened
+        store = certificate_cache.store_certificate
+
+        def store_and_lose(path, lang, content):
+            store(path, lang, content)
+            path.unlink()
+
+        with mock.patch('submissions.certificate_cache.store_certificate', side_effect=store_and_lose):
+            response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(b''.join(response.streaming_content).startswith(b'%PDF'))
+        self.assertEqual(self.cached_files(), [])
+
+    def test_input_change_rerenders_and_drops_stale_file(self):
+        etag = self.client.get(self.url)['ETag']
+        self.article.page_range = '10-16'
+        self.article.save()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(len(self.cached_files()), 1)
+
+
+class CertificatePrerenderTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.cache_dir, ignore_errors=True)
+        override = override_settings(
+            CERTIFICATE_CACHE_DIR=self.cache_dir, CERTIFICATE_PRERENDER_LANGS=('en', 'ru'), CELERY_TASK_ALWAYS_EAGER=False,
+        )
+        override.enable()
+        self.addCleanup(override.disable)
+        # Stands in for a worker behind a real broker
+        worker = mock.patch('submissions.signals.prerender_certificates.delay', side_effect=prerender_certificates)
+        self.enqueued = worker.start()
+        self.addCleanup(worker.stop)
+        self.articles = self.make_articles(2, status='ACCEPTED')
+
+    def cached_langs(self, article):
+        return sorted(p.name.split('-')[0] for p in (Path(self.cache_dir) / str(article.id)).glob('*.pdf'))
+
+    def test_single_publish_prerenders_after_commit(self):
+        article = Article.objects.get(pk=self.articles[0].pk)
+        with self.captureOnCommitCallbacks(execute=True):
+            article.status = 'PUBLISHED'
+            article.save()
+        self.enqueued.assert_called_once_with(article.pk)
+        self.assertEqual(self.cached_langs(article), ['en', 'ru'])
+
+        # Saving an already published article does not enqueue again
+        self.enqueued.reset_mock()
+        with self.captureOnCommitCallbacks(execute=True):
+            article.save()
+        self.enqueued.assert_not_called()
+
+        # Unpublished and published again on the same instance
+        article.status = 'ACCEPTED'
+        article.save()
+        with self.captureOnCommitCallbacks(execute=True):
+            article.status = 'PUBLISHED'
+            article.save()
+        self.enqueued.assert_called_once_with(article.pk)
+
+    @override_settings(CELERY_TASK_ALWAYS_EAGER=True)
+    def test_skipped_without_a_broker(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.set_status('PUBLISHED')
+        self.enqueued.assert_not_called()
+        self.assertEqual(self.cached_langs(self.articles[0]), [])
+
+    def test_bulk_publish_prerenders_only_newly_published(self):
+        already = self.make_articles(1)[0]
+        with self.captureOnCommitCallbacks(execute=True):
+            updated = Article.objects.set_status('PUBLISHED')
+        self.assertEqual(updated, 3)
+        for article in self.articles:
+            self.assertEqual(self.cached_langs(article), ['en', 'ru'])
+        self.assertEqual(self.cached_langs(already), [])
+
+    def test_prerendered_certificate_is_served_without_rendering(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            Article.objects.filter(pk=self.articles[0].pk).set_status('PUBLISHED')
+        with mock.patch('submissions.certificate_cache.generate_certificate_pdf') as render:
+            response = self.client.get(f'/api/submissions/{self.articles[0].pk}/certificate/', {'lang': 'ru'})
+        self.assertEqual(response.status_code, 200)
+        render.assert_not_called()
+
+
+class CertificateVerifyTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.article = self.make_articles(1)[0]
+        self.cert_id = certificate_inputs(self.article)['cert_id']
+
+    def url(self, cert_id):
+        return f'/api/certificates/verify/{cert_id}/'
+
+    def test_qr_code_points_at_signed_verification_url(self):
+        data = certificate_inputs(self.article, 'ru')
+        self.assertEqual(self.cert_id, make_certificate_id(self.article.id, self.article.created_at.year))
+        self.assertTrue(data['qr_data'].endswith(self.url(self.cert_id)))
+
+    def test_valid_id_is_verified_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.client.get(self.url(self.cert_id))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['article_id'], self.article.id)
+        self.assertTrue(response.json()['valid'])
+        self.assertIn('public', response['Cache-Control'])
+
+    def test_tampered_id_is_rejected(self):
+        forged = self.cert_id.replace(f'CAJ-{self.article.id}-', f'CAJ-{self.article.id + 1}-')
+        for cert_id in (forged, f'CAJ-{self.article.id}-2025', 'garbage'):
+            response = self.client.get(self.url(cert_id))
+            self.assertEqual(response.status_code, 404)
+            self.assertFalse(response.json()['valid'])
+
+    def test_signing_key_survives_secret_key_rotation(self):
+        with override_settings(SECRET_KEY='rotated', CERTIFICATE_SIGNING_KEY=settings.CERTIFICATE_SIGNING_KEY):
+            self.assertEqual(self.client.get(self.url(self.cert_id)).status_code, 200)
+        with override_settings(CERTIFICATE_SIGNING_KEY='other'):
+            self.assertEqual(self.client.get(self.url(self.cert_id)).status_code, 404)
+
+    def test_browsers_get_html(self):
+        response = self.client.get(self.url(self.cert_id), HTTP_ACCEPT='text/html')
+        self.assertContains(response, 'Certificate verified')
+        self.assertContains(response, self.cert_id)
+
+
+class PublishedArticleReadModelTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.article = self.make_articles(1, page_range='1-9')[0]
+
+    def listing(self, **params):
+        response = self.client.get('/api/submissions/', {'status': 'PUBLISHED', **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()['results']
+
+    def test_public_listing_is_one_flat_query_with_serializer_fields(self):
+        with self.assertNumQueries(1):
+            row = self.listing()[0]
+        self.client.force_authenticate(self.author)
+        full = self.client.get(f'/api/submissions/{self.article.id}/').json()
+        for field in ('id', 'title', 'status', 'author', 'author_name', 'journal', 'journal_name',
+                      'journal_slug', 'issue', 'issue_info', 'page_range', 'created_at'):
+            self.assertEqual(row[field], full[field], field)
+
+    def test_filters_use_flat_columns(self):
+        other_issue = Issue.objects.create(journal=self.journal, volume=1, number=2, year=2024, status='PUBLISHED')
+        in_other = self.make_articles(1, issue=other_issue)[0]
+        self.assertEqual([a['id'] for a in self.listing(year=2024)], [in_other.id])
+        self.assertEqual([a['id'] for a in self.listing(issue=self.issue.id)], [self.article.id])
+        self.assertEqual(len(self.listing(author_name='valiy')), 2)
+
+    def test_follows_author_journal_and_issue_changes(self):
+        self.author.first_name = 'Vali'
+        self.author.save()
+        self.journal.name_en = 'Science Review'
+        self.journal.save()
+        self.issue.year = 2026
+        self.issue.save()
+        row = self.listing()[0]
+        self.assertEqual(row['author_name'], 'Vali Valiyev')
+        self.assertEqual(row['journal_name'], 'Science Review')
+        self.assertEqual(row['issue_info']['year'], 2026)
+
+        self.issue.delete()
+        self.assertIsNone(self.listing()[0]['issue_info'])
+
+    def test_unpublish_and_delete_remove_rows(self):
+        second = self.make_articles(1)[0]
+        Article.objects.filter(pk=self.article.pk).set_status('REJECTED')
+        second.delete()
+        self.assertEqual(self.listing(), [])
+        self.assertFalse(PublishedArticle.objects.exists())
+
+        Article.objects.filter(pk=self.article.pk).set_status('PUBLISHED')
+        self.assertEqual([a['id'] for a in self.listing()], [self.article.id])
+
+    def test_rebuild_matches_incremental_rows(self):
+        before = list(PublishedArticle.objects.values())
+        PublishedArticle.objects.all().delete()
+        rebuild_published_articles()
+        self.assertEqual(list(PublishedArticle.objects.values()), before)
+
+
+class SparseFieldsetTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.article = self.make_articles(1, abstract='A very long abstract')[0]
+        self.client.force_authenticate(self.author)
+
+    def test_lists_leave_out_reviews_unless_expanded(self):
+        with self.assertNumQueries(1):
+            response = self.client.get('/api/submissions/')
+        self.assertNotIn('reviews', response.data['results'][0])
+
+        response = self.client.get('/api/submissions/', {'expand': 'reviews'})
+        self.assertEqual(response.data['results'][0]['reviews'][0]['critique'], 'Solid work')
+
+    def test_fields_trim_payload_and_sql(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/submissions/', {'fields': 'id,title,journal_name'})
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'journal_name'})
+        sql = queries[0]['sql']
+        self.assertIn('"name_en"', sql)
+        self.assertNotIn('"abstract"', sql)
+        self.assertNotIn('users_user', sql)
+
+    def test_retrieve_nests_reviews_by_default(self):
+        url = f'/api/submissions/{self.article.id}/'
+        self.assertEqual(len(self.client.get(url).data['reviews']), 1)
+        self.assertEqual(set(self.client.get(url, {'fields': 'id,status'}).data), {'id', 'status'})
+
+    def test_public_listing_selects_read_columns(self):
+        self.client.force_authenticate(None)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/api/submissions/', {
+                'status': 'PUBLISHED', 'fields': 'id,issue_info', 'expand': 'reviews',
+            })
+        row = response.data['results'][0]
+        self.assertEqual(set(row), {'id', 'issue_info', 'reviews'})
+        self.assertEqual(row['issue_info']['year'], 2025)
+        self.assertEqual(row['reviews'][0]['expert_name'], 'expert')
+        self.assertNotIn('"abstract"', queries[0]['sql'])
+        self.assertEqual(len(queries), 2)
+
+
+class ArticleValuesSerializerTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.make_articles(2, page_range='1-9')
+        self.make_articles(1, issue=None, status='SUBMITTED', rejection_reason=None)
+
+    def expected(self, response, queryset):
+        serializer = ArticleSerializer(queryset, many=True, context={'request': response.wsgi_request})
+        return json.loads(JSONRenderer().render(serializer.data))
+
+    def test_author_listing_matches_model_serializer(self):
+        self.client.force_authenticate(self.author)
+        response = self.client.get('/api/submissions/', {'expand': 'reviews'})
+        articles = Article.objects.order_by('-created_at', '-id')
+        self.assertEqual(response.json()['results'], self.expected(response, articles))
+
+    def test_public_listing_matches_model_serializer(self):
+        # Left over from an earlier rejection
+        self.make_articles(1, rejection_reason='Needs a larger sample')
+        response = self.client.get('/api/submissions/', {'expand': 'reviews'})
+        articles = Article.objects.filter(status='PUBLISHED').order_by('-created_at', '-id')
+        self.assertEqual(response.json()['results'], self.expected(response, articles))
+
+
+@override_settings(SHARED_CACHE=True)
+class PublishedListingConditionalGetTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        self.article = self.make_articles(1)[0]
+
+    def etag(self, **params):
+        response = self.client.get('/api/submissions/', {'status': 'PUBLISHED', **params})
+        self.assertEqual(response.status_code, 200)
+        return response['ETag']
+
+    def test_not_modified_until_articles_change(self):
+        etag = self.etag()
+        with self.assertNumQueries(0):
+            response = self.client.get('/api/submissions/', {'status': 'PUBLISHED'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIn('Authorization', response['Vary'])
+
+        other = User.objects.create_user(username='other-expert', password='pass', is_expert=True)
+        ArticleReview.objects.create(article=self.article, expert=other, critique='More')
+        self.assertNotEqual(self.etag(), etag)
+        etag = self.etag()
+        Article.objects.filter(pk=self.article.pk).set_status('REJECTED')
+        self.assertNotEqual(self.etag(), etag)
+
+    def test_admin_actions_invalidate_cached_listing(self):
+        from django.contrib.admin.sites import site
+        from .admin import ArticleAdmin
+
+        self.assertEqual(len(self.client.get('/api/submissions/', {'status': 'PUBLISHED'}).json()['results']), 1)
+        ArticleAdmin(Article, site).mark_as_rejected(mock.Mock(), Article.objects.filter(pk=self.article.pk))
+        self.assertEqual(self.client.get('/api/submissions/', {'status': 'PUBLISHED'}).json()['results'], [])
+
+        # Plain bulk updates refresh the read table too
+        Article.objects.filter(pk=self.article.pk).update(status='PUBLISHED', title='Renamed')
+        row = self.client.get('/api/submissions/', {'status': 'PUBLISHED'}).json()['results'][0]
+        self.assertEqual(row['title'], 'Renamed')
+
+    def test_private_listings_are_not_cached(self):
+        self.client.force_authenticate(self.author)
+        response = self.client.get('/api/submissions/')
+        self.assertFalse(response.has_header('ETag'))
+        self.assertFalse(response.has_header('Cache-Control'))
+
+
+class SubmissionFeeTests(SubmissionTestMixin, APITestCase):
+    def setUp(self):
+        super().setUp()
+        Journal.objects.filter(pk=self.journal.pk).update(price_per_page=Decimal('5.00'))
+        User.objects.filter(pk=self.author.pk).update(balance=Decimal('20.00'))
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root, ignore_errors=True)
+        override = override_settings(MEDIA_ROOT=media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.client.force_authenticate(self.author)
+
+    def submit(self, page_count, **data):
+        data.update({'title': 'Paper', 'abstract': 'Abstract', 'journal': self.journal.id, 'page_count': page_count})
+        return self.client.post('/api/submissions/', data)
+
+    def test_insufficient_balance_is_payment_required(self):
+        response = self.submit(5)
+
+        self.assertEqual(response.status_code, 402)
+        self.assertEqual(response.data['balance'], '20.00')
+        self.assertEqual(User.objects.get(pk=self.author.pk).balance, Decimal('20.00'))
+
+    def test_invalid_submission_is_not_charged(self):
+        # No manuscript_file: validation fails after the fee was debited
+        response = self.submit(2)
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(User.objects.get(pk=self.author.pk).balance, Decimal('20.00'))
+        self.assertFalse(WalletTransaction.objects.exists())
+
+    def test_fee_is_debited(self):
+        manuscript = SimpleUploadedFile('paper.pdf', b'%PDF-1.4', content_type='application/pdf')
+        response = self.submit(2, manuscript_file=manuscript)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(User.objects.get(pk=self.author.pk).balance, Decimal('10.00'))
+        self.assertEqual(WalletTransaction.objects.get().transaction_type, 'PUBLISH_FEE')
+
+
+class BenchmarkArticleQueriesTests(TestCase):
+    def test_requires_confirmation(self):
+        with self.assertRaisesMessage(CommandError, '--i-know'):
+            call_command('benchmark_article_queries', articles=10, stdout=StringIO())
+
+    def test_seed_is_rolled_back(self):
+        out = StringIO()
+        call_command(
+            'benchmark_article_queries', articles=20, authors=3, journals=1, repeat=1,
+            compare=True, no_plans=True, i_know=True, stdout=out,
+        )
+        self.assertIn('rolled back', out.getvalue())
+        self.assertFalse(Article.objects.exists())
+        # --compare dropped the indexes inside the same transaction
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Article._meta.db_table)
+        for index in Article._meta.indexes:
+            self.assertIn(index.name, constraints)
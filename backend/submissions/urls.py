@@ -1,8 +1,11 @@
+from django.urls import path
 from rest_framework.routers import SimpleRouter
-from .views import SubmissionViewSet, ArticleReviewViewSet
+from .views import SubmissionViewSet, ArticleReviewViewSet, CertificateVerifyView
 
 router = SimpleRouter()
 router.register(r'submissions', SubmissionViewSet, basename='submission')
 router.register(r'reviews', ArticleReviewViewSet, basename='review')
 
-urlpatterns = router.urls
+urlpatterns = router.urls + [
+    path('certificates/verify/<str:cert_id>/', CertificateVerifyView.as_view(), name='certificate-verify'),
+]
@@ -0,0 +1,41 @@
+"""
+Signed certificate IDs.
+
+A certificate ID reads ``CAJ-<article_id>-<year>-<signature>``, where the
+signature is a truncated HMAC of the rest keyed by CERTIFICATE_SIGNING_KEY.
+That falls back to SECRET_KEY; once it is set on its own, SECRET_KEY can be
+rotated without invalidating printed certificates. Verifying an ID only
+recomputes the HMAC, so QR scans never reach the database. A valid ID
+proves this site issued the certificate; it does not re-check the
+article's current status.
+"""
+import re
+
+from django.conf import settings
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+SALT = 'submissions.certificate-id'
+SIGNATURE_LENGTH = 12
+CERT_ID_RE = re.compile(r'^CAJ-(?P<article_id>\d+)-(?P<year>\d{4})-(?P<signature>[0-9A-F]+)$')
+
+
+def _signature(article_id, year):
+    digest = salted_hmac(
+        SALT, f'{article_id}-{year}', secret=settings.CERTIFICATE_SIGNING_KEY, algorithm='sha256',
+    ).hexdigest()
+    return digest[:SIGNATURE_LENGTH].upper()
+
+
+def make_certificate_id(article_id, year):
+    return f'CAJ-{article_id}-{year}-{_signature(article_id, year)}'
+
+
+def verify_certificate_id(cert_id):
+    """Return ``(article_id, year)`` for a genuine certificate ID, else None"""
+    match = CERT_ID_RE.match(cert_id.strip().upper())
+    if not match:
+        return None
+    article_id, year = int(match['article_id']), int(match['year'])
+    if not constant_time_compare(match['signature'], _signature(article_id, year)):
+        return None
+    return article_id, year
@@ -1,9 +1,35 @@
 from django.db import models
-from rest_framework import serializers, viewsets, permissions, status, filters
+from rest_framework import serializers, viewsets, permissions, status
 from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.renderers import JSONRenderer, TemplateHTMLRenderer
 from rest_framework.response import Response
+from rest_framework.views import APIView
+from decimal import Decimal
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import transaction
+from django.http import FileResponse
 from django.utils import timezone
-from .models import Article, ArticleReview
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date
+from config.conditional import ConditionalGetMixin
+from config.db_router import ReplicaReadMixin
+from config.pagination import CreatedAtPagination
+from config.query_budget import QueryBudgetMixin
+from config.sparse_fields import DynamicFieldsMixin, SparseFieldsetMixin
+from billing import wallet
+from billing.models import UserSubscription
+from config.values_serializer import ValuesListMixin, ValuesSerializer
+from journals.models import Journal
+from .autocomplete import autocomplete_index
+from .certificate import get_verify_base_url
+from .certificate_cache import get_certificate
+from .facets import get_facets
+from .models import Article, ArticleReview, PublishedArticle
+from .search import FullTextSearchFilter
+from .verification import verify_certificate_id
 
 class ArticleReviewSerializer(serializers.ModelSerializer):
     expert_name = serializers.SerializerMethodField()
@@ -16,7 +42,7 @@ class ArticleReviewSerializer(serializers.ModelSerializer):
     def get_expert_name(self, obj):
         return obj.expert.get_full_name() or obj.expert.username
 
-class ArticleSerializer(serializers.ModelSerializer):
+class ArticleSerializer(DynamicFieldsMixin, serializers.ModelSerializer):
     author_name = serializers.SerializerMethodField()
     journal_name = serializers.SerializerMethodField()
     journal_slug = serializers.SerializerMethodField()
@@ -47,9 +73,56 @@ class ArticleSerializer(serializers.ModelSerializer):
             }
         return None
 
+
+def _issue_info(issue_id, volume, number, year):
+    if issue_id is None:
+        return None
+    return {"id": issue_id, "volume": volume, "number": number, "year": year}
+
+
+class ArticleValuesSerializer(ValuesSerializer):
+    """ArticleSerializer output from values() rows, for list responses"""
+    model = Article
+    sources = {'journal_name': 'journal__name_en', 'journal_slug': 'journal__slug'}
+    method_fields = {
+        'author_name': ('author__first_name', 'author__last_name', 'author__username'),
+        'issue_info': ('issue', 'issue__volume', 'issue__number', 'issue__year'),
+    }
+
+    def get_author_name(self, first_name, last_name, username):
+        return f"{first_name} {last_name}".strip() or username
+
+    def get_issue_info(self, *issue):
+        return _issue_info(*issue)
+
+
+class PublishedArticleValuesSerializer(ValuesSerializer):
+    """Same output as ArticleValuesSerializer, read from the PublishedArticle table"""
+    model = PublishedArticle
+    fields = (
+        'id', 'title', 'abstract', 'keywords', 'language', 'page_count', 'page_range', 'rejection_reason',
+        'author', 'author_name', 'journal', 'journal_name', 'journal_slug', 'issue',
+        'submitted_at', 'created_at', 'updated_at',
+    )
+    method_fields = {
+        'status': (),
+        'manuscript_file': ('manuscript_file',),
+        'issue_info': ('issue', 'issue_volume', 'issue_number', 'issue_year'),
+    }
+
+    def get_status(self):
+        return 'PUBLISHED'
+
+    def get_manuscript_file(self, name):
+        return self.file_url(default_storage, name)
+
+    def get_issue_info(self, *issue):
+        return _issue_info(*issue)
+
 class ArticleReviewViewSet(viewsets.ModelViewSet):
-    queryset = ArticleReview.objects.all()
+    queryset = ArticleReview.objects.select_related('expert')
     serializer_class = ArticleReviewSerializer
+    pagination_class = CreatedAtPagination
 
     def get_permissions(self):
         if self.action in ['update', 'partial_update', 'destroy']:
@@ -64,7 +137,6 @@ class ArticleReviewViewSet(viewsets.ModelViewSet):
         # Check if user already reviewed this article
         article_id = self.request.data.get('article')
         if ArticleReview.objects.filter(article=article_id, expert=self.request.user).exists():
-            from rest_framework.exceptions import ValidationError
             raise ValidationError("You have already submitted a critique for this article.")
             
         serializer.save(expert=self.request.user)
@@ -89,50 +161,130 @@ class ArticleReviewViewSet(viewsets.ModelViewSet):
             return self.queryset.filter(article_id=article_id)
         return self.queryset
 
-class SubmissionViewSet(viewsets.ModelViewSet):
+class SubmissionViewSet(ReplicaReadMixin, ConditionalGetMixin, SparseFieldsetMixin, ValuesListMixin, QueryBudgetMixin, viewsets.ModelViewSet):
     serializer_class = ArticleSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = CreatedAtPagination
 
-    filter_backends = [filters.SearchFilter]
-    search_fields = ['title', 'abstract', 'keywords', 'author__username', 'author__first_name', 'author__last_name']
+    filter_backends = [FullTextSearchFilter]
+    article_search_fields = ['title', 'abstract', 'keywords', 'author__username', 'author__first_name', 'author__last_name']
+    read_search_fields = ['title', 'abstract', 'keywords', 'author_name', 'author_username']
 
-    def get_queryset(self):
-        user = self.request.user
-        queryset = Article.objects.all()
+    # Max queries per action, independent of page size:
+    # auth user + articles (joined) + reviews prefetch
+    query_budget = {
+        'list': 3,
+        'retrieve': 3,
+        'certificate': 2,
+        # The save reindexes search and syncs the read table in its signals
+        'withdraw': 7,
+        'facets': 2,
+    }
+
+    @property
+    def search_fields(self):
+        # Used by the icontains fallback when the database has no full-text index
+        return self.read_search_fields if self.serves_read_model() else self.article_search_fields
 
-        # Filters
+    def serves_read_model(self):
+        """Public listings of published articles are served from PublishedArticle"""
+        if self.action != 'list':
+            return False
         status_filter = self.request.query_params.get('status')
-        issue_id = self.request.query_params.get('issue')
-        journal_id = self.request.query_params.get('journal')
-        author_id = self.request.query_params.get('author')
+        return status_filter == 'PUBLISHED' or (not status_filter and not self.request.user.is_authenticated)
+
+    # Without ?status= the same URL lists an author's own articles once logged in
+    catalog_vary = ('Accept', 'Authorization')
+    # Authors who just submitted or edited are pinned to the primary
+    replica_actions = ('list', 'retrieve', 'facets', 'certificate')
+
+    def get_catalog_versions(self):
+        return ('articles',) if self.serves_read_model() else None
+
+    # Reviews are only nested in lists on ?expand=reviews
+    expandable_fields = ('reviews',)
+    field_sources = {
+        'author_name': ['author__first_name', 'author__last_name', 'author__username'],
+        'journal_name': ['journal__name_en'],
+        'journal_slug': ['journal__slug'],
+        'issue_info': ['issue__volume', 'issue__number', 'issue__year'],
+    }
+
+    def optimize_queryset(self, queryset):
+        """Joins and prefetches the serializer needs for the current action"""
+        if self.action == 'list':
+            # Lists select their columns with values(), see ValuesListMixin
+            return queryset
+        fields = self.get_selected_fields() if self.action == 'retrieve' else None
+        if fields is None:
+            queryset = queryset.select_related('author', 'journal', 'issue')
+            if self.action in ['certificate', 'withdraw']:
+                return queryset
+        else:
+            queryset = self.trim_queryset(queryset, fields)
+            if 'reviews' not in fields:
+                return queryset
+        return queryset.prefetch_related(
+            models.Prefetch('reviews', queryset=ArticleReview.objects.select_related('expert'))
+        )
+
+    def number_param(self, name):
+        value = self.request.query_params.get(name)
+        if not value:
+            return None
+        try:
+            return int(value)
+        except ValueError:
+            raise ValidationError({name: 'Expected a number'})
+
+    def apply_filters(self, queryset):
+        """Archive filters shared by the list and facets endpoints"""
+        issue_id, journal_id, author_id, year = (
+            self.number_param(name) for name in ('issue', 'journal', 'author', 'year')
+        )
         author_name = self.request.query_params.get('author_name')
         lang = self.request.query_params.get('language')
-        year = self.request.query_params.get('year')
-        
-        if status_filter:
-            queryset = queryset.filter(status=status_filter)
-        
-        if issue_id:
+
+        if issue_id is not None:
             queryset = queryset.filter(issue_id=issue_id)
 
-        if journal_id:
+        if journal_id is not None:
             queryset = queryset.filter(journal_id=journal_id)
             
-        if author_id:
+        if author_id is not None:
             queryset = queryset.filter(author_id=author_id)
 
         if author_name:
-            queryset = queryset.filter(
-                models.Q(author__first_name__icontains=author_name) |
-                models.Q(author__last_name__icontains=author_name) |
-                models.Q(author__username__icontains=author_name)
-            )
+            if queryset.model is PublishedArticle:
+                queryset = queryset.filter(
+                    models.Q(author_name__icontains=author_name) |
+                    models.Q(author_username__icontains=author_name)
+                )
+            else:
+                queryset = queryset.filter(
+                    models.Q(author__first_name__icontains=author_name) |
+                    models.Q(author__last_name__icontains=author_name) |
+                    models.Q(author__username__icontains=author_name)
+                )
             
         if lang:
             queryset = queryset.filter(language=lang)
             
-        if year:
-            queryset = queryset.filter(issue__year=year)
+        if year is not None:
+            year_lookup = 'issue_year' if queryset.model is PublishedArticle else 'issue__year'
+            queryset = queryset.filter(**{year_lookup: year})
+
+        return queryset
+
+    def get_queryset(self):
+        if self.serves_read_model():
+            return self.apply_filters(PublishedArticle.objects.all())
+        user = self.request.user
+        queryset = self.apply_filters(self.optimize_queryset(Article.objects.all()))
+
+        status_filter = self.request.query_params.get('status')
+        if status_filter:
+            queryset = queryset.filter(status=status_filter)
             
         # Public: show published articles
         if status_filter == 'PUBLISHED':
@@ -149,6 +301,26 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             
         return queryset
 
+    def get_values_serializer(self):
+        if self.serves_read_model():
+            serializer_class = PublishedArticleValuesSerializer
+        else:
+            serializer_class = ArticleValuesSerializer
+        return serializer_class(fields=self.get_selected_fields(), context=self.get_serializer_context())
+
+    def serialize_rows(self, serializer, rows):
+        data = serializer.to_representation(rows)
+        fields = self.get_selected_fields()
+        if fields is None or 'reviews' in fields:
+            # One query for the whole page instead of a prefetch per row set
+            reviews = ArticleReview.objects.filter(article_id__in=[row['id'] for row in rows]).select_related('expert')
+            by_article = {}
+            for review in ArticleReviewSerializer(reviews, many=True).data:
+                by_article.setdefault(review['article'], []).append(review)
+            for row, item in zip(rows, data):
+                item['reviews'] = by_article.get(row['id'], [])
+        return data
+
     def create(self, request, *args, **kwargs):
         user = request.user
         journal_id = request.data.get('journal')
@@ -181,32 +353,26 @@ class SubmissionViewSet(viewsets.ModelViewSet):
             needs_payment = True
             cost = journal.price_per_page * page_count
 
-        if needs_payment and cost > 0:
-            if user.balance < cost:
-                return Response({
-                    'error': 'INSUFFICIENT_BALANCE',
-                    'message': f'Insufficient balance. This publication costs ${cost}, but your balance is ${user.balance}.',
-                    'cost': str(cost),
-                    'balance': str(user.balance)
-                }, status=status.HTTP_402_PAYMENT_REQUIRED)
-            
-            # Deduct balance
-            user.balance -= cost
-            user.save()
-            
-            # Record transaction
-            WalletTransaction.objects.create(
-                user=user,
-                amount=-cost,
-                transaction_type='PUBLISH_FEE',
-                description=f"Publication fee for article in {journal.name_en}"
-            )
-        elif not needs_payment and subscription:
-            # Increment usage for plan
-            subscription.articles_used_this_month += 1
-            subscription.save()
-
-        return super().create(request, *args, **kwargs)
+        # The charge and the article are committed together: a submission that
+        # fails validation costs nothing
+        with transaction.atomic():
+            if needs_payment and cost > 0:
+                try:
+                    wallet.debit(user, cost, 'PUBLISH_FEE', f"Publication fee for article in {journal.name_en}")
+                except wallet.InsufficientBalance as exc:
+                    return Response({
+                        'error': 'INSUFFICIENT_BALANCE',
+                        'message': f'Insufficient balance. This publication costs ${cost}, but your balance is ${exc.balance}.',
+                        'cost': str(cost),
+                        'balance': str(exc.balance)
+                    }, status=status.HTTP_402_PAYMENT_REQUIRED)
+            elif not needs_payment and subscription:
+                # Increment usage for plan
+                UserSubscription.objects.filter(pk=subscription.pk).update(
+                    articles_used_this_month=models.F('articles_used_this_month') + 1
+                )
+
+            return super().create(request, *args, **kwargs)
 
     def perform_create(self, serializer):
         serializer.save(author=self.request.user, status='SUBMITTED', submitted_at=timezone.now())
@@ -242,6 +408,28 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         article.save()
         return Response({'status': 'Withdrawn'})
 
+    @action(detail=False, methods=['get'])
+    def autocomplete(self, request):
+        """
+        Prefix suggestions for the search box, served from memory.
+        GET /api/submissions/autocomplete/?q=...&limit=10
+        """
+        try:
+            limit = max(min(int(request.query_params.get('limit', 10)), 50), 1)
+        except ValueError:
+            limit = 10
+        return Response(autocomplete_index.lookup(request.query_params.get('q', ''), limit))
+
+    @action(detail=False, methods=['get'])
+    def facets(self, request):
+        """
+        Counts per journal, year and language for the published archive.
+        GET /api/submissions/facets/?journal=&issue=&language=&year=&search=
+        """
+        queryset = self.apply_filters(Article.objects.filter(status='PUBLISHED'))
+        queryset = self.filter_queryset(queryset)
+        return Response(get_facets(queryset, request.query_params))
+
     @action(detail=True, methods=['get'])
     def certificate(self, request, pk=None):
         """
@@ -265,12 +453,48 @@ class SubmissionViewSet(viewsets.ModelViewSet):
         if lang not in ['en', 'ru', 'uz']:
             lang = 'en'
             
-        from .certificate import generate_certificate_pdf
-        from django.http import FileResponse
-        
-        buffer = generate_certificate_pdf(article, lang=lang)
-        
-        filename = f"Certificate_{article.id}_{lang}.pdf"
-        response = FileResponse(buffer, as_attachment=True, filename=filename)
+        cached = get_certificate(article, lang=lang)
+        last_modified = int(cached.last_modified.timestamp())
+
+        # Conditional GET: a repeat download with a matching ETag or
+        # If-Modified-Since gets a 304 without reading the file.
+        response = get_conditional_response(request, etag=cached.etag, last_modified=last_modified)
+        if response is None:
+            filename = f"Certificate_{article.id}_{lang}.pdf"
+            response = FileResponse(cached.file, as_attachment=True, filename=filename)
+        else:
+            cached.file.close()
+        response.headers['ETag'] = cached.etag
+        response.headers['Last-Modified'] = http_date(last_modified)
+        patch_cache_control(response, public=True, max_age=settings.CERTIFICATE_MAX_AGE)
         return response
 
+
+class CertificateVerifyView(APIView):
+    """
+    Target of certificate QR codes. Checks the signed certificate ID without
+    touching the database and returns a small summary: HTML for browsers,
+    JSON for API clients. The answer never changes, so it is cached publicly.
+    """
+    authentication_classes = []
+    permission_classes = [permissions.AllowAny]
+    renderer_classes = [JSONRenderer, TemplateHTMLRenderer]
+    template_name = 'certificate_verify.html'
+
+    def get(self, request, cert_id):
+        verified = verify_certificate_id(cert_id)
+        if verified is None:
+            data = {'valid': False, 'certificate_id': cert_id}
+            response = Response(data, status=status.HTTP_404_NOT_FOUND)
+        else:
+            article_id, year = verified
+            response = Response({
+                'valid': True,
+                'certificate_id': cert_id.strip().upper(),
+                'article_id': article_id,
+                'year': year,
+                'article_url': f"{get_verify_base_url()}/articles/{article_id}",
+            })
+        patch_cache_control(response, public=True, max_age=settings.CERTIFICATE_MAX_AGE)
+        patch_vary_headers(response, ['Accept'])
+        return response
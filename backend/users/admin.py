@@ -8,6 +8,8 @@ class UserAdmin(BaseUserAdmin):
     list_filter = ('is_staff', 'is_superuser', 'is_verified', 'is_finance_admin', 'is_expert', 'is_active')
     search_fields = ('username', 'email', 'first_name', 'last_name')
     ordering = ('username',)
+    # Balances change through the wallet ledger (billing adjust-balance)
+    readonly_fields = ('balance',)
     
     fieldsets = BaseUserAdmin.fieldsets + (
         ('Additional Info', {'fields': ('is_verified', 'is_finance_admin', 'is_expert', 'balance', 'bio', 'institution', 'profile_picture')}),
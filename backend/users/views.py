@@ -2,6 +2,7 @@ from rest_framework import generics, permissions, viewsets, parsers
 from rest_framework.response import Response
 from rest_framework.views import APIView
 from django.contrib.auth import get_user_model
+from config.pagination import UserPagination
 from .serializers import RegisterSerializer, UserSerializer
 
 User = get_user_model()
@@ -39,6 +40,7 @@ class UserViewSet(viewsets.ModelViewSet):
     queryset = User.objects.all().order_by('-date_joined')
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = UserPagination
 
     def get_queryset(self):
         queryset = User.objects.all().order_by('-date_joined')
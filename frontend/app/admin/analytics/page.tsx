@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useRouter } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 
 export default function AnalyticsDashboardPage() {
@@ -20,15 +20,14 @@ export default function AnalyticsDashboardPage() {
 
     const fetchData = async () => {
         try {
-            const [articlesRes, journalsRes] = await Promise.all([
-                api.get("/submissions/"),
+            const [submissions, journalsRes] = await Promise.all([
+                fetchAll("/submissions/"),
                 api.get("/journals/")
             ])
 
-            setArticles(articlesRes.data)
+            setArticles(submissions)
             setJournals(journalsRes.data)
 
-            const submissions = articlesRes.data
             const now = new Date()
             const thisMonth = submissions.filter((s: any) => {
                 const d = new Date(s.created_at)
@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useParams, useRouter } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 
 export default function AdminArticleDetailPage() {
     const { id } = useParams()
@@ -32,8 +32,7 @@ export default function AdminArticleDetailPage() {
                     setJournal(j)
 
                     // Fetch issues for this journal
-                    const issuesRes = await api.get(`/issues/?journal=${res.data.journal}`)
-                    setIssues(issuesRes.data)
+                    setIssues(await fetchAll(`/issues/?journal=${res.data.journal}`))
                 }
             } catch (err: any) {
                 if (err.response?.status === 401) router.push("/auth/login")
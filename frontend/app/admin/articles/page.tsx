@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useRouter } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 
 export default function AdminArticlesPage() {
@@ -21,11 +21,11 @@ export default function AdminArticlesPage() {
 
   const fetchData = async () => {
     try {
-      const [articlesRes, journalsRes] = await Promise.all([
-        api.get("/submissions/"),
+      const [articles, journalsRes] = await Promise.all([
+        fetchAll("/submissions/"),
         api.get("/journals/")
       ])
-      setArticles(articlesRes.data)
+      setArticles(articles)
       setJournals(journalsRes.data)
     } catch (err: any) {
       if (err.response?.status === 401) router.push("/auth/login")
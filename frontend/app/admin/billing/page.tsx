@@ -1,7 +1,7 @@
 "use client"
 
 import { useEffect, useState } from "react"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 import { resolveMediaUrl } from "@/lib/utils"
 import { toast } from "sonner"
@@ -19,12 +19,12 @@ export default function AdminBillingPage() {
 
     const fetchData = async () => {
         try {
-            const [receiptsRes, statsRes, usersRes] = await Promise.all([
-                api.get("/admin-receipts/"),
+            const [receipts, statsRes, usersRes] = await Promise.all([
+                fetchAll("/admin-receipts/"),
                 api.get("/admin-receipts/stats/"),
                 api.get("/admin-receipts/users_list/")
             ])
-            setReceipts(receiptsRes.data)
+            setReceipts(receipts)
             setStats(statsRes.data)
             setUsers(usersRes.data)
         } catch (err) {
@@ -45,7 +45,9 @@ export default function FinanceDashboardPage() {
 
                 const [dashRes, trendRes, usersRes, breakdownRes] = await Promise.all([
                     api.get('/finance/dashboard/', { params }),
-                    api.get('/finance/revenue-trend/', { params }),
+                    api.get('/finance/revenue-trend/', {
+                        params: { ...params, granularity: 'month', tz: Intl.DateTimeFormat().resolvedOptions().timeZone }
+                    }),
                     api.get('/finance/top-users/', { params }),
                     api.get('/finance/transaction-breakdown/', { params })
                 ])
@@ -150,7 +152,7 @@ export default function FinanceDashboardPage() {
                         <div style={{ display: 'flex', flexDirection: 'column', gap: '0.75rem' }}>
                             {revenueTrend.map((item, i) => (
                                 <div key={i} style={{ display: 'flex', alignItems: 'center', gap: '1rem' }}>
-                                    <div style={{ fontSize: '0.8rem', color: '#6b7280', minWidth: '70px' }}>{item.month}</div>
+                                    <div style={{ fontSize: '0.8rem', color: '#6b7280', minWidth: '70px' }}>{item.period}</div>
                                     <div style={{ flex: 1, background: '#f3f4f6', borderRadius: '4px', height: '24px', position: 'relative', overflow: 'hidden' }}>
                                         <div style={{
                                             width: `${Math.min((parseFloat(item.revenue) / 10000) * 100, 100)}%`,
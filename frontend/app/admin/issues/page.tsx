@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useRouter } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 
 export default function AdminIssuesPage() {
@@ -24,11 +24,11 @@ export default function AdminIssuesPage() {
 
   const fetchData = async () => {
     try {
-      const [issuesRes, journalsRes] = await Promise.all([
-        api.get("/issues/"),
+      const [issues, journalsRes] = await Promise.all([
+        fetchAll("/issues/"),
         api.get("/journals/")
       ])
-      setIssues(issuesRes.data)
+      setIssues(issues)
       setJournals(journalsRes.data)
     } catch (err: any) {
       if (err.response?.status === 401) router.push("/auth/login")
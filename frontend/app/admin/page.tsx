@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useRouter } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 
 export default function AdminDashboardPage() {
@@ -17,9 +17,9 @@ export default function AdminDashboardPage() {
     useEffect(() => {
         const fetchData = async () => {
             try {
-                const [userRes, subRes, journalRes, planRes] = await Promise.all([
+                const [userRes, submissions, journalRes, planRes] = await Promise.all([
                     api.get("/auth/me/"),
-                    api.get("/submissions/"),
+                    fetchAll("/submissions/"),
                     api.get("/journals/"),
                     api.get("/plans/")
                 ])
@@ -32,7 +32,6 @@ export default function AdminDashboardPage() {
                     return
                 }
 
-                const submissions = subRes.data
                 setRecentSubmissions(submissions.slice(0, 10))
 
                 setStats({
@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useRouter } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 import { toast } from "sonner"
 
@@ -21,8 +21,7 @@ export default function AdminUsersPage() {
 
     const fetchUsers = async () => {
         try {
-            const res = await api.get("/auth/users/")
-            setUsers(res.data)
+            setUsers(await fetchAll("/auth/users/"))
         } catch (err: any) {
             if (err.response?.status === 401) router.push("/auth/login")
             else if (err.response?.status === 403) {
@@ -3,7 +3,7 @@
 import { useEffect, useState, Suspense } from "react"
 import { useSearchParams } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { Page } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 import { resolveMediaUrl, stripHtml } from "@/lib/utils"
 
@@ -12,6 +12,7 @@ function PublishedArticlesPageContent() {
     const [viewMode, setViewMode] = useState<'list' | 'card'>('list')
     const searchParams = useSearchParams()
     const [articles, setArticles] = useState<any[]>([])
+    const [nextPage, setNextPage] = useState<string | null>(null)
     const [journals, setJournals] = useState<any[]>([])
     const [years, setYears] = useState<number[]>([])
     const [loading, setLoading] = useState(true)
@@ -56,8 +57,11 @@ function PublishedArticlesPageContent() {
             if (filters.year) params.append("year", filters.year)
             if (filters.author) params.append("author", filters.author)
 
-            api.get(`/submissions/?${params.toString()}`)
-                .then(res => setArticles(res.data))
+            api.get<Page<any>>(`/submissions/?${params.toString()}`)
+                .then(res => {
+                    setArticles(res.data.results)
+                    setNextPage(res.data.next)
+                })
                 .catch(console.error)
                 .finally(() => setLoading(false))
         }, 500) // Debounce for 500ms
@@ -65,6 +69,18 @@ function PublishedArticlesPageContent() {
         return () => clearTimeout(timeoutId)
     }, [filters])
 
+    const loadMore = () => {
+        if (!nextPage) return
+        setLoading(true)
+        api.get<Page<any>>(nextPage)
+            .then(res => {
+                setArticles(prev => [...prev, ...res.data.results])
+                setNextPage(res.data.next)
+            })
+            .catch(console.error)
+            .finally(() => setLoading(false))
+    }
+
     const AncientArticleCard = ({ article }: { article: any }) => {
         return (
             <div style={{
@@ -472,6 +488,13 @@ function PublishedArticlesPageContent() {
                             <Link href="/journals" className="btn btn-primary">{t('journals.all_journals')}</Link>
                         </div>
                     )}
+                    {nextPage && (
+                        <div style={{ textAlign: 'center', marginTop: '2rem' }}>
+                            <button className="btn btn-primary" onClick={loadMore} disabled={loading}>
+                                {t('common.load_more')}
+                            </button>
+                        </div>
+                    )}
                 </div>
             </section>
         </main>
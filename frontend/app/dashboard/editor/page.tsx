@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import Link from "next/link"
 import { useRouter } from "next/navigation"
-import api from "@/lib/api"
+import { fetchAll } from "@/lib/api"
 
 export default function EditorDashboardPage() {
   const router = useRouter()
@@ -12,8 +12,8 @@ export default function EditorDashboardPage() {
   const [filter, setFilter] = useState('ALL')
 
   useEffect(() => {
-    api.get("/submissions/")
-      .then(res => setSubmissions(res.data))
+    fetchAll("/submissions/")
+      .then(setSubmissions)
       .catch(err => err.response?.status === 401 && router.push("/auth/login"))
       .finally(() => setLoading(false))
   }, [router])
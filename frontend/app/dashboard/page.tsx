@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useRouter } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 import { useAuth } from "@/lib/auth-context"
 
@@ -15,8 +15,8 @@ export default function DashboardPage() {
     const [loading, setLoading] = useState(true)
 
     useEffect(() => {
-        api.get("/submissions/")
-            .then((res) => setSubmissions(res.data))
+        fetchAll("/submissions/")
+            .then(setSubmissions)
             .catch(() => router.push("/auth/login"))
             .finally(() => setLoading(false))
     }, [router])
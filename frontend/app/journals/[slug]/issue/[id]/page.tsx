@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useParams } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 import { resolveMediaUrl } from "@/lib/utils"
 
@@ -26,9 +26,9 @@ export default function IssueDetailPage() {
                 setIssue(issueRes.data)
 
                 // Fetch public articles in this issue (using the backend filter we added)
-                const articlesRes = await api.get(`/submissions/?issue=${id}&status=PUBLISHED`)
-                setArticles(articlesRes.data)
-                setFilteredArticles(articlesRes.data)
+                const articles = await fetchAll(`/submissions/?issue=${id}&status=PUBLISHED`)
+                setArticles(articles)
+                setFilteredArticles(articles)
             } catch (err) {
                 console.error(err)
             } finally {
@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useParams } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 
 export default function JournalDetailPage() {
@@ -21,9 +21,9 @@ export default function JournalDetailPage() {
             try {
                 const res = await api.get(`/journals/${slug}/`)
                 setJournal(res.data)
-                const issuesRes = await api.get(`/issues/?journal=${res.data.id}`)
-                setIssues(issuesRes.data)
-                setFilteredIssues(issuesRes.data.sort((a: any, b: any) => b.year - a.year))
+                const issues = await fetchAll(`/issues/?journal=${res.data.id}`)
+                setIssues(issues)
+                setFilteredIssues(issues.sort((a: any, b: any) => b.year - a.year))
             } catch (err) {
                 console.error(err)
             } finally {
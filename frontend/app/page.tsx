@@ -15,17 +15,18 @@ export default function Home() {
   useEffect(() => {
     const fetchData = async () => {
       try {
-        const [journalsRes, submissionsRes] = await Promise.all([
+        const [journalsRes, facetsRes] = await Promise.all([
           api.get("/journals/").catch(() => ({ data: [] })),
-          api.get("/submissions/?status=PUBLISHED").catch(() => ({ data: [] }))
+          api.get("/submissions/facets/").catch(() => ({ data: { total: 0 } }))
         ])
+        const published = facetsRes.data.total
 
         setJournals(journalsRes.data.slice(0, 3))
         setStats({
-          articles: submissionsRes.data.length,
+          articles: published,
           journals: journalsRes.data.length,
           reviewers: Math.max(10, journalsRes.data.length * 3),
-          countries: Math.max(5, Math.floor(submissionsRes.data.length / 2))
+          countries: Math.max(5, Math.floor(published / 2))
         })
       } catch (err) {
         console.error(err)
@@ -3,7 +3,7 @@
 import { useEffect, useState } from "react"
 import { useParams } from "next/navigation"
 import Link from "next/link"
-import api from "@/lib/api"
+import api, { fetchAll } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 import { resolveMediaUrl, stripHtml } from "@/lib/utils"
 
@@ -17,15 +17,14 @@ export default function PublicProfilePage() {
     useEffect(() => {
         if (!id) return
 
-        const fetchAll = async () => {
+        const fetchProfile = async () => {
             try {
                 // Fetch public profile
                 const profileRes = await api.get(`/auth/public/profiles/${id}/`)
                 setProfile(profileRes.data)
 
                 // Fetch their published articles
-                const articlesRes = await api.get(`/submissions/?author=${id}&status=PUBLISHED`)
-                setArticles(articlesRes.data)
+                setArticles(await fetchAll(`/submissions/?author=${id}&status=PUBLISHED`))
             } catch (err) {
                 console.error(err)
             } finally {
@@ -33,7 +32,7 @@ export default function PublicProfilePage() {
             }
         }
 
-        fetchAll()
+        fetchProfile()
     }, [id])
 
     if (loading) return <div style={{ minHeight: '60vh', display: 'flex', alignItems: 'center', justifyContent: 'center' }}><div className="spinner" /></div>
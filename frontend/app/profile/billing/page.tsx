@@ -1,7 +1,7 @@
 "use client"
 
 import { useEffect, useState, useRef } from "react"
-import api from "@/lib/api"
+import api, { Page } from "@/lib/api"
 import { useI18n } from "@/lib/i18n"
 import { useAuth } from "@/lib/auth-context"
 import { resolveMediaUrl } from "@/lib/utils"
@@ -12,6 +12,8 @@ export default function BillingBalancePage() {
     const { user, refreshUser } = useAuth()
     const [config, setConfig] = useState<any>(null)
     const [transactions, setTransactions] = useState<any[]>([])
+    const [nextPage, setNextPage] = useState<string | null>(null)
+    const [loadingMore, setLoadingMore] = useState(false)
     const [amount, setAmount] = useState("")
     const [loading, setLoading] = useState(true)
     const [uploading, setUploading] = useState(false)
@@ -23,10 +25,11 @@ export default function BillingBalancePage() {
             try {
                 const [configRes, transRes] = await Promise.all([
                     api.get("/billing/config/"),
-                    api.get("/billing/transactions/")
+                    api.get<Page<any>>("/billing/transactions/")
                 ])
                 setConfig(configRes.data)
-                setTransactions(transRes.data)
+                setTransactions(transRes.data.results)
+                setNextPage(transRes.data.next)
             } catch (err) {
                 console.error(err)
             } finally {
@@ -36,6 +39,18 @@ export default function BillingBalancePage() {
         fetchData()
     }, [])
 
+    const loadMore = () => {
+        if (!nextPage) return
+        setLoadingMore(true)
+        api.get<Page<any>>(nextPage)
+            .then(res => {
+                setTransactions(prev => [...prev, ...res.data.results])
+                setNextPage(res.data.next)
+            })
+            .catch(console.error)
+            .finally(() => setLoadingMore(false))
+    }
+
     const filteredTransactions = transactions.filter(tr => 
         tr.id.toLowerCase().includes(searchTerm.toLowerCase()) ||
         tr.description.toLowerCase().includes(searchTerm.toLowerCase()) ||
@@ -65,8 +80,9 @@ export default function BillingBalancePage() {
             if (fileInputRef.current) fileInputRef.current.value = ""
 
             // Refresh transaction history
-            const res = await api.get("/billing/transactions/")
-            setTransactions(res.data)
+            const res = await api.get<Page<any>>("/billing/transactions/")
+            setTransactions(res.data.results)
+            setNextPage(res.data.next)
         } catch (err) {
             toast.error("Failed to upload receipt")
         } finally {
@@ -293,6 +309,13 @@ export default function BillingBalancePage() {
                                     <div style={{ padding: '2rem', textAlign: 'center', color: '#6b7280' }}>No history yet</div>
                                 )}
                             </div>
+                            {nextPage && (
+                                <div style={{ padding: '1rem', textAlign: 'center', borderTop: '1px solid #f3f4f6' }}>
+                                    <button className="btn btn-secondary" onClick={loadMore} disabled={loadingMore}>
+                                        {loadingMore ? t('common.loading') : t('common.load_more')}
+                                    </button>
+                                </div>
+                            )}
                         </div>
                     </div>
                 </div>
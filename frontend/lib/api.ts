@@ -1,4 +1,4 @@
-import axios from 'axios';
+import axios, { AxiosRequestConfig } from 'axios';
 
 const api = axios.create({
     baseURL: process.env.NEXT_PUBLIC_API_URL || 'http://localhost:8000/api',
@@ -34,4 +34,24 @@ api.interceptors.response.use(
     }
 );
 
+// List endpoints are cursor-paginated; `next` and `previous` are absolute URLs
+export interface Page<T> {
+    next: string | null;
+    previous: string | null;
+    results: T[];
+}
+
+// Every item of a list endpoint, following `next` page by page
+export async function fetchAll<T = any>(url: string, config: AxiosRequestConfig = {}): Promise<T[]> {
+    const items: T[] = [];
+    let res = await api.get<Page<T>>(url, { ...config, params: { page_size: 100, ...config.params } });
+    items.push(...res.data.results);
+    while (res.data.next) {
+        // The next link carries the query string already
+        res = await api.get<Page<T>>(res.data.next, { ...config, params: undefined });
+        items.push(...res.data.results);
+    }
+    return items;
+}
+
 export default api;